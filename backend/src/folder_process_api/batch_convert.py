@@ -0,0 +1,252 @@
+"""
+Batch PDF to JSON Exam Converter
+================================
+Converts a whole folder (or glob) of exam PDFs (and DOCX files) with a
+process pool, writing one <name>.json per file (same format as
+convert_pdf_final.py) plus a batch_summary.json with counts, failures,
+per-file timings and peak memory (extraction runs in low-memory mode;
+PDF_MEMORY_LIMIT_MB caps each file). Word lock files (~$name.docx) are
+ignored.
+
+Re-running is resumable: PDFs whose output is newer than the PDF and was
+produced by the same parser version are skipped, and their counts are read
+back from that output. The summary is written even when the run is cut
+short (a crashed pool worker, Ctrl+C); files it did not get to are listed
+as failed.
+
+Usage:
+    python batch_convert.py "Đề thi/" -o output/ -j 4
+    python batch_convert.py "archive/**/*.pdf" -o output/ --force
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from convert_pdf_final import PARSER_VERSION, extract_exam_cached
+from extraction_cache import ExtractionCache
+from memory_monitor import MemoryMonitor
+import serializer
+
+SUMMARY_FILE = "batch_summary.json"
+
+EXTENSIONS = (".pdf", ".docx")
+# Word keeps "~$name.docx" owner files next to open documents
+LOCK_FILE_PREFIX = "~$"
+
+
+def collect_pdfs(inputs):
+    """Expand directories (non-recursive) and glob patterns into a sorted PDF/DOCX list"""
+    pdfs = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for ext in EXTENSIONS:
+                pdfs.update(glob.glob(os.path.join(item, "*" + ext)))
+        else:
+            pdfs.update(p for p in glob.glob(item, recursive=True) if p.lower().endswith(EXTENSIONS))
+    return sorted(os.path.abspath(p) for p in pdfs if not os.path.basename(p).startswith(LOCK_FILE_PREFIX))
+
+
+def assign_outputs(pdf_paths, output_dir):
+    """Map each PDF to <stem>.json, suffixing -2, -3, ... on name clashes"""
+    outputs = {}
+    used = set()
+    for pdf in pdf_paths:
+        stem = os.path.splitext(os.path.basename(pdf))[0]
+        name = f"{stem}.json"
+        n = 2
+        while name in used:
+            name = f"{stem}-{n}.json"
+            n += 1
+        used.add(name)
+        outputs[pdf] = os.path.join(output_dir, name)
+    return outputs
+
+
+def is_up_to_date(pdf_path, output_path):
+    """Output exists and is at least as new as the PDF"""
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(pdf_path)
+    except OSError:
+        return False
+
+
+def write_json_atomic(path, data, pretty=False):
+    """Write JSON via temp file + rename so an interrupted run never leaves a partial output"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(serializer.dumps_bytes(data, pretty))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def convert_one(pdf_path, output_path, cache_dir=None):
+    """Convert a single PDF (runs in a pool process)"""
+    start = time.perf_counter()
+    entry = {
+        "pdf": pdf_path,
+        "output": output_path
+    }
+    memory = MemoryMonitor()
+    try:
+        cache = ExtractionCache(cache_dir) if cache_dir else None
+        result, cached = extract_exam_cached(pdf_path, cache=cache, memory=memory)
+        write_json_atomic(output_path, result)
+        entry.update({
+            "status": "ok",
+            "cached": cached,
+            "passages": len(result["passages"]),
+            "questions": len(result["questions"])
+        })
+    except Exception as e:
+        entry.update({
+            "status": "failed",
+            "error": str(e),
+            "errorType": type(e).__name__
+        })
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    entry["memory"] = memory.to_dict()
+    return entry
+
+
+def load_json(path):
+    """Parsed JSON file, or None if it is missing or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            return serializer.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def load_previous_summary(output_dir):
+    return load_json(os.path.join(output_dir, SUMMARY_FILE))
+
+
+def build_summary(entries, started_at, batch_start):
+    entries.sort(key=lambda e: e["pdf"])
+    done = [e for e in entries if e["status"] == "ok"]
+    failed = [e for e in entries if e["status"] == "failed"]
+    # Outputs on disk - converted now or kept from an earlier run
+    available = [e for e in entries if e["status"] != "failed"]
+
+    return {
+        "parserVersion": PARSER_VERSION,
+        "startedAt": started_at,
+        "totalSeconds": round(time.perf_counter() - batch_start, 3),
+        "totals": {
+            "files": len(entries),
+            "converted": len(done),
+            "skipped": len(entries) - len(done) - len(failed),
+            "failed": len(failed),
+            "passages": sum(e.get("passages", 0) for e in available),
+            "questions": sum(e.get("questions", 0) for e in available)
+        },
+        # Largest per-file peak RSS of this run: the memory one pool worker needs
+        "peakRssMb": max((e["memory"]["peakRssMb"] or 0 for e in done + failed if "memory" in e), default=None),
+        "failures": [{"pdf": e["pdf"], "errorType": e["errorType"], "error": e["error"]} for e in failed],
+        "files": entries
+    }
+
+
+def run_batch(inputs, output_dir, workers=None, force=False, cache_dir=None):
+    """
+    Convert every PDF matched by inputs into output_dir
+
+    Returns:
+        dict: Summary (also written to output_dir/batch_summary.json)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    started_at = datetime.now().isoformat()
+    batch_start = time.perf_counter()
+
+    pdf_paths = collect_pdfs(inputs)
+    outputs = assign_outputs(pdf_paths, output_dir)
+
+    # Outputs from another parser version are stale regardless of mtime
+    previous = load_previous_summary(output_dir) or {}
+    if previous and previous.get("parserVersion") != PARSER_VERSION:
+        force = True
+    previous_entries = {e["pdf"]: e for e in previous.get("files", [])}
+
+    entries = []
+    todo = []
+    for pdf in pdf_paths:
+        existing = None if force or not is_up_to_date(pdf, outputs[pdf]) else load_json(outputs[pdf])
+        if existing is not None:
+            # Counts from the output itself - the previous summary may be missing or partial
+            entry = dict(previous_entries.get(pdf, {}))
+            entry.update({
+                "pdf": pdf,
+                "output": outputs[pdf],
+                "status": "skipped",
+                "seconds": 0.0,
+                "passages": len(existing.get("passages", [])),
+                "questions": len(existing.get("questions", []))
+            })
+            entries.append(entry)
+        else:
+            todo.append(pdf)
+
+    finished = set()
+    try:
+        if todo:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(convert_one, pdf, outputs[pdf], cache_dir): pdf for pdf in todo}
+                for future in as_completed(futures):
+                    entry = future.result()
+                    entries.append(entry)
+                    finished.add(entry["pdf"])
+                    detail = entry.get("error") or f"{entry.get('questions')} questions"
+                    print(f"[{entry['status']:>7}] {os.path.basename(entry['pdf'])} "
+                          f"({entry['seconds']:.2f}s) {detail}", file=sys.stderr)
+    finally:
+        # Also on BrokenProcessPool / KeyboardInterrupt: record what finished
+        error = sys.exc_info()[1]
+        for pdf in todo:
+            if pdf not in finished:
+                entries.append({
+                    "pdf": pdf,
+                    "output": outputs[pdf],
+                    "status": "failed",
+                    "error": f"Batch aborted before this file finished: {error!r}",
+                    "errorType": type(error).__name__,
+                    "seconds": 0.0
+                })
+        summary = build_summary(entries, started_at, batch_start)
+        write_json_atomic(os.path.join(output_dir, SUMMARY_FILE), summary, pretty=True)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch convert exam PDFs to JSON")
+    parser.add_argument("inputs", nargs="+", help="Directories and/or glob patterns of PDFs")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for <name>.json outputs")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reconvert even up-to-date PDFs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the content-hash result cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Result cache directory (default: $PDF_CACHE_DIR or .cache/extraction)")
+    args = parser.parse_args()
+
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or ExtractionCache().cache_dir
+
+    summary = run_batch(args.inputs, args.output_dir, args.workers, args.force, cache_dir)
+
+    print(serializer.dumps(summary["totals"]))
+    sys.exit(1 if summary["totals"]["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
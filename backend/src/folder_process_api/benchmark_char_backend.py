@@ -0,0 +1,89 @@
+"""
+Benchmark: pdfplumber vs. lean char backend
+===========================================
+Runs extract_page_range on each sample PDF with both char backends and
+reports, per backend:
+
+- total: best-of-repeat wall time for open + chars + extract_with_bold + clean
+- chars: the "chars" stage alone (content stream interpretation)
+- peak: tracemalloc peak of Python allocations during one extraction
+
+and checks both backends produce identical page texts.
+
+Usage:
+    python benchmark_char_backend.py                 # PDFs in "Đề thi/"
+    python benchmark_char_backend.py path/to/dir -r 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+from convert_pdf_final import extract_page_range
+from stage_timer import StageTimer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PDF_DIR = os.path.join(SCRIPT_DIR, "..", "..", "..", "Đề thi")
+BACKENDS = ("pdfplumber", "lean")
+
+
+def bench_backend(pdf_bytes, backend, repeat):
+    """(texts, best total seconds, chars-stage seconds of that run, peak MB)"""
+    best = None
+    for _ in range(repeat):
+        timer = StageTimer()
+        start = time.perf_counter()
+        texts = extract_page_range(pdf_bytes, timer=timer, backend=backend)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best[0]:
+            best = (seconds, timer.to_dict()["stages"]["chars"]["ms"] / 1000)
+
+    tracemalloc.start()
+    extract_page_range(pdf_bytes, backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return texts, best[0], best[1], peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Char backend benchmark")
+    parser.add_argument("pdf_dir", nargs="?", default=DEFAULT_PDF_DIR)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    if not pdf_paths:
+        print(f"No PDFs found in {args.pdf_dir}")
+        sys.exit(1)
+
+    print(f"{'PDF':<20} {'backend':<11} {'total (ms)':>11} {'chars (ms)':>11} {'peak (MB)':>10} {'identical':>10}")
+    all_identical = True
+    totals = {backend: [0.0, 0.0] for backend in BACKENDS}
+    for pdf_path in pdf_paths:
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        reference = None
+        for backend in BACKENDS:
+            texts, total, chars, peak = bench_backend(pdf_bytes, backend, args.repeat)
+            reference = texts if reference is None else reference
+            identical = texts == reference
+            all_identical = all_identical and identical
+            totals[backend][0] += total
+            totals[backend][1] = max(totals[backend][1], peak)
+            print(f"{os.path.basename(pdf_path):<20} {backend:<11} {total * 1000:>11.1f} {chars * 1000:>11.1f} "
+                  f"{peak:>10.1f} {str(identical):>10}")
+
+    base, lean = totals["pdfplumber"], totals["lean"]
+    print(f"\nAll PDFs: {base[0] * 1000:.0f} ms -> {lean[0] * 1000:.0f} ms ({base[0] / lean[0]:.2f}x), "
+          f"max peak {base[1]:.1f} MB -> {lean[1]:.1f} MB")
+
+    if not all_identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: native DOCX ingestion vs. the exported PDF
+=====================================================
+For every <name>.docx in the directory that has a <name>.pdf next to it,
+runs extract_exam on both and reports, per format:
+
+- total: best-of-repeat wall time of extract_exam
+- peak: tracemalloc peak of Python allocations during one extraction
+- passages / questions counts
+
+and checks the two results agree once whitespace and empty/adjacent bold
+tags are normalised (line wrapping in the PDF adds double spaces and splits
+bold runs; the DOCX has neither).
+
+Usage:
+    python benchmark_docx.py                 # files in "Đề thi/"
+    python benchmark_docx.py path/to/dir -r 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+from convert_pdf_final import extract_exam
+from docx_text import normalise
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(SCRIPT_DIR, "..", "..", "..", "Đề thi")
+
+
+def bench_file(path, repeat):
+    """(result, best seconds, peak MB)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract_exam(path)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    tracemalloc.start()
+    extract_exam(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, best, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX vs PDF extraction benchmark")
+    parser.add_argument("exam_dir", nargs="?", default=DEFAULT_DIR)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pairs = [(docx, os.path.splitext(docx)[0] + ".pdf")
+             for docx in sorted(glob.glob(os.path.join(args.exam_dir, "*.docx")))]
+    pairs = [(docx, pdf) for docx, pdf in pairs if os.path.exists(pdf)]
+    if not pairs:
+        print(f"No DOCX files with a matching PDF found in {args.exam_dir}")
+        sys.exit(1)
+
+    print(f"{'file':<20} {'format':<7} {'total (ms)':>11} {'peak (MB)':>10} {'passages':>9} {'questions':>10} {'match':>6}")
+    all_match = True
+    totals = {"pdf": 0.0, "docx": 0.0}
+    for docx_path, pdf_path in pairs:
+        reference = None
+        for fmt, path in (("pdf", pdf_path), ("docx", docx_path)):
+            result, total, peak = bench_file(path, args.repeat)
+            reference = normalise(result) if reference is None else reference
+            match = normalise(result) == reference
+            all_match = all_match and match
+            totals[fmt] += total
+            print(f"{os.path.basename(path):<20} {fmt:<7} {total * 1000:>11.1f} {peak:>10.1f} "
+                  f"{len(result['passages']):>9} {len(result['questions']):>10} {str(match):>6}")
+
+    print(f"\nAll files: PDF {totals['pdf'] * 1000:.0f} ms -> DOCX {totals['docx'] * 1000:.0f} ms "
+          f"({totals['pdf'] / totals['docx']:.1f}x)")
+
+    if not all_match:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
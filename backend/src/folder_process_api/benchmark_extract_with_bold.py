@@ -0,0 +1,133 @@
+"""
+Microbenchmark: extract_with_bold line assembly
+===============================================
+Times the current line-bucketing extract_with_bold against the original
+sort-everything, one-append-per-char implementation on the chars of the
+sample PDFs, and checks both produce identical text for every page.
+
+page.chars is materialized once up front so only line assembly is timed,
+not pdfminer layout analysis.
+
+Usage:
+    python benchmark_extract_with_bold.py                 # PDFs in "Đề thi/"
+    python benchmark_extract_with_bold.py path/to/dir -r 20
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pdfplumber
+
+from convert_pdf_final import extract_with_bold
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PDF_DIR = os.path.join(SCRIPT_DIR, "..", "..", "..", "Đề thi")
+
+
+class CharsPage:
+    """Stand-in for a pdfplumber page exposing pre-extracted chars"""
+
+    def __init__(self, chars):
+        self.chars = chars
+
+
+def legacy_extract_with_bold(page):
+    """Original implementation, kept as the reference for output and timing"""
+    chars = page.chars
+    if not chars:
+        return ""
+
+    chars = sorted(chars, key=lambda x: (round(x['top'], 1), x['x0']))
+
+    output = []
+    is_bold = False
+    prev_y = None
+
+    for char in chars:
+        y = round(char['top'], 1)
+
+        if prev_y is not None:
+            diff = abs(y - prev_y)
+            if diff > 15:
+                if is_bold:
+                    output.append("</b>")
+                    is_bold = False
+                output.append("\n\n")
+            elif diff > 3:
+                if is_bold:
+                    output.append("</b>")
+                    is_bold = False
+                output.append("\n")
+
+        prev_y = y
+
+        font = char.get('fontname', '').lower()
+        char_bold = 'bold' in font or 'heavy' in font
+
+        if char_bold and not is_bold:
+            output.append("<b>")
+            is_bold = True
+        elif not char_bold and is_bold:
+            output.append("</b>")
+            is_bold = False
+
+        output.append(char['text'])
+
+    if is_bold:
+        output.append("</b>")
+
+    return "".join(output)
+
+
+def load_pages(pdf_path):
+    """Materialize page.chars for every page"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return [CharsPage(list(page.chars)) for page in pdf.pages]
+
+
+def time_fn(fn, pages, repeat):
+    """Best-of-repeat wall time for running fn over all pages"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="extract_with_bold microbenchmark")
+    parser.add_argument("pdf_dir", nargs="?", default=DEFAULT_PDF_DIR)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    if not pdf_paths:
+        print(f"No PDFs found in {args.pdf_dir}")
+        sys.exit(1)
+
+    print(f"{'PDF':<24} {'chars':>8} {'legacy (ms)':>12} {'current (ms)':>13} {'speedup':>9} {'identical':>10}")
+    all_identical = True
+    for pdf_path in pdf_paths:
+        pages = load_pages(pdf_path)
+        char_count = sum(len(page.chars) for page in pages)
+
+        identical = all(legacy_extract_with_bold(page) == extract_with_bold(page) for page in pages)
+        all_identical = all_identical and identical
+
+        legacy = time_fn(legacy_extract_with_bold, pages, args.repeat)
+        current = time_fn(extract_with_bold, pages, args.repeat)
+        speedup = legacy / current if current else float("inf")
+
+        print(f"{os.path.basename(pdf_path):<24} {char_count:>8} {legacy * 1000:>12.1f} "
+              f"{current * 1000:>13.1f} {speedup:>8.2f}x {str(identical):>10}")
+
+    if not all_identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
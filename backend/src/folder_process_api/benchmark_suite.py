@@ -0,0 +1,228 @@
+"""
+Benchmark suite on a synthetic exam corpus
+==========================================
+Generates exams offline with synthetic_exam.py (no PDFs needed) and times
+the pipeline stages on each corpus:
+
+- extract_with_bold  - line assembly over every page's chars
+- parse_question     - every question block of the exam
+- extract_exam       - chars -> extract_with_bold -> clean_text ->
+                       exam_from_texts, i.e. extract_exam minus pdfminer
+                       layout analysis (which needs a real PDF)
+- process_exam_file  - processed JSON -> GoPass records, caches cleared
+
+Each timing is the best of --repeat samples (fast functions are looped
+until a sample lasts at least 50 ms). Results are compared with
+benchmark_baseline.json; any function slower than the baseline by more than
+--tolerance (default 30%) is re-run up to --retries times (keeping the
+fastest time) and, if it is still slow, reported; the script then exits 1.
+
+Times are compared as scores: seconds divided by a calibration workload
+that never changes (the original extract_with_bold kept in
+benchmark_extract_with_bold; median of samples taken between corpora), so a
+baseline recorded on one machine stays usable on a faster or slower one.
+Re-record with --update-baseline after an intended performance change.
+
+Usage:
+    python benchmark_suite.py                      # compare with the baseline
+    python benchmark_suite.py --update-baseline    # record a new baseline
+    python benchmark_suite.py --corpus small -r 3 --fixtures-dir fixtures/synthetic
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmark_extract_with_bold import CharsPage, legacy_extract_with_bold
+from convert_pdf_final import clean_text, exam_from_texts, extract_with_bold, parse_question
+from patterns import RX
+from synthetic_exam import generate_exam, write_fixture
+import exam_processor_api
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.3
+MIN_SAMPLE_SECONDS = 0.05
+
+# name -> generate_exam kwargs
+CORPORA = {
+    "small": {"questions": 40, "passages": 5, "bold_density": 0.1, "pages": 9},
+    "medium": {"questions": 200, "passages": 20, "bold_density": 0.15, "pages": 40},
+    "large": {"questions": 1000, "passages": 100, "bold_density": 0.2, "pages": 180},
+}
+_CALIBRATION_PAGES = None
+
+
+def calibrate(repeat=5):
+    """
+    Samples of the machine speed unit: the frozen legacy_extract_with_bold over
+    the small corpus. It does the same kind of work as the pipeline (char
+    dicts, sorting, string building), so it tracks machine speed much more
+    closely than an arithmetic loop.
+    """
+    global _CALIBRATION_PAGES
+    if _CALIBRATION_PAGES is None:
+        _CALIBRATION_PAGES = [CharsPage(chars) for chars in generate_exam(seed=0, **CORPORA["small"])["pages"]]
+    return [best_of(lambda: [legacy_extract_with_bold(page) for page in _CALIBRATION_PAGES], 1)
+            for _ in range(repeat)]
+
+
+def best_of(fn, repeat, min_sample=MIN_SAMPLE_SECONDS):
+    """Best-of-repeat seconds per call; fast functions are looped so each sample lasts min_sample"""
+    start = time.perf_counter()
+    fn()
+    number = max(1, int(min_sample / max(time.perf_counter() - start, 1e-6)))
+    best = float("inf")
+    for _ in range(repeat):
+        # Like timeit: collect up front and keep the GC out of the sample
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter() - start) / number)
+        finally:
+            gc.enable()
+    return best
+
+
+def question_blocks(texts):
+    """(q_num, block, answers) inputs of parse_question, split the way iter_exam_records does"""
+    full_text = "".join(text + "\n\n" for text in texts)
+    ans_match = RX.answers_header.search(full_text)
+    content = full_text[:ans_match.start()] if ans_match else full_text
+    ans_text = full_text[ans_match.start():] if ans_match else ""
+    answers = {int(m.group(1)): m.group(2) for m in RX.answer_entry.finditer(ans_text)}
+    parts = RX.question_split.split(content)
+    return [(int(parts[i]), parts[i + 1].strip()) for i in range(1, len(parts) - 1, 2)], answers
+
+
+def bench_corpus(name, params, repeat, fixtures_dir):
+    """Time every function on one generated corpus; returns {function: seconds}"""
+    exam = generate_exam(seed=0, **params)
+    pages = [CharsPage(chars) for chars in exam["pages"]]
+    texts = [clean_text(extract_with_bold(page)) for page in pages]
+    blocks, answers = question_blocks(texts)
+
+    parsed = exam_from_texts(texts)
+    if len(parsed["questions"]) != params["questions"] or len(parsed["passages"]) != params["passages"]:
+        raise RuntimeError(f"{name}: synthetic exam parsed to {len(parsed['questions'])} questions / "
+                           f"{len(parsed['passages'])} passages")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _, processed_path = write_fixture(exam, fixtures_dir or tmp_dir, f"synthetic-{name}")
+
+        def process():
+            exam_processor_api.EXAM_DATA_CACHE.clear()
+            result = exam_processor_api.process_exam_file(processed_path, use_cache=False)
+            if not result["success"]:
+                raise RuntimeError(result["error"])
+
+        return {
+            "extract_with_bold": best_of(lambda: [extract_with_bold(page) for page in pages], repeat),
+            "parse_question": best_of(
+                lambda: [parse_question(q_num, block, answers, "passage_1") for q_num, block in blocks], repeat),
+            "extract_exam": best_of(
+                lambda: exam_from_texts([clean_text(extract_with_bold(page)) for page in pages]), repeat),
+            "process_exam_file": best_of(process, repeat),
+        }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions as (key, baseline score, current score, ratio) for scores over tolerance"""
+    regressions = []
+    for key, current in results["scores"].items():
+        previous = baseline.get("scores", {}).get(key)
+        if previous and current / previous > 1 + tolerance:
+            regressions.append((key, previous, current, current / previous))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite on synthetic exams")
+    parser.add_argument("--corpus", action="append", choices=sorted(CORPORA),
+                        help="Corpus to run (repeatable; default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown vs baseline as a fraction (default: 0.3)")
+    parser.add_argument("--update-baseline", action="store_true", help="Record results as the new baseline")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Re-runs of a corpus to confirm a regression before failing (default: 2)")
+    parser.add_argument("--fixtures-dir", default=None, help="Also keep the generated processed JSON here")
+    args = parser.parse_args()
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    # Calibration samples are interleaved with the corpora and the median is
+    # used, so one lucky or unlucky sample does not shift every score
+    samples = calibrate()
+    timings = {}
+
+    def run(name):
+        for function, seconds in bench_corpus(name, CORPORA[name], args.repeat, args.fixtures_dir).items():
+            key = f"{name}/{function}"
+            timings[key] = min(seconds, timings.get(key, seconds))
+        samples.extend(calibrate())
+
+    # A new baseline takes the best of as many passes as a confirmed regression gets
+    for _ in range(args.retries + 1 if args.update_baseline else 1):
+        for name in args.corpus or list(CORPORA):
+            run(name)
+
+    results = None
+    for attempt in range(args.retries + 1):
+        unit = statistics.median(samples)
+        results = {
+            "calibration": unit,
+            "repeat": args.repeat,
+            "seconds": {key: round(seconds, 6) for key, seconds in timings.items()},
+            "scores": {key: round(seconds / unit, 4) for key, seconds in timings.items()}
+        }
+        regressions = compare(results, baseline, args.tolerance)
+        if not regressions or attempt == args.retries:
+            break
+        # Confirm suspected regressions before failing - a busy machine slows single samples
+        for name in sorted({key.split("/")[0] for key, *_ in regressions}):
+            print(f"Re-running {name} to confirm a possible regression")
+            run(name)
+
+    print(f"calibration: {results['calibration'] * 1000:.1f} ms")
+    print(f"{'corpus':<8} {'function':<18} {'ms':>10} {'score':>8} {'baseline':>9} {'ratio':>7}")
+
+    for key, seconds in timings.items():
+        score = results["scores"][key]
+        previous = baseline.get("scores", {}).get(key)
+        ratio = f"{score / previous:>6.2f}x" if previous else f"{'-':>7}"
+        previous = f"{previous:>9.3f}" if previous else f"{'-':>9}"
+        name, function = key.split("/")
+        print(f"{name:<8} {function:<18} {seconds * 1000:>10.2f} {score:>8.3f} {previous} {ratio}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not baseline:
+        print(f"No baseline at {args.baseline} - run with --update-baseline to record one")
+        return
+
+    for key, previous, current, ratio in regressions:
+        print(f"REGRESSION {key}: {previous:.3f} -> {current:.3f} ({ratio:.2f}x, tolerance {args.tolerance:.0%})")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
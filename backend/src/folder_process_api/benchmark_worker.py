@@ -0,0 +1,120 @@
+"""
+Benchmark: cold spawn vs. warm worker
+=====================================
+Compares per-PDF wall time of spawning `python convert_pdf_final.py <pdf>`
+for every file against sending the same files to one long-lived
+`convert_pdf_final.py --worker` process. Both run with --no-cache, so every
+job really extracts the PDF instead of returning a cached result.
+
+Usage:
+    python benchmark_worker.py                 # PDFs in "Đề thi/"
+    python benchmark_worker.py path/to/dir -r 5
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONVERTER = os.path.join(SCRIPT_DIR, "convert_pdf_final.py")
+DEFAULT_PDF_DIR = os.path.join(SCRIPT_DIR, "..", "..", "..", "Đề thi")
+
+
+def child_env():
+    """Environment for child Python processes (UTF-8 stdio, like Node sets)"""
+    env = dict(os.environ)
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+
+# The extraction cache would turn repeats into hash lookups on both sides
+NO_CACHE = "--no-cache"
+
+
+def bench_cold(pdf_paths, repeat):
+    """Spawn one interpreter per PDF, return {pdf: [seconds, ...]}"""
+    timings = {pdf: [] for pdf in pdf_paths}
+    for _ in range(repeat):
+        for pdf in pdf_paths:
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, CONVERTER, NO_CACHE, pdf],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=child_env(),
+                check=True
+            )
+            timings[pdf].append(time.perf_counter() - start)
+    return timings
+
+
+def bench_warm(pdf_paths, repeat):
+    """Send every PDF to a single worker, return ({pdf: [seconds, ...]}, startup seconds)"""
+    timings = {pdf: [] for pdf in pdf_paths}
+
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, CONVERTER, "--worker", NO_CACHE],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env=child_env(),
+        text=True,
+        encoding="utf-8",
+        bufsize=1
+    )
+    # Warm-up job so module imports are not billed to the first PDF
+    worker.stdin.write(json.dumps({"id": "warmup", "pdf_path": pdf_paths[0]}) + "\n")
+    worker.stdin.flush()
+    worker.stdout.readline()
+    startup = time.perf_counter() - start
+
+    try:
+        for _ in range(repeat):
+            for idx, pdf in enumerate(pdf_paths):
+                start = time.perf_counter()
+                worker.stdin.write(json.dumps({"id": str(idx), "pdf_path": pdf}) + "\n")
+                worker.stdin.flush()
+                response = json.loads(worker.stdout.readline())
+                timings[pdf].append(time.perf_counter() - start)
+                if not response.get("success"):
+                    raise RuntimeError(f"{pdf}: {response.get('error')}")
+    finally:
+        worker.stdin.close()
+        worker.wait()
+
+    return timings, startup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold spawn vs. warm worker benchmark")
+    parser.add_argument("pdf_dir", nargs="?", default=DEFAULT_PDF_DIR)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pdf_paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    if not pdf_paths:
+        print(f"No PDFs found in {args.pdf_dir}")
+        sys.exit(1)
+
+    cold = bench_cold(pdf_paths, args.repeat)
+    warm, startup = bench_warm(pdf_paths, args.repeat)
+
+    print(f"Worker startup (imports + first job): {startup * 1000:.0f} ms")
+    print(f"{'PDF':<30} {'cold (ms)':>12} {'warm (ms)':>12} {'speedup':>9}")
+    total_cold = total_warm = 0.0
+    for pdf in pdf_paths:
+        cold_avg = sum(cold[pdf]) / len(cold[pdf])
+        warm_avg = sum(warm[pdf]) / len(warm[pdf])
+        total_cold += cold_avg
+        total_warm += warm_avg
+        print(f"{os.path.basename(pdf):<30} {cold_avg * 1000:>12.0f} {warm_avg * 1000:>12.0f} "
+              f"{cold_avg / warm_avg:>8.2f}x")
+    print(f"{'TOTAL':<30} {total_cold * 1000:>12.0f} {total_warm * 1000:>12.0f} "
+          f"{total_cold / total_warm:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
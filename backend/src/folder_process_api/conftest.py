@@ -0,0 +1,15 @@
+"""
+pytest setup: keep the extraction cache and processed-exam state of the
+test run in a temporary directory instead of .cache/ next to the sources
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+# Must run before any test module imports extraction_cache / incremental,
+# which read these at import time
+_CACHE_ROOT = tempfile.mkdtemp(prefix="folder_process_api-test-")
+os.environ.setdefault("PDF_CACHE_DIR", os.path.join(_CACHE_ROOT, "extraction"))
+os.environ.setdefault("PROCESSED_STATE_DIR", os.path.join(_CACHE_ROOT, "processed"))
+atexit.register(shutil.rmtree, _CACHE_ROOT, ignore_errors=True)
@@ -1,40 +1,89 @@
 """
 PDF to JSON Exam Converter - Final Version
-Converts English exam PDF to structured JSON with proper HTML formatting
+Converts English exam PDF (or DOCX) to structured JSON with proper HTML formatting
 """
 import pdfplumber
-import re
 import json
+import io
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from extraction_cache import ExtractionCache, make_key
+from patterns import RX
+from stage_timer import StageTimer, NULL_TIMER
+from memory_monitor import DEFAULT_MEMORY_LIMIT_MB, MemoryMonitor, NULL_MEMORY
+from lean_chars import CHAR_BACKENDS, DEFAULT_CHAR_BACKEND, page_for_backend
+from docx_text import is_docx, iter_docx_paragraphs
+import serializer
+
+# Bump whenever a parser change alters the output JSON (invalidates cached results)
+PARSER_VERSION = "1.1.0"
 
 def clean_text(text):
     """Remove watermarks and normalize spaces"""
     if not text:
         return ""
-    text = re.sub(r'TAILIEUDIEUKY\s*©\s*2025', '', text)
+    text = RX.watermark.sub('', text)
     # Normalize spaces but preserve newlines
-    text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs -> single space
-    text = re.sub(r' *\n *', '\n', text)  # Remove spaces around newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)  # Max 2 consecutive newlines
+    text = RX.spaces.sub(' ', text)  # Multiple spaces/tabs -> single space
+    text = RX.spaces_around_newline.sub('\n', text)  # Remove spaces around newlines
+    text = RX.blank_lines.sub('\n\n', text)  # Max 2 consecutive newlines
     return text.strip()
 
+def clean_slice(text):
+    """
+    clean_text for a stripped slice of already-cleaned page text
+    
+    Such a slice can only still differ from clean_text output by blank-line
+    runs left by empty pages or a watermark split across a page join, so the
+    full regex pass is skipped when neither is present.
+    """
+    if '\n\n\n' in text or 'TAILIEUDIEUKY' in text:
+        return clean_text(text)
+    return text
+
+# fontname -> is bold; a PDF only has a handful of fonts, so decide each once
+_BOLD_FONTS = {}
+
+def is_bold_font(fontname):
+    """Bold detection from font name (cached per fontname)"""
+    bold = _BOLD_FONTS.get(fontname)
+    if bold is None:
+        font = fontname.lower()
+        bold = 'bold' in font or 'heavy' in font
+        _BOLD_FONTS[fontname] = bold
+    return bold
+
+def _char_is_bold(char):
+    return is_bold_font(char.get('fontname', ''))
+
 def extract_with_bold(page):
     """Extract text with <b> tags for bold text"""
     chars = page.chars
     if not chars:
         return ""
     
-    chars = sorted(chars, key=lambda x: (round(x['top'], 1), x['x0']))
+    # Group chars into lines by rounded top; chars keep their original
+    # order inside a line, so the stable x0 sort below gives the same
+    # ordering as sorting everything by (round(top, 1), x0)
+    lines = {}
+    for char in chars:
+        y = round(char['top'], 1)
+        line = lines.get(y)
+        if line is None:
+            lines[y] = [char]
+        else:
+            line.append(char)
     
     output = []
     is_bold = False
     prev_y = None
     
-    for char in chars:
-        y = round(char['top'], 1)
-        
+    for y in sorted(lines):
         # Detect line breaks
         if prev_y is not None:
-            diff = abs(y - prev_y)
+            diff = y - prev_y
             if diff > 15:  # Paragraph
                 if is_bold:
                     output.append("</b>")
@@ -48,18 +97,19 @@ def extract_with_bold(page):
         
         prev_y = y
         
-        # Check bold
-        font = char.get('fontname', '').lower()
-        char_bold = 'bold' in font or 'heavy' in font
-        
-        if char_bold and not is_bold:
-            output.append("<b>")
-            is_bold = True
-        elif not char_bold and is_bold:
-            output.append("</b>")
-            is_bold = False
+        line = lines[y]
+        line.sort(key=itemgetter('x0'))
         
-        output.append(char['text'])
+        # Emit whole runs of same-weight chars at once
+        for char_bold, run in groupby(line, key=_char_is_bold):
+            if char_bold and not is_bold:
+                output.append("<b>")
+                is_bold = True
+            elif not char_bold and is_bold:
+                output.append("</b>")
+                is_bold = False
+            
+            output.append("".join([char['text'] for char in run]))
     
     if is_bold:
         output.append("</b>")
@@ -82,9 +132,9 @@ def balance_bold(text):
         text = '<b>' * (close_c - open_c) + text
     
     # Clean empty bold tags
-    text = re.sub(r'<b>\s*</b>', '', text)
-    text = re.sub(r'<b>(<b>)+', '<b>', text)
-    text = re.sub(r'(</b>)+</b>', '</b>', text)
+    text = RX.empty_bold.sub('', text)
+    text = RX.repeated_bold_open.sub('<b>', text)
+    text = RX.repeated_bold_close.sub('</b>', text)
     
     # Only remove leading/trailing if they're orphaned (not paired)
     # Don't remove valid bold markup at start/end
@@ -101,17 +151,17 @@ def to_html_paragraphs(text):
     
     for p in paras:
         p = p.replace('\n', ' ')
-        p = re.sub(r'\s+', ' ', p)
+        p = RX.whitespace.sub(' ', p)
         p = balance_bold(p.strip())
         
         # Merge adjacent bold tags
-        p = re.sub(r'</b>\s+<b>', ' ', p)
+        p = RX.bold_gap_spaced.sub(' ', p)
         
         if not p or len(p) < 5:
             continue
         
         # Citations
-        if re.match(r'^\(?(Adapted|Source|By\s)', p, re.I):
+        if RX.citation.match(p):
             result.append(f'<p class="text-right italic text-sm text-gray-500">{p}</p>')
         else:
             result.append(f'<p class="mb-4 text-justify">{p}</p>')
@@ -132,8 +182,8 @@ def to_br_lines(text):
             continue
         
         # Check if new item (including a -, b -, etc.)
-        pure = re.sub(r'<.*?>', '', line)
-        is_new_item = re.match(r'^([a-e]\s*-|[A-D]\.|Question\s+\d+|\d+\.)', pure)
+        pure = RX.html_tag.sub('', line)
+        is_new_item = RX.new_item.match(pure)
         
         # Always treat a-, b-, c- as new lines (for ordering questions)
         if is_new_item:
@@ -148,91 +198,357 @@ def to_br_lines(text):
     text = balance_bold(text)
     
     # Clean up orphaned bold tags in middle
-    text = re.sub(r'</b>\s*<b>', ' ', text)
+    text = RX.bold_gap.sub(' ', text)
     
     return text
 
-def extract_exam(pdf_path):
-    """Extract full exam from PDF"""
+def iter_page_range(pdf_source, start=0, end=None, timer=NULL_TIMER, memory=NULL_MEMORY,
+                    backend=DEFAULT_CHAR_BACKEND):
+    """
+    Yield cleaned text for pages [start, end) of a PDF, one page at a time
+    
+    Each page's cached layout objects are dropped as soon as its text is
+    produced, so memory stays at about one page's worth instead of growing
+    with the page count. memory.sample() runs while the page is still loaded.
+    
+    backend picks where chars come from: "pdfplumber" (page.chars) or "lean"
+    (glyphs only, see lean_chars) - same chars, same text.
+    """
+    if isinstance(pdf_source, bytes):
+        pdf_source = io.BytesIO(pdf_source)
+    
+    with timer.stage("open"):
+        pdf = pdfplumber.open(pdf_source)
+    with pdf:
+        for page in pdf.pages[start:end]:
+            page = page_for_backend(page, backend)
+            # page.chars interprets the page content on first access
+            with timer.stage("chars"):
+                chars = page.chars
+            with timer.stage("bold"):
+                text = extract_with_bold(page)
+            with timer.stage("clean"):
+                text = clean_text(text)
+            timer.count("pages")
+            timer.count("chars", len(chars))
+            memory.sample()
+            # Release the page's layout objects (chars included) before the next page
+            chars = None
+            page.flush_cache()
+            yield text
+
+def extract_page_range(pdf_source, start=0, end=None, timer=NULL_TIMER, memory=NULL_MEMORY,
+                       backend=DEFAULT_CHAR_BACKEND):
+    """List of cleaned texts for pages [start, end) (see iter_page_range)"""
+    return list(iter_page_range(pdf_source, start, end, timer, memory, backend))
+
+def _extract_page_range_timed(pdf_source, start, end, backend=DEFAULT_CHAR_BACKEND):
+    """Pool entry point returning (texts, timer dict) for instrumented runs"""
+    timer = StageTimer()
+    texts = extract_page_range(pdf_source, start, end, timer, backend=backend)
+    return texts, timer.to_dict()
+
+def iter_page_texts(pdf_path, workers=None, timer=NULL_TIMER, memory=NULL_MEMORY,
+                    backend=DEFAULT_CHAR_BACKEND):
+    """
+    Yield the cleaned text of every page, in page order, as soon as it is ready
+    
+    With workers > 1, contiguous page ranges are farmed out to a process pool;
+    each worker opens the PDF on its own, and a range's pages are yielded once
+    it and every range before it are done. Output is identical to the serial path.
+    
+    With a MemoryMonitor (low-memory mode) extraction is always serial: one
+    process holding one page at a time, measured and capped by the monitor.
+    """
+    if memory or not workers or workers <= 1:
+        yield from iter_page_range(pdf_path, timer=timer, memory=memory, backend=backend)
+        return
     
-    # Read PDF
-    full_text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = extract_with_bold(page)
+    # File-like sources can't be re-opened by other processes - ship the bytes
+    if hasattr(pdf_path, "read"):
+        pdf_path.seek(0)
+        pdf_path = pdf_path.read()
+    
+    source = io.BytesIO(pdf_path) if isinstance(pdf_path, bytes) else pdf_path
+    with pdfplumber.open(source) as pdf:
+        page_count = len(pdf.pages)
+    
+    workers = min(workers, page_count)
+    if workers <= 1:
+        yield from iter_page_range(pdf_path, timer=timer, backend=backend)
+        return
+    
+    # Split pages into one contiguous range per worker
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        if timer:
+            # Stage times are summed over workers (CPU time, not wall time)
+            futures = [pool.submit(_extract_page_range_timed, pdf_path, start, end, backend)
+                       for start, end in ranges]
+        else:
+            futures = [pool.submit(extract_page_range, pdf_path, start, end, backend=backend)
+                       for start, end in ranges]
+        for future in futures:
+            if timer:
+                range_texts, range_stats = future.result()
+                timer.merge(range_stats)
+                yield from range_texts
+            else:
+                yield from future.result()
+
+def iter_docx_chunks(docx_source, timer=NULL_TIMER, memory=NULL_MEMORY):
+    """
+    Yield the cleaned text of a DOCX paragraph by paragraph, ready for iter_chunk_records
+    
+    Paragraphs are joined the way extract_with_bold joins PDF lines: "\n"
+    between consecutive lines, "\n\n" across a paragraph gap (spacing or
+    empty paragraphs), so the text parses like the exported PDF's.
+    """
+    if hasattr(docx_source, "read"):
+        docx_source.seek(0)
+        docx_source = docx_source.read()
+    
+    gap = False
+    first = True
+    with timer.stage("open"):
+        paragraphs = iter_docx_paragraphs(docx_source)
+    for text, paragraph_break in paragraphs:
+        with timer.stage("clean"):
             text = clean_text(text)
-            full_text += text + "\n\n"
+        timer.count("paragraphs")
+        memory.sample()
+        if not RX.html_tag.sub('', text).strip():
+            gap = True
+            continue
+        if not first:
+            text = ("\n\n" if gap or paragraph_break else "\n") + text
+        first = False
+        gap = False
+        yield text
+
+def iter_exam_chunks(source, workers=None, timer=NULL_TIMER, memory=NULL_MEMORY,
+                     backend=DEFAULT_CHAR_BACKEND):
+    """
+    Text chunks of an exam for iter_chunk_records: PDF pages, or DOCX paragraphs
     
-    # Split answers
-    ans_match = re.search(r'Answers?\s*:', full_text, re.I)
-    if ans_match:
-        content = full_text[:ans_match.start()]
-        ans_text = full_text[ans_match.start():]
-    else:
-        content = full_text
-        ans_text = ""
+    DOCX files (recognised by content, not name) are read natively -
+    workers and backend only apply to PDFs.
+    """
+    if is_docx(source):
+        return iter_docx_chunks(source, timer, memory)
+    return (text + "\n\n" for text in iter_page_texts(source, workers, timer, memory, backend))
+
+def finalize_passage(passage):
+    """Turn an in-progress passage (instruction + raw parts) into its output record"""
+    combined = '\n\n'.join(passage["parts"])
+    # Remove blanks (6) _____
+    combined = RX.numbered_blank_line.sub('', combined)
+    return {
+        "passage_id": passage["passage_id"],
+        "instruction": passage["instruction"],
+        "content": to_html_paragraphs(combined)
+    }
+
+def compute_passage_ranges(passages, last_with_options):
+    """
+    Question range covered by each passage: [(passage_id, start, end), ...]
     
-    # Parse answers
-    answers = {}
-    for m in re.finditer(r'(\d+)\.\s*([A-D])', ans_text):
-        answers[int(m.group(1))] = m.group(2)
+    A passage runs from its first question to one before the next passage's
+    first question; the last passage runs to the last question with options.
+    """
+    starts = [(p["passage_id"], p["q_start"]) for p in passages if p.get("q_start")]
+    ranges = []
+    for idx, (pass_id, q_start) in enumerate(starts):
+        if idx + 1 < len(starts):
+            # End is one question before next passage starts
+            q_end = starts[idx + 1][1] - 1
+        else:
+            # For last passage, include all remaining questions with options
+            q_end = last_with_options if last_with_options is not None else q_start - 1
+        ranges.append((pass_id, q_start, q_end))
+    return ranges
+
+def assign_passage_ranges(ranges, questions):
+    """
+    Fix PassageRelated of every question with options from the passage ranges
+    
+    Only needed when question numbers are not strictly increasing; otherwise
+    iter_exam_records assigns the same values question by question. Later
+    ranges win where ranges overlap. Ordering questions (empty tags) get
+    PassageRelated = None.
+    """
+    # question_number -> owning passage, via a sorted number index
+    numbers = sorted({q["question_number"] for q in questions if q["options"]})
+    owner = {}
+    for pass_id, q_start, q_end in ranges:
+        for number in numbers[bisect_left(numbers, q_start):bisect_right(numbers, q_end)]:
+            owner[number] = pass_id
+    
+    for q in questions:
+        if q["options"] and q["question_number"] in owner:
+            # Only set PassageRelated if question has tags (not ordering)
+            q["PassageRelated"] = owner[q["question_number"]] if q.get("tags") else None
+
+class QuestionSegmenter:
+    """
+    Incremental "Answers:" / "Question N." splitter for text arriving in chunks
     
-    # Split by Question X. or Question X:
-    parts = re.split(r'Question\s+(\d+)[\.:]', content, flags=re.I)
+    feed() returns the segments that became final with that chunk, in
+    document order: ("preamble", text) once, then ("question", (number, block))
+    per question. close() flushes the open block and parses the answer key
+    into .answers.
     
+    The result is the same as splitting the whole text at once: content ends
+    at the first Answers?: header, and blocks are the re.split parts of
+    question_split. Only the open block (text after the last marker) is kept,
+    so a question straddling a page boundary is completed by the next chunk,
+    and a marker split across chunks ("Question" | "12.") is found once its
+    ":"/"." arrives.
+    """
+    
+    def __init__(self):
+        self.answers = {}
+        self._buffer = ""          # open block (or preamble) text so far
+        self._number = None        # number of the open question; None in the preamble
+        self._answer_chunks = None  # text from the Answers header on, once seen
+    
+    def _segment(self, text):
+        if self._number is None:
+            return "preamble", text
+        return "question", (self._number, text)
+    
+    def feed(self, chunk):
+        if self._answer_chunks is not None:
+            self._answer_chunks.append(chunk)
+            return []
+        
+        buffer = self._buffer + chunk
+        header = RX.answers_header.search(buffer)
+        content = buffer if header is None else buffer[:header.start()]
+        
+        segments = []
+        pos = 0
+        for m in RX.question_split.finditer(content):
+            segments.append(self._segment(content[pos:m.start()]))
+            self._number = int(m.group(1))
+            pos = m.end()
+        
+        if header is None:
+            self._buffer = buffer[pos:]
+        else:
+            # Content ends at the header - the open block is complete
+            segments.append(self._segment(content[pos:]))
+            self._answer_chunks = [buffer[header.start():]]
+            self._buffer = ""
+        return segments
+    
+    def close(self):
+        segments = []
+        if self._answer_chunks is None:
+            segments.append(self._segment(self._buffer))
+            self._answer_chunks = []
+        self._buffer = ""
+        
+        for m in RX.answer_entry.finditer("".join(self._answer_chunks)):
+            self.answers[int(m.group(1))] = m.group(2)
+        return segments
+
+def iter_chunk_records(chunks, timer=NULL_TIMER):
+    """
+    Parse exam text arriving in chunks into ("passage", record) / ("question", record) pairs
+    
+    A QuestionSegmenter cuts question blocks out of the text as chunks
+    arrive, and each block goes through parse_question straight away, so with
+    a lazy chunk source parsing overlaps extraction and the document is never
+    held as one string.
+    
+    - A passage is yielded when the next passage starts (or at the end).
+    - A question is yielded right after parse_question while question numbers
+      are strictly increasing - the passage covering it is then the latest
+      one whose first question is <= its number. From the first number that
+      is not, questions are held back and assign_passage_ranges decides at
+      the end, over all questions.
+    
+    The answer key comes after the questions, so yielded questions have an
+    empty "answer" until ("answers", {"<number>": letter}) follows them. If
+    assign_passage_ranges moves a question that was already yielded,
+    ("passage_links", {"<index in question order>": passage_id}) corrects it.
+    Both are applied to the same question dicts too, so collect_records
+    output does not depend on them.
+    
+    The last pair is ("passage_ranges", {passage_id: {"start": n, "end": m}}).
+    """
+    segmenter = QuestionSegmenter()
     passages = []
     questions = []
     current_pass = None
-    pass_num = 0
+    no_answers = {}
+    streamed = None  # questions yielded before numbers stopped increasing; None while they still do
     
-    # Passage intro pattern
-    pass_pat = r'Read\s+the\s+following\s+(?:leaflet|passage|advertisement|passage\s+about)[^\.]*\s+and\s+mark[^\.]+\.'
+    def start_passage(intro_match, text, q_start):
+        nonlocal current_pass
+        current_pass = f"passage_{len(passages) + 1}"
+        passages.append({
+            "passage_id": current_pass,
+            "instruction": to_br_lines(intro_match.group(0)),
+            "parts": [text],
+            "q_start": q_start
+        })
     
-    # Before Q1
-    if parts[0].strip():
-        intro = parts[0].strip()
-        m = re.search(pass_pat, intro, re.I | re.DOTALL)
-        if m:
-            pass_num += 1
-            current_pass = f"passage_{pass_num}"
-            passages.append({
-                "passage_id": current_pass,
-                "instruction": to_br_lines(m.group(0)),
-                "parts": [intro[m.end():].strip()],
-                "q_start": 1  # Default: starts from Q1
-            })
-    
-    # Process questions
-    i = 1
-    while i < len(parts) - 1:
-        q_num = int(parts[i])
-        q_block = parts[i + 1].strip()
+    def place(q_data):
+        nonlocal streamed
+        if streamed is None and questions and q_data["question_number"] <= questions[-1]["question_number"]:
+            streamed = len(questions)
+        questions.append(q_data)
+        timer.count("questions")
+        if streamed is not None:
+            return
+        if q_data["options"]:
+            # Latest passage starting at or before this question
+            for p in reversed(passages):
+                if p["q_start"] <= q_data["question_number"]:
+                    # Only set PassageRelated if question has tags (not ordering)
+                    q_data["PassageRelated"] = p["passage_id"] if q_data.get("tags") else None
+                    break
+        yield "question", q_data
+    
+    def handle(kind, value):
+        if kind == "preamble":
+            # Before Q1
+            intro = value.strip()
+            m = RX.passage_intro.search(intro) if intro else None
+            if m:
+                # Default: starts from Q1
+                start_passage(m, intro[m.end():].strip(), 1)
+            return
+        
+        q_num, q_block = value[0], value[1].strip()
         
         # New passage?
-        m = re.search(pass_pat, q_block, re.I | re.DOTALL)
+        m = RX.passage_intro.search(q_block)
         
         if m:
             # Before intro = question (no passage)
             before = q_block[:m.start()].strip()
-            q_data = parse_question(q_num, before, answers, None)
-            if q_data:
-                questions.append(q_data)
+            with timer.stage("parse_question"):
+                q_data = parse_question(q_num, before, no_answers, None)
+            yield from place(q_data)
             
-            # New passage - starts from NEXT question
-            pass_num += 1
-            current_pass = f"passage_{pass_num}"
-            after = q_block[m.end():].strip()
+            # Previous passage can't receive more content
+            if passages:
+                with timer.stage("passages"):
+                    record = finalize_passage(passages[-1])
+                timer.count("passages")
+                yield "passage", record
             
-            passages.append({
-                "passage_id": current_pass,
-                "instruction": to_br_lines(m.group(0)),
-                "parts": [after],
-                "q_start": q_num + 1  # Passage starts from NEXT question
-            })
+            # New passage - starts from NEXT question
+            start_passage(m, q_block[m.end():].strip(), q_num + 1)
         else:
             # Normal question
             # Find options start
-            opt_match = re.search(r'\n\s*A\.\s+', q_block)
+            opt_match = RX.first_option_line.search(q_block)
             
             if opt_match and current_pass:
                 # Before options = passage content
@@ -240,99 +556,356 @@ def extract_exam(pdf_path):
                 
                 # Only add if substantial and not question stem
                 if before and len(before) > 30:
-                    if not re.match(r'^(Which|What|The\s+(word|phrase)|According|Where|In\s+which)', before, re.I):
-                        for p in passages:
-                            if p["passage_id"] == current_pass:
-                                p["parts"].append(before)
-                                break
+                    if not RX.question_stem.match(before):
+                        # current_pass is always the latest passage
+                        passages[-1]["parts"].append(before)
             
             # Parse question
-            q_data = parse_question(q_num, q_block, answers, current_pass)
-            if q_data:
-                questions.append(q_data)
-        
-        i += 2
-    
-    # Fix PassageRelated for last question of each passage
-    # Build mapping of passage ranges
-    pass_ranges = []
-    for idx, p in enumerate(passages):
-        q_start = p.get("q_start")
-        if q_start:
-            # Find q_end (start of next passage - 1, or last question)
-            if idx + 1 < len(passages):
-                q_end = passages[idx + 1].get("q_start", len(questions) + 1) - 1
-            else:
-                q_end = len(questions)
-            pass_ranges.append((p["passage_id"], q_start, q_end))
-    
-    # Fix PassageRelated - ensure last question of each passage is correctly assigned
-    # Build correct mapping: questions between passage N and passage N+1 belong to passage N
-    # BUT: Only if the question has "cloze" or "reading" tags
-    # Ordering questions (empty tags) should have PassageRelated = None
-    for idx, (pass_id, q_start, q_end) in enumerate(pass_ranges):
-        # For last passage, include all remaining questions with options
-        if idx == len(pass_ranges) - 1:
-            actual_end = max(q["question_number"] for q in questions if q["options"])
+            with timer.stage("parse_question"):
+                q_data = parse_question(q_num, q_block, no_answers, current_pass)
+            yield from place(q_data)
+    
+    for chunk in chunks:
+        with timer.stage("split"):
+            segments = segmenter.feed(chunk)
+        for kind, value in segments:
+            yield from handle(kind, value)
+    with timer.stage("split"):
+        segments = segmenter.close()
+    for kind, value in segments:
+        yield from handle(kind, value)
+    
+    if passages:
+        with timer.stage("passages"):
+            record = finalize_passage(passages[-1])
+        timer.count("passages")
+        yield "passage", record
+    
+    answers = segmenter.answers
+    for q_data in questions:
+        q_data["answer"] = answers.get(q_data["question_number"], "")
+    
+    links = {}
+    with timer.stage("passage_ranges"):
+        with_options = [q["question_number"] for q in questions if q["options"]]
+        ranges = compute_passage_ranges(passages, max(with_options) if with_options else None)
+        if streamed is not None:
+            before = [q["PassageRelated"] for q in questions[:streamed]]
+            assign_passage_ranges(ranges, questions)
+            links = {
+                str(index): q["PassageRelated"] for index, (q, previous) in enumerate(zip(questions, before))
+                if q["PassageRelated"] != previous
+            }
+    
+    if streamed is not None:
+        for q_data in questions[streamed:]:
+            yield "question", q_data
+    
+    yield "answers", {str(number): letter for number, letter in answers.items()}
+    if links:
+        yield "passage_links", links
+    
+    yield "passage_ranges", {
+        pass_id: {"start": q_start, "end": q_end}
+        for pass_id, q_start, q_end in ranges
+    }
+
+def iter_page_records(page_texts, timer=NULL_TIMER):
+    """iter_chunk_records over per-page texts (pages joined by a blank line, as extracted)"""
+    return iter_chunk_records((text + "\n\n" for text in page_texts), timer)
+
+def iter_exam_records(full_text, timer=NULL_TIMER):
+    """iter_chunk_records over the whole extracted text at once"""
+    return iter_chunk_records([full_text], timer)
+
+def collect_records(records, with_ranges=False):
+    """Assemble iter_exam_records output into the exam result dict"""
+    result = {
+        "passages": [],
+        "questions": []
+    }
+    for kind, record in records:
+        if kind == "passage_ranges":
+            if with_ranges:
+                result["passage_ranges"] = record
+        elif kind == "answers":
+            for q_data in result["questions"]:
+                q_data["answer"] = record.get(str(q_data["question_number"]), "")
+        elif kind == "passage_links":
+            for index, pass_id in record.items():
+                result["questions"][int(index)]["PassageRelated"] = pass_id
         else:
-            # End is one question before next passage starts
-            actual_end = pass_ranges[idx + 1][1] - 1
+            result[kind + "s"].append(record)
+    return result
+
+def extract_exam(pdf_path, workers=None, timer=NULL_TIMER, with_ranges=False, memory=NULL_MEMORY,
+                 backend=DEFAULT_CHAR_BACKEND):
+    """
+    Extract full exam from a PDF or DOCX
+    
+    With with_ranges=True the result also has "passage_ranges":
+    {passage_id: {"start": first question, "end": last question}}
+    
+    Pass a MemoryMonitor for low-memory mode (see iter_page_texts);
+    backend selects the char source (see extract_page_range).
+    """
+    
+    # Read PDF / DOCX
+    chunks = iter_exam_chunks(pdf_path, workers, timer, memory, backend)
+    result = collect_records(iter_chunk_records(chunks, timer), with_ranges)
+    memory.sample()
+    
+    return result
+
+def exam_from_texts(texts, timer=NULL_TIMER, with_ranges=False):
+    """
+    Parse cleaned per-page texts into the exam result dict (extract_exam minus the PDF)
+    
+    texts may be a lazy iterable; pages are parsed as they arrive.
+    """
+    return collect_records(iter_page_records(texts, timer), with_ranges)
+
+def stream_exam(pdf_path, out, workers=None, cache=None, record_fields=None, timer=NULL_TIMER,
+                with_ranges=False, memory=NULL_MEMORY, backend=DEFAULT_CHAR_BACKEND):
+    """
+    Write the exam as NDJSON: one {"type": "passage"|"question", "data": {...}} line
+    per record as soon as it is final, then a {"type": "done", ...} line
+    (carrying "timings" when a StageTimer is passed and "memory" when a
+    MemoryMonitor is)
+    
+    Questions are written before the answer key is read: a
+    {"type": "answers", "data": {"<number>": "B", ...}} line after them
+    fills in "answer", and a rare {"type": "passage_links", ...} line
+    re-links already written questions (see iter_chunk_records).
+    
+    With with_ranges=True a {"type": "passage_ranges", "data": {...}} line
+    precedes "done".
+    
+    Returns:
+        tuple: (result, cached) - the collected result, as extract_exam_cached
+    """
+    record_fields = record_fields or {}
+    
+    def emit(record):
+        out.write(serializer.dumps({**record_fields, **record}) + "\n")
+        out.flush()
+    
+    result = None
+    cached = False
+    key = None
+    if cache is not None:
+        with timer.stage("cache_lookup"):
+            pdf_bytes = read_pdf_bytes(pdf_path)
+            key = make_key(pdf_bytes, PARSER_VERSION)
+            pdf_path = pdf_bytes
+            result = cache.get(key)
+        cached = result is not None
+    
+    if result is not None:
+        for kind in ("passage", "question"):
+            for record in result[kind + "s"]:
+                emit({"type": kind, "data": record})
+        emit({"type": "answers", "data": {
+            str(q["question_number"]): q["answer"] for q in result["questions"] if q["answer"]
+        }})
+        if with_ranges:
+            emit({"type": "passage_ranges", "data": result["passage_ranges"]})
+    else:
+        chunks = iter_exam_chunks(pdf_path, workers, timer, memory, backend)
         
-        # Apply to all questions in range
-        for q in questions:
-            if q_start <= q["question_number"] <= actual_end:
-                if q["options"]:  # Has options
-                    # Only set PassageRelated if question has tags (not ordering)
-                    if q.get("tags"):
-                        q["PassageRelated"] = pass_id
-                    else:
-                        q["PassageRelated"] = None
-    
-    # Finalize passages
-    for p in passages:
-        combined = '\n\n'.join(p["parts"])
-        # Remove blanks (6) _____
-        combined = re.sub(r'\([0-9]+\)\s*_{2,}[^\n]*', '', combined)
-        p["content"] = to_html_paragraphs(combined)
-        del p["parts"]
-        if "q_start" in p:  # Safely remove q_start if exists
-            del p["q_start"]
-    
-    # Don't print anything - will output JSON to stdout later
+        def records():
+            for kind, record in iter_chunk_records(chunks, timer):
+                if kind != "passage_ranges" or with_ranges:
+                    emit({"type": kind, "data": record})
+                yield kind, record
+        
+        result = collect_records(records(), with_ranges=True)
+        if key is not None:
+            cache.put(key, result)
     
+    done = {
+        "type": "done",
+        "passages": len(result["passages"]),
+        "questions": len(result["questions"]),
+        "cached": cached
+    }
+    if timer:
+        done["timings"] = timer.to_dict()
+    if memory:
+        memory.sample()
+        done["memory"] = memory.to_dict()
+    emit(done)
+    return result, cached
+
+def read_pdf_bytes(pdf_path):
+    """Raw bytes of a PDF given as path, bytes or file-like object"""
+    if isinstance(pdf_path, bytes):
+        return pdf_path
+    if hasattr(pdf_path, "read"):
+        return pdf_path.read()
+    with open(pdf_path, "rb") as f:
+        return f.read()
+
+def without_ranges(result):
+    """Drop passage_ranges from a (cached) result unless it was asked for"""
     return {
-        "passages": passages,
-        "questions": questions
+        "passages": result["passages"],
+        "questions": result["questions"]
     }
 
+def extract_exam_cached(pdf_path, workers=None, cache=None, timer=NULL_TIMER, with_ranges=False,
+                        memory=NULL_MEMORY, backend=DEFAULT_CHAR_BACKEND):
+    """
+    Extract exam, reusing the cached result for identical PDF bytes
+    
+    Cache entries always hold passage_ranges; it is only returned with with_ranges=True.
+    
+    Returns:
+        tuple: (result, cached) where cached is True on a cache hit
+    """
+    if cache is None:
+        return extract_exam(pdf_path, workers, timer, with_ranges, memory, backend), False
+    
+    with timer.stage("cache_lookup"):
+        pdf_bytes = read_pdf_bytes(pdf_path)
+        key = make_key(pdf_bytes, PARSER_VERSION)
+        result = cache.get(key)
+    cached = result is not None
+    
+    if not cached:
+        result = extract_exam(pdf_bytes, workers, timer, with_ranges=True, memory=memory, backend=backend)
+        cache.put(key, result)
+    
+    return (result if with_ranges else without_ranges(result)), cached
+
+# Option marker styles, in the order the old per-style scans were concatenated
+# (used to break ties between markers that start at the same position)
+STYLE_BOLD_SPACED = 0  # <b> A. </b>
+STYLE_BOLD = 1         # <b>A.</b>
+STYLE_SPACE = 2        # A. preceded by whitespace or start of text
+STYLE_NEWLINE = 3      # A. at the start of a line
+STYLE_SIMPLE = 4       # A. at a word boundary
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+def tokenize_option_markers(text):
+    """
+    Single pass over every "X." (X in A-D) candidate in the text
+    
+    Each candidate is classified against every marker style by looking at the
+    whitespace and <b> tags around it. Per style, a marker is only accepted if
+    it starts at or after the end of the previous marker of that style, which
+    reproduces the non-overlapping semantics of a finditer scan per style.
+    
+    Returns:
+        list: (start, end, letter, style) in text order
+    """
+    tokens = []
+    last_end = [0] * 5
+    length = len(text)
+    
+    for m in RX.option_marker.finditer(text):
+        pos = m.start()
+        letter = text[pos]
+        
+        # Whitespace run after "X." and before the letter
+        after = pos + 2
+        ws_end = after
+        while ws_end < length and text[ws_end].isspace():
+            ws_end += 1
+        ws_start = pos
+        while ws_start > 0 and text[ws_start - 1].isspace():
+            ws_start -= 1
+        
+        found = []
+        
+        # <b>\s*X\.\s*</b>
+        if ws_start >= 3 and text.startswith('<b>', ws_start - 3) and text.startswith('</b>', ws_end):
+            found.append((ws_start - 3, ws_end + 4, STYLE_BOLD_SPACED))
+        
+        # <b>X\.</b>
+        if pos >= 3 and text.startswith('<b>', pos - 3) and text.startswith('</b>', after):
+            found.append((pos - 3, after + 4, STYLE_BOLD))
+        
+        if ws_end > after:
+            # (?:^|\s)X\.\s+
+            if pos == 0:
+                found.append((0, ws_end, STYLE_SPACE))
+            elif ws_start < pos:
+                found.append((pos - 1, ws_end, STYLE_SPACE))
+            
+            # \nX\.\s+ with only whitespace in between - leftmost newline still available
+            newline = text.find('\n', max(ws_start, last_end[STYLE_NEWLINE]), pos)
+            if newline != -1:
+                found.append((newline, ws_end, STYLE_NEWLINE))
+            
+            # \bX\.\s+
+            if pos == 0 or not _is_word_char(text[pos - 1]):
+                found.append((pos, ws_end, STYLE_SIMPLE))
+        
+        found.sort()
+        for start, end, style in found:
+            if start >= last_end[style]:
+                tokens.append((start, end, letter, style))
+                last_end[style] = end
+    
+    return tokens
+
+def select_option_spans(markers, text_length):
+    """
+    Turn a marker sequence into (letter, start, end) option spans in one pass
+    
+    Repeated consecutive letters are skipped, and each option runs until the
+    next marker with a different letter (or the end of the text).
+    """
+    # next_diff[i] = index of the first marker after i with a different letter
+    count = len(markers)
+    next_diff = [count] * count
+    for idx in range(count - 2, -1, -1):
+        if markers[idx + 1][2] != markers[idx][2]:
+            next_diff[idx] = idx + 1
+        else:
+            next_diff[idx] = next_diff[idx + 1]
+    
+    spans = []
+    last_letter = None
+    for idx, (_, end, letter, _) in enumerate(markers):
+        if letter == last_letter:
+            continue
+        last_letter = letter
+        nxt = next_diff[idx]
+        spans.append((letter, end, markers[nxt][0] if nxt < count else text_length))
+    return spans
+
 def parse_question(q_num, text, answers, pass_id):
-    """Parse question with options"""
+    """
+    Parse question with options
+    
+    text must already be clean_text output (extract_exam and the segmenter
+    only hand over slices of cleaned text): option texts go through
+    clean_slice, which skips the regex pass when a slice cannot differ from
+    its cleaned form. Raw text still parses, but its whitespace is not
+    normalised the way clean_text would.
+    """
+    
+    # One scan classifies every option marker by style
+    markers = tokenize_option_markers(text)
+    by_style = [[], [], [], [], []]
+    for token in markers:
+        by_style[token[3]].append(token)
     
     # Special handling for ordering questions (Q1-Q5)
     # These have a-, b-, c- as question parts, then A., B., C. as options
-    # Look for uppercase A., B., C., D. pattern first
-    # Try multiple patterns for bold format
-    uppercase_bold1 = list(re.finditer(r'<b>\s*([A-D])\.\s*</b>', text))
-    uppercase_bold2 = list(re.finditer(r'<b>([A-D])\.</b>', text))
-    uppercase_space = list(re.finditer(r'(?:^|\s)([A-D])\.\s+', text))
-    
-    # Combine and sort by position
-    all_uppercase = []
-    for m in uppercase_bold1:
-        all_uppercase.append(m)
-    for m in uppercase_bold2:
-        all_uppercase.append(m)
-    for m in uppercase_space:
-        all_uppercase.append(m)
-    
-    all_uppercase.sort(key=lambda m: m.start())
+    # Look for uppercase A., B., C., D. pattern first (bold or space separated)
+    all_uppercase = [t for t in markers if t[3] <= STYLE_SPACE]
     
     # Filter uppercase options (should be near end of text)
     if all_uppercase:
         # Check if these are real options (appear after lowercase a-, b-, etc.)
         # For ordering questions, we need at least 3 lowercase items (a-, b-, c-)
-        first_upper = all_uppercase[0].start()
-        lowercase_items = re.findall(r'\b[a-e]\s*-', text[:first_upper])
+        first_upper = all_uppercase[0][0]
+        lowercase_items = RX.ordering_item.findall(text, 0, first_upper)
         has_lowercase_before = len(lowercase_items) >= 3
         
         if has_lowercase_before and len(all_uppercase) >= 3:
@@ -342,31 +915,14 @@ def parse_question(q_num, text, answers, pass_id):
             
             # Extract uppercase options
             options = {}
-            last_letter = None
             
-            for idx, m in enumerate(all_uppercase):
-                letter = m.group(1)
-                
-                if letter not in ['A', 'B', 'C', 'D'] or letter == last_letter:
-                    continue
-                
-                last_letter = letter
-                start = m.end()
-                
-                # Find end
-                end = len(text)
-                for j in range(idx + 1, len(all_uppercase)):
-                    next_letter = all_uppercase[j].group(1)
-                    if next_letter != letter and next_letter in ['A', 'B', 'C', 'D']:
-                        end = all_uppercase[j].start()
-                        break
-                
+            for letter, start, end in select_option_spans(all_uppercase, len(text)):
                 opt_text = text[start:end].strip()
-                opt_text = clean_text(opt_text)
-                opt_text = re.sub(r'</?b>\s*$', '', opt_text).strip()
-                opt_text = re.sub(r'^\s*</?b>\s*', '', opt_text).strip()
-                opt_text = re.sub(r'\s*[–-]\s*[a-e]\s*<b>\s*$', '', opt_text).strip()
-                opt_text = re.sub(r'\n{2,}.*$', '', opt_text).strip()  # Remove double newlines and after
+                opt_text = clean_slice(opt_text)
+                opt_text = RX.trailing_bold_tag.sub('', opt_text).strip()
+                opt_text = RX.leading_bold_tag.sub('', opt_text).strip()
+                opt_text = RX.trailing_item_dash_bold.sub('', opt_text).strip()
+                opt_text = RX.after_blank_line.sub('', opt_text).strip()  # Remove double newlines and after
                 
                 options[letter] = opt_text
                 if len(options) == 4:
@@ -382,20 +938,14 @@ def parse_question(q_num, text, answers, pass_id):
             }
     
     # Regular question processing
-    # Try finding options with various patterns
     # Pattern 1: A. on new line
-    opts_newline = list(re.finditer(r'\n\s*([A-D])\.\s+', text))
+    opts_newline = by_style[STYLE_NEWLINE]
     
     # Pattern 2: <b> A.</b> or <b>A.</b> inline (from bold formatting)
-    opts_inline1 = list(re.finditer(r'<b>\s*([A-D])\.\s*</b>', text))
-    opts_inline2 = list(re.finditer(r'<b>([A-D])\.</b>', text))
+    opts_inline = [t for t in markers if t[3] <= STYLE_BOLD]
     
     # Pattern 3: Simple A. pattern
-    opts_simple = list(re.finditer(r'\b([A-D])\.\s+', text))
-    
-    # Combine inline patterns
-    opts_inline = opts_inline1 + opts_inline2
-    opts_inline.sort(key=lambda m: m.start())
+    opts_simple = by_style[STYLE_SIMPLE]
     
     # Use the pattern that finds the most options (prefer 4)
     opts = opts_newline
@@ -416,50 +966,27 @@ def parse_question(q_num, text, answers, pass_id):
         }
     
     # Extract question text (before first option)
-    q_text = text[:opts[0].start()].strip()
+    q_text = text[:opts[0][0]].strip()
     
     # Determine question type by checking keywords
     tags = []
     
     # Strip bold tags for pattern matching
-    q_text_plain = re.sub(r'</?b>', '', q_text)
+    q_text_plain = RX.bold_tag.sub('', q_text)
     
     # Check for cloze test (fill in the blank with numbered blanks)
-    if re.search(r'\(\s*\d+\s*\)\s*_{2,}', q_text_plain):
+    if RX.cloze_blank.search(q_text_plain):
         tags.append("cloze")
     # Check for reading comprehension keywords
-    elif re.search(r'(according to|which of the following|the word|the phrase|best summarises?|TRUE according|NOT mentioned|refers to|could be best replaced|best paraphrases?|in which paragraph|where in paragraph)', q_text_plain, re.I):
+    elif RX.reading_keywords.search(q_text_plain):
         tags.append("reading")
     
     # Extract options
     options = {}
-    last_letter = None
     
-    for idx, m in enumerate(opts):
-        letter = m.group(1)
-        
-        # Skip if not A, B, C, or D
-        if letter not in ['A', 'B', 'C', 'D']:
-            continue
-        
-        # Skip duplicates
-        if letter == last_letter:
-            continue
-        
-        last_letter = letter
-        
-        start = m.end()
-        
-        # Find end (next option or end of text)
-        end = len(text)
-        for j in range(idx + 1, len(opts)):
-            next_letter = opts[j].group(1)
-            if next_letter != letter and next_letter in ['A', 'B', 'C', 'D']:
-                end = opts[j].start()
-                break
-        
+    for letter, start, end in select_option_spans(opts, len(text)):
         opt_text = text[start:end].strip()
-        opt_text = clean_text(opt_text)
+        opt_text = clean_slice(opt_text)
         
         # Clean up trailing garbage (newlines, bold tags, spaces)
         # Remove everything after double newlines
@@ -467,11 +994,11 @@ def parse_question(q_num, text, answers, pass_id):
             opt_text = opt_text.split('\n\n')[0].strip()
         
         # Remove trailing bold tags and spaces
-        opt_text = re.sub(r'(</?b>|\s)+$', '', opt_text).strip()
-        opt_text = re.sub(r'^(</?b>|\s)+', '', opt_text).strip()
+        opt_text = RX.trailing_bold_or_space.sub('', opt_text).strip()
+        opt_text = RX.leading_bold_or_space.sub('', opt_text).strip()
         
         # Remove trailing dashes
-        opt_text = re.sub(r'\s*[–-]\s*[a-e]$', '', opt_text)
+        opt_text = RX.trailing_item_dash.sub('', opt_text)
         
         # Stop if we found all 4 options
         options[letter] = opt_text
@@ -487,18 +1014,197 @@ def parse_question(q_num, text, answers, pass_id):
         "tags": tags
     }
 
+def run_worker(stdin=None, stdout=None, cache=None):
+    """
+    Long-lived worker loop: one JSON job per line on stdin, one JSON result per line on stdout
+
+    Job format:
+        {"id": "job-1", "pdf_path": "/abs/path/exam.pdf"}
+        {"id": "job-2", "pdf_base64": "<base64 encoded PDF bytes>", "workers": 4}
+        {"id": "job-3", "command": "cache_stats"}
+        {"id": "job-4", "command": "regex_stats"}    (needs PDF_PROFILE_REGEX=1 or --regex-stats)
+        {"id": "job-5", "pdf_path": "/abs/path/exam.pdf", "stream": true}
+        {"id": "job-6", "pdf_path": "/abs/path/exam.pdf", "timings": true}
+        {"id": "job-7", "pdf_path": "/abs/path/exam.pdf", "ranges": true}
+        {"id": "job-8", "pdf_path": "/abs/path/exam.docx"}          (DOCX is detected by content)
+
+    Result format:
+        {"id": "job-1", "success": true, "cached": false, "result": {"passages": [...], "questions": [...]}}
+        {"id": "job-2", "success": false, "error": "...", "type": "ValueError"}
+        {"id": "job-3", "success": true, "result": {"hits": 3, "misses": 1, ...}}
+        {"id": "job-6", "success": true, "cached": false, "result": {...}, "timings": {"stages": {...}, ...}}
+    
+    Streaming jobs first write one line per record (see stream_exam), tagged with the job id:
+        {"id": "job-5", "type": "passage", "data": {...}}
+        {"id": "job-5", "type": "question", "data": {...}}
+        {"id": "job-5", "type": "answers", "data": {"1": "B", ...}}
+        {"id": "job-5", "type": "done", "passages": 5, "questions": 40, "cached": false}
+        {"id": "job-5", "success": true, "cached": false}
+    """
+    import sys
+    import base64
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job_id = None
+        try:
+            job = serializer.loads(line)
+            job_id = job.get("id")
+
+            if job.get("command") == "cache_stats":
+                response = {
+                    "id": job_id,
+                    "success": True,
+                    "result": cache.stats() if cache else None
+                }
+            elif job.get("command") == "regex_stats":
+                response = {
+                    "id": job_id,
+                    "success": True,
+                    "result": RX.stats()
+                }
+            else:
+                if job.get("pdf_path"):
+                    source = job["pdf_path"]
+                elif job.get("pdf_base64"):
+                    source = base64.b64decode(job["pdf_base64"])
+                else:
+                    raise ValueError("Job must contain 'pdf_path' or 'pdf_base64'")
+
+                timer = StageTimer() if job.get("timings") else NULL_TIMER
+                memory = NULL_MEMORY
+                if job.get("low_memory") or job.get("memory_limit_mb"):
+                    memory = MemoryMonitor(job.get("memory_limit_mb") or DEFAULT_MEMORY_LIMIT_MB)
+                if job.get("stream"):
+                    _, cached = stream_exam(source, stdout, workers=job.get("workers"), cache=cache,
+                                            record_fields={"id": job_id}, timer=timer,
+                                            with_ranges=bool(job.get("ranges")), memory=memory,
+                                            backend=job.get("char_backend", DEFAULT_CHAR_BACKEND))
+                    response = {
+                        "id": job_id,
+                        "success": True,
+                        "cached": cached
+                    }
+                else:
+                    result, cached = extract_exam_cached(source, workers=job.get("workers"), cache=cache,
+                                                         timer=timer, with_ranges=bool(job.get("ranges")),
+                                                         memory=memory,
+                                                         backend=job.get("char_backend", DEFAULT_CHAR_BACKEND))
+                    response = {
+                        "id": job_id,
+                        "success": True,
+                        "cached": cached,
+                        "result": result
+                    }
+                    if timer:
+                        response["timings"] = timer.to_dict()
+                    if memory:
+                        response["memory"] = memory.to_dict()
+        except Exception as e:
+            response = {
+                "id": job_id,
+                "success": False,
+                "error": str(e),
+                "type": type(e).__name__
+            }
+
+        # One line per job, flushed so the caller can read it immediately
+        stdout.write(serializer.dumps(response) + "\n")
+        stdout.flush()
+
 # Main
 if __name__ == "__main__":
+    import argparse
     import sys
+
+    parser = argparse.ArgumentParser(description="Convert exam PDF to structured JSON")
+    parser.add_argument("pdf_path", nargs="?", default="de_tieng_anh.pdf",
+                        help="Path to the exam PDF (or DOCX)")
+    parser.add_argument("--worker", action="store_true",
+                        help="Run as a long-lived worker reading NDJSON jobs from stdin")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Extract pages in parallel with N processes (default: serial)")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Indent the JSON output (default: compact)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write one NDJSON record per passage/question as soon as it is final")
+    parser.add_argument("--ranges", action="store_true",
+                        help="Include the passage -> question range map (passage_ranges)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-run extraction, bypassing the result cache")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Result cache directory (default: $PDF_CACHE_DIR or .cache/extraction)")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Print cache statistics to stderr after extraction")
+    parser.add_argument("--regex-stats", action="store_true",
+                        help="Time every regex and print per-pattern counters to stderr")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-stage wall times and counts as JSON to stderr "
+                             "(in the final record with --stream)")
+    parser.add_argument("--profile-out", default=None,
+                        help="Write a cProfile dump of this run to the given file")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Serial extraction with peak memory reported as JSON to stderr "
+                             "(in the final record with --stream)")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help="Abort once RSS exceeds this many MB (implies --low-memory; "
+                             "default: $PDF_MEMORY_LIMIT_MB)")
+    parser.add_argument("--char-backend", choices=CHAR_BACKENDS, default=DEFAULT_CHAR_BACKEND,
+                        help="Where chars come from: full pdfplumber layout or glyphs only "
+                             "(default: $PDF_CHAR_BACKEND or pdfplumber)")
+    args = parser.parse_args()
+
+    if args.regex_stats:
+        RX.enable_profiling()
     
-    # Check if PDF path is provided as command line argument
-    if len(sys.argv) > 1:
-        pdf_path = sys.argv[1]
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(args.cache_dir) if args.cache_dir else ExtractionCache()
+
+    if args.worker:
+        run_worker(cache=cache)
     else:
-        pdf_path = "de_tieng_anh.pdf"
-    
-    # Extract exam from PDF
-    result = extract_exam(pdf_path)
-    
-    # Output JSON to stdout for Node.js to capture
-    print(json.dumps(result, ensure_ascii=False))
+        timer = StageTimer() if args.timings else NULL_TIMER
+        memory = NULL_MEMORY
+        if args.low_memory or args.memory_limit_mb:
+            memory = MemoryMonitor(args.memory_limit_mb or DEFAULT_MEMORY_LIMIT_MB)
+        
+        profiler = None
+        if args.profile_out:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        if args.stream:
+            # NDJSON records to stdout as they are finalized
+            stream_exam(args.pdf_path, sys.stdout, workers=args.workers, cache=cache, timer=timer,
+                        with_ranges=args.ranges, memory=memory, backend=args.char_backend)
+        else:
+            # Extract exam from PDF
+            result, _ = extract_exam_cached(args.pdf_path, workers=args.workers, cache=cache, timer=timer,
+                                            with_ranges=args.ranges, memory=memory, backend=args.char_backend)
+
+            # Output JSON to stdout for Node.js to capture
+            print(serializer.dumps(result, pretty=args.pretty))
+        
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile_out)
+        
+        if timer and not args.stream:
+            print(json.dumps(timer.to_dict()), file=sys.stderr)
+        
+        if memory and not args.stream:
+            print(json.dumps({"memory": memory.to_dict()}), file=sys.stderr)
+
+        if args.cache_stats and cache:
+            print(json.dumps(cache.stats()), file=sys.stderr)
+        
+        if args.regex_stats:
+            print(json.dumps(RX.stats()), file=sys.stderr)
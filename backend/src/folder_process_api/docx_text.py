@@ -0,0 +1,338 @@
+"""
+DOCX paragraph reader
+=====================
+A Word file already has the structure extract_with_bold has to recover from
+a PDF's glyph positions: text comes in paragraphs, and bold is a run
+property. iter_docx_paragraphs reads word/document.xml straight out of the
+zip (no python-docx, no layout analysis) and yields, per paragraph:
+
+- its text, with <b>...</b> around bold runs (bold resolved from the run's
+  own properties, then its character style, the paragraph style chain and
+  the document defaults)
+- auto-numbering labels rendered the way Word displays them ("A.", "1."),
+  bold when the numbering level is, so option lists numbered by Word look
+  like typed "A. ..." lines
+- whether a paragraph gap precedes it: spacing before/after (direct, from
+  the style chain or the defaults) of at least PARAGRAPH_GAP_TWIPS, the
+  DOCX counterpart of extract_with_bold's vertical-gap rule
+
+Tables are read cell by cell in document order; text boxes, deleted text and
+drawings are skipped. document.xml is parsed incrementally, so only the
+current paragraph is held in memory.
+
+normalise() puts an exam result in a form where the DOCX and the exported
+PDF of the same document compare equal.
+"""
+import io
+import json
+import re
+import zipfile
+from xml.etree import ElementTree
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCUMENT_XML = "word/document.xml"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# 2pt: anything more between paragraphs reads as a paragraph break
+PARAGRAPH_GAP_TWIPS = 40
+
+# Containers whose runs are not part of the paragraph's own text
+_SKIP = {W + "txbxContent", W + "del", W + "moveFrom", W + "drawing", W + "pict", W + "object",
+         "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"}
+_FALSE = {"0", "false", "off", "none"}
+_NOISE = re.compile(r"\s+|</?b>")
+_ROMAN = ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+          (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"))
+
+
+def normalise(result):
+    """
+    Result JSON with whitespace and bold tags dropped, for cross-format comparison
+
+    Line wrapping in a PDF adds double spaces and splits bold runs; the DOCX
+    has neither.
+    """
+    return _NOISE.sub("", json.dumps(result, ensure_ascii=False).replace("\\n", ""))
+
+
+def is_docx(source):
+    """True for a DOCX given as path, bytes or file-like object (by zip magic + document part)"""
+    pos = None
+    if isinstance(source, (bytes, bytearray)):
+        head = bytes(source[:4])
+    elif hasattr(source, "read"):
+        pos = source.tell()
+        head = source.read(4)
+        source.seek(pos)
+    else:
+        with open(source, "rb") as f:
+            head = f.read(4)
+    if head != ZIP_MAGIC:
+        return False
+    try:
+        with _open_zip(source) as docx:
+            return DOCUMENT_XML in docx.namelist()
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        if pos is not None:
+            source.seek(pos)
+
+
+def _open_zip(source):
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return zipfile.ZipFile(source)
+
+
+def _val(element, name, default=None):
+    child = element.find(W + name) if element is not None else None
+    return default if child is None else child.get(W + "val", default)
+
+
+def _bold(rpr):
+    """True/False if rpr sets bold, None if it does not say"""
+    if rpr is None:
+        return None
+    b = rpr.find(W + "b")
+    if b is None:
+        return None
+    return b.get(W + "val", "true").lower() not in _FALSE
+
+
+def _spacing(ppr):
+    """(before, after) twips set by ppr; None where it does not say"""
+    spacing = ppr.find(W + "spacing") if ppr is not None else None
+    if spacing is None:
+        return None, None
+    before, after = spacing.get(W + "before"), spacing.get(W + "after")
+    return (int(before) if before is not None else None,
+            int(after) if after is not None else None)
+
+
+def _number_text(value, fmt):
+    if fmt in ("upperLetter", "lowerLetter"):
+        # Word repeats the letter past Z: AA, BB, ...
+        letter = chr(ord("A") + (value - 1) % 26) * ((value - 1) // 26 + 1)
+        return letter if fmt == "upperLetter" else letter.lower()
+    if fmt in ("upperRoman", "lowerRoman"):
+        roman = ""
+        for amount, numeral in _ROMAN:
+            count, value = divmod(value, amount)
+            roman += numeral * count
+        return roman if fmt == "upperRoman" else roman.lower()
+    if fmt == "decimalZero":
+        return f"{value:02d}"
+    return str(value)
+
+
+class DocxStyles:
+    """Style chain, document defaults and numbering definitions of one DOCX"""
+
+    def __init__(self, docx):
+        self.styles = {}
+        self.default_bold = None
+        self.default_spacing = (None, None)
+        self.default_paragraph_style = None
+        self.levels = {}       # (numId, ilvl) -> (start, numFmt, lvlText, bold, suffix)
+        self.counters = {}     # numId -> [count per ilvl]
+
+        names = set(docx.namelist())
+        if "word/styles.xml" in names:
+            root = ElementTree.fromstring(docx.read("word/styles.xml"))
+            defaults = root.find(W + "docDefaults")
+            if defaults is not None:
+                self.default_bold = _bold(defaults.find(f"{W}rPrDefault/{W}rPr"))
+                self.default_spacing = _spacing(defaults.find(f"{W}pPrDefault/{W}pPr"))
+            for style in root.iter(W + "style"):
+                style_id = style.get(W + "styleId")
+                ppr = style.find(W + "pPr")
+                num_pr = ppr.find(W + "numPr") if ppr is not None else None
+                self.styles[style_id] = {
+                    "based_on": _val(style, "basedOn"),
+                    "bold": _bold(style.find(W + "rPr")),
+                    "spacing": _spacing(ppr),
+                    "num": (_val(num_pr, "numId"), _val(num_pr, "ilvl")) if num_pr is not None else None
+                }
+                if style.get(W + "type") == "paragraph" and style.get(W + "default") in ("1", "true"):
+                    self.default_paragraph_style = style_id
+
+        if "word/numbering.xml" in names:
+            root = ElementTree.fromstring(docx.read("word/numbering.xml"))
+            abstract = {}
+            for definition in root.iter(W + "abstractNum"):
+                abstract[definition.get(W + "abstractNumId")] = {
+                    level.get(W + "ilvl"): level for level in definition.iter(W + "lvl")
+                }
+            for num in root.iter(W + "num"):
+                num_id = num.get(W + "numId")
+                overrides = {o.get(W + "ilvl"): o for o in num.iter(W + "lvlOverride")}
+                for ilvl, level in abstract.get(_val(num, "abstractNumId"), {}).items():
+                    override = overrides.get(ilvl)
+                    if override is not None and override.find(W + "lvl") is not None:
+                        level = override.find(W + "lvl")
+                    start = _val(override, "startOverride") or _val(level, "start", "1")
+                    self.levels[num_id, ilvl] = (
+                        int(start),
+                        _val(level, "numFmt", "decimal"),
+                        _val(level, "lvlText", ""),
+                        bool(_bold(level.find(W + "rPr"))),
+                        _val(level, "suff", "tab")
+                    )
+
+    def chain(self, style_id):
+        """Style ids from style_id up its basedOn chain"""
+        seen = []
+        while style_id in self.styles and style_id not in seen:
+            seen.append(style_id)
+            style_id = self.styles[style_id]["based_on"]
+        return seen
+
+    def style_bold(self, style_id):
+        for sid in self.chain(style_id):
+            if self.styles[sid]["bold"] is not None:
+                return self.styles[sid]["bold"]
+        return None
+
+    def spacing(self, ppr, style_id):
+        """(before, after) twips, resolved through the style chain and defaults"""
+        before, after = _spacing(ppr)
+        for sid in self.chain(style_id):
+            style_before, style_after = self.styles[sid]["spacing"]
+            before = style_before if before is None else before
+            after = style_after if after is None else after
+        before = self.default_spacing[0] if before is None else before
+        after = self.default_spacing[1] if after is None else after
+        return before or 0, after or 0
+
+    def numbering(self, num_pr, style_id):
+        """(numId, ilvl) of the paragraph's list, or None"""
+        if num_pr is not None:
+            return _val(num_pr, "numId"), _val(num_pr, "ilvl", "0")
+        for sid in self.chain(style_id):
+            if self.styles[sid]["num"] is not None:
+                num_id, ilvl = self.styles[sid]["num"]
+                return num_id, ilvl or "0"
+        return None
+
+    def label(self, num_id, ilvl):
+        """Next label of list num_id at level ilvl as (text, bold), or None"""
+        level = self.levels.get((num_id, ilvl))
+        if level is None or num_id == "0":
+            return None
+        depth = int(ilvl)
+        counters = self.counters.setdefault(num_id, [0] * 9)
+        for deeper in range(depth + 1, len(counters)):
+            counters[deeper] = 0
+        counters[depth] = (counters[depth] or level[0] - 1) + 1
+
+        _, fmt, text, bold, suffix = level
+        if fmt == "none":
+            text = ""
+        elif fmt == "bullet":
+            text = "•"
+        else:
+            for lvl in range(depth + 1):
+                placeholder = f"%{lvl + 1}"
+                if placeholder in text:
+                    lvl_fmt = self.levels.get((num_id, str(lvl)), level)[1]
+                    value = counters[lvl] or self.levels.get((num_id, str(lvl)), level)[0]
+                    text = text.replace(placeholder, _number_text(value, lvl_fmt))
+        if not text:
+            return None
+        return text + ("" if suffix == "nothing" else " "), bold
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W + "t":
+            parts.append(child.text or "")
+        elif tag == W + "tab":
+            parts.append("\t")
+        elif tag in (W + "br", W + "cr"):
+            parts.append("\n")
+        elif tag == W + "noBreakHyphen":
+            parts.append("-")
+    return "".join(parts)
+
+
+def _iter_runs(element):
+    """w:r elements of a paragraph, through hyperlinks/fields/insertions, skipping _SKIP"""
+    for child in element:
+        if child.tag == W + "r":
+            yield child
+        elif child.tag not in _SKIP and child.tag != W + "pPr":
+            yield from _iter_runs(child)
+
+
+def _paragraph(p, styles):
+    """(text with <b> tags, before twips, after twips) of one w:p"""
+    ppr = p.find(W + "pPr")
+    style_id = _val(ppr, "pStyle") or styles.default_paragraph_style
+    paragraph_bold = styles.style_bold(style_id)
+    if paragraph_bold is None:
+        paragraph_bold = styles.default_bold
+
+    output = []
+    is_bold = False
+
+    def emit(text, bold):
+        nonlocal is_bold
+        if bold != is_bold:
+            output.append("<b>" if bold else "</b>")
+            is_bold = bold
+        output.append(text)
+
+    numbering = styles.numbering(ppr.find(W + "numPr") if ppr is not None else None, style_id)
+    label = styles.label(*numbering) if numbering else None
+
+    for run in _iter_runs(p):
+        text = _run_text(run)
+        if not text:
+            continue
+        if label:
+            emit(*label)
+            label = None
+        rpr = run.find(W + "rPr")
+        bold = _bold(rpr)
+        if bold is None:
+            bold = styles.style_bold(_val(rpr, "rStyle")) if rpr is not None else None
+        if bold is None:
+            bold = paragraph_bold
+        emit(text, bool(bold))
+    if is_bold:
+        output.append("</b>")
+
+    before, after = styles.spacing(ppr, style_id)
+    return "".join(output), before, after
+
+
+def iter_docx_paragraphs(source):
+    """
+    Yield (text, paragraph_break) per paragraph of a DOCX in document order
+
+    text carries <b> tags and is not cleaned; paragraph_break is True when
+    the spacing between this paragraph and the previous one is at least
+    PARAGRAPH_GAP_TWIPS.
+    """
+    with _open_zip(source) as docx:
+        styles = DocxStyles(docx)
+        with docx.open(DOCUMENT_XML) as document:
+            depth = 0
+            prev_after = 0
+            for event, element in ElementTree.iterparse(document, events=("start", "end")):
+                if element.tag != W + "p":
+                    continue
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth:
+                    # Paragraph inside a text box - not part of the flow
+                    continue
+                text, before, after = _paragraph(element, styles)
+                element.clear()
+                yield text, prev_after + before >= PARAGRAPH_GAP_TWIPS
+                prev_after = after
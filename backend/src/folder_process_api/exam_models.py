@@ -0,0 +1,179 @@
+"""
+Compact records for mapped exams
+================================
+Question, Option and ExamQuestion use __slots__ instead of a dict per
+record, and every Question points at one shared QuestionDefaults holding
+the fields that are the same for the whole batch (type, difficulty, subject,
+points, isPublic, createdBy).
+
+Records are read-only Mappings over the GoPass JSON keys, so existing code
+that does q["tags"], dict(q, id=...) or compares against plain dicts keeps
+working. to_dict() produces the exact JSON shape (same keys, same order);
+serializer calls it when dumping.
+"""
+from collections.abc import Mapping
+from operator import attrgetter
+
+
+class Record(Mapping):
+    """Read-only Mapping view over slot attributes; subclasses define _GETTERS"""
+
+    __slots__ = ()
+    _GETTERS = {}  # JSON key -> getter(record), in output order
+
+    def __getitem__(self, key):
+        try:
+            getter = self._GETTERS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getter(self)
+
+    def __iter__(self):
+        return iter(self._GETTERS)
+
+    def __len__(self):
+        return len(self._GETTERS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        return {key: getter(self) for key, getter in self._GETTERS.items()}
+
+
+class QuestionDefaults:
+    """Fields shared by every question of a batch"""
+
+    __slots__ = ("type", "difficulty", "subject", "points", "is_public", "created_by")
+
+    def __init__(self, type, difficulty, subject, points, is_public, created_by):
+        self.type = type
+        self.difficulty = difficulty
+        self.subject = subject
+        self.points = points
+        self.is_public = is_public
+        self.created_by = created_by
+
+
+class Option(Record):
+    __slots__ = ("id", "content", "is_correct")
+    _GETTERS = {
+        "id": attrgetter("id"),
+        "content": attrgetter("content"),
+        "isCorrect": attrgetter("is_correct")
+    }
+
+    def __init__(self, id, content, is_correct):
+        self.id = id
+        self.content = content
+        self.is_correct = is_correct
+
+    def to_dict(self):
+        return {"id": self.id, "content": self.content, "isCorrect": self.is_correct}
+
+
+class Question(Record):
+    __slots__ = ("id", "content", "options", "correct_answer", "explanation", "linked_passage_id",
+                 "tags", "defaults")
+    _GETTERS = {
+        "id": attrgetter("id"),
+        "type": attrgetter("defaults.type"),
+        "content": attrgetter("content"),
+        "options": attrgetter("options"),
+        "correctAnswer": attrgetter("correct_answer"),
+        "explanation": attrgetter("explanation"),
+        "difficulty": attrgetter("defaults.difficulty"),
+        "linkedPassageId": attrgetter("linked_passage_id"),
+        "subject": attrgetter("defaults.subject"),
+        "points": attrgetter("defaults.points"),
+        "isPublic": attrgetter("defaults.is_public"),
+        "createdBy": attrgetter("defaults.created_by"),
+        "tags": attrgetter("tags")
+    }
+
+    def __init__(self, id, content, options, correct_answer, explanation, linked_passage_id, tags, defaults):
+        self.id = id
+        self.content = content
+        self.options = options
+        self.correct_answer = correct_answer
+        self.explanation = explanation
+        self.linked_passage_id = linked_passage_id
+        self.tags = tags
+        self.defaults = defaults
+
+    def to_dict(self):
+        defaults = self.defaults
+        return {
+            "id": self.id,
+            "type": defaults.type,
+            "content": self.content,
+            "options": [option.to_dict() for option in self.options],
+            "correctAnswer": self.correct_answer,
+            "explanation": self.explanation,
+            "difficulty": defaults.difficulty,
+            "linkedPassageId": self.linked_passage_id,
+            "subject": defaults.subject,
+            "points": defaults.points,
+            "isPublic": defaults.is_public,
+            "createdBy": defaults.created_by,
+            "tags": self.tags
+        }
+
+
+class ExamQuestion(Record):
+    __slots__ = ("exam_id", "question_id", "order", "section", "max_score")
+    _GETTERS = {
+        "examId": attrgetter("exam_id"),
+        "questionId": attrgetter("question_id"),
+        "order": attrgetter("order"),
+        "section": attrgetter("section"),
+        "maxScore": attrgetter("max_score")
+    }
+
+    def __init__(self, exam_id, question_id, order, section, max_score):
+        self.exam_id = exam_id
+        self.question_id = question_id
+        self.order = order
+        self.section = section
+        self.max_score = max_score
+
+    def to_dict(self):
+        return {
+            "examId": self.exam_id,
+            "questionId": self.question_id,
+            "order": self.order,
+            "section": self.section,
+            "maxScore": self.max_score
+        }
+
+
+class ExamStats:
+    """Stats of process_exam_file, accumulated question by question while mapping"""
+
+    __slots__ = ("total_questions", "with_passage", "cloze", "reading")
+
+    def __init__(self):
+        self.total_questions = 0
+        self.with_passage = 0
+        self.cloze = 0
+        self.reading = 0
+
+    def add(self, linked_passage_id, tags):
+        self.total_questions += 1
+        if linked_passage_id:
+            self.with_passage += 1
+        if "cloze" in tags:
+            self.cloze += 1
+        if "reading" in tags:
+            self.reading += 1
+
+    def to_dict(self, total_passages, points_per_question):
+        return {
+            "totalQuestions": self.total_questions,
+            "totalPassages": total_passages,
+            "totalPoints": self.total_questions * points_per_question,
+            "questionsWithPassage": self.with_passage,
+            "questionsWithoutPassage": self.total_questions - self.with_passage,
+            "clozeQuestions": self.cloze,
+            "readingQuestions": self.reading
+        }
@@ -7,15 +7,42 @@ Author: GoPass Team
 Date: 2026-01-07
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import uuid
+import hashlib
+import time
 import os
 
+from processed_exam_cache import ProcessedExamCache, file_key
+from mock_db_store import MockDbStore
+from job_queue import JobQueue, QueueFull
+from id_strategy import IdGenerator, PresetIds
+from incremental import ProcessedState, build_changeset, exam_id_for, is_empty
+from exam_models import ExamQuestion, ExamStats, Option, Question, QuestionDefaults
+from convert_pdf_final import extract_exam_cached
+from docx_text import is_docx
+from extraction_cache import ExtractionCache
+from memory_monitor import MemoryMonitor
+import serializer
+
+
+class FastJSONProvider(JSONProvider):
+    """jsonify / request.get_json through serializer (orjson when installed, compact)"""
+    
+    def dumps(self, obj, **kwargs):
+        return serializer.dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        return serializer.loads(s)
+
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get("MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
 
 # Configuration
 CURRENT_USER_ID = "u_teacher_01"  # Default teacher user ID
@@ -24,10 +51,35 @@ POINTS_PER_QUESTION = 0.25
 QUESTION_TYPE = "multiple_choice"
 DURATION_MINUTES = 50  # Duration for English exam
 
+# Constant Question fields, shared by every mapped question
+QUESTION_DEFAULTS = QuestionDefaults(
+    type=QUESTION_TYPE,
+    difficulty="medium",
+    subject=SUBJECT,
+    points=POINTS_PER_QUESTION,
+    is_public=True,
+    created_by=CURRENT_USER_ID
+)
+
+# Processed exams keyed on path + mtime + size (EXAM_CACHE_MAX_ENTRIES=0 disables)
+EXAM_CACHE = ProcessedExamCache()
+# Raw json.load results (plus the exam's question ids once preview needs
+# them), same keying - lets preview map a single page
+EXAM_DATA_CACHE = ProcessedExamCache()
+
+# Mock DB writes: append-only journal instead of rewriting db.json per save
+DEFAULT_MOCK_DB_PATH = '../../frontend/mock/db.json'
+MOCK_DB_JOURNAL = os.environ.get("MOCK_DB_JOURNAL") == "1"
+
+# Bulk /api/process-exams: thread pool size and max paths per request
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", 4))
+BULK_MAX_FILES = int(os.environ.get("BULK_MAX_FILES", 1000))
 
-def generate_id(prefix=""):
-    """Generate unique ID with optional prefix"""
-    return f"{prefix}{uuid.uuid4().hex[:12]}"
+# Last saved output per (exam file, mock db) for incremental saves
+PROCESSED_STATE = ProcessedState()
+
+# PDF upload jobs (JOB_WORKERS / JOB_MAX_PENDING bound the pool and backlog)
+JOB_QUEUE = JobQueue()
 
 
 def get_current_timestamp():
@@ -81,19 +133,38 @@ def determine_section(question, passage_id):
     return "Sentence/Utterance Arrangement"
 
 
-def map_passage_to_db_format(passage, order):
-    """Map passage from exam_corrected.json to GoPass readingPassage format (embedded in Exam)"""
+def map_passage_to_db_format(passage, order, ids=None):
+    """
+    Map passage from exam_corrected.json to GoPass readingPassage format (embedded in Exam)
+    
+    The original passage_id is kept as id; otherwise one comes from ids (an
+    IdGenerator, default strategy when omitted).
+    """
+    if "passage_id" in passage:
+        passage_id = passage["passage_id"]
+    else:
+        passage_id = (ids or IdGenerator())("passage-eng-", passage, order - 1)
     
     return {
-        "id": passage.get("passage_id", generate_id("passage-eng-")),
+        "id": passage_id,
         "title": passage.get("instruction", ""),
         "content": passage.get("content", "")
     }
 
 
-def map_question_to_db_format(question, passage_id=None):
-    """Map question from exam_corrected.json to GoPass Question format"""
-    question_id = generate_id("q-eng-")
+def map_question_to_db_format(question, passage_id=None, ids=None, position=None):
+    """
+    Map question from exam_corrected.json to GoPass Question format
+    
+    The id comes from ids (an IdGenerator for the whole exam, default strategy
+    when omitted); position is the question's index in the exam, used by the
+    "counter" strategy.
+    
+    Returns:
+        Question: read-only Mapping in the GoPass JSON shape (see exam_models)
+    """
+    question_id = (ids or IdGenerator())("q-eng-", question, position)
+    answer = question.get("answer", "")
     
     # Map options - handle both dict and array formats
     options = []
@@ -102,37 +173,26 @@ def map_question_to_db_format(question, passage_id=None):
     if isinstance(question_options, dict):
         # Options are in format: {"A": "text", "B": "text", ...}
         for key, text in question_options.items():
-            options.append({
-                "id": key,
-                "content": text,
-                "isCorrect": key == question.get("answer", "")
-            })
+            options.append(Option(key, text, key == answer))
     elif isinstance(question_options, list):
         # Options are in format: [{"key": "A", "text": "..."}, ...]
         for opt in question_options:
-            options.append({
-                "id": opt.get("key", ""),
-                "content": opt.get("text", ""),
-                "isCorrect": opt.get("key", "") == question.get("answer", "")
-            })
+            key = opt.get("key", "")
+            options.append(Option(key, opt.get("text", ""), key == answer))
     
     # Determine tags - use from JSON if available
     tags = determine_tags(question, passage_id)
     
-    return {
-        "type": QUESTION_TYPE,
-        "content": question.get("question_text", question.get("question", "")),
-        "options": options,
-        "correctAnswer": question.get("answer", ""),
-        "explanation": question.get("explanation", ""),
-        "difficulty": "medium",
-        "linkedPassageId": passage_id,
-        "subject": SUBJECT,
-        "points": POINTS_PER_QUESTION,
-        "isPublic": True,
-        "createdBy": CURRENT_USER_ID,
-        "tags": tags
-    }
+    return Question(
+        id=question_id,
+        content=question.get("question_text", question.get("question", "")),
+        options=options,
+        correct_answer=answer,
+        explanation=question.get("explanation", ""),
+        linked_passage_id=passage_id,
+        tags=tags,
+        defaults=QUESTION_DEFAULTS
+    )
 
 
 def map_exam_to_db_format(title, description, duration_minutes, reading_passages):
@@ -156,19 +216,179 @@ def map_exam_to_db_format(title, description, duration_minutes, reading_passages
 
 def map_exam_question_to_db_format(exam_id, question_id, order, section, max_score):
     """Map ExamQuestion relationship"""
-    return {
-        "examId": exam_id,
-        "questionId": question_id,
-        "order": order,
-        "section": section,
-        "maxScore": max_score
-    }
+    return ExamQuestion(exam_id, question_id, order, section, max_score)
+
+
+def resolve_exam_path(file_path):
+    """Get absolute path relative to this script's directory"""
+    if not os.path.isabs(file_path):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        file_path = os.path.join(script_dir, file_path)
+    return file_path
+
+
+def load_exam_entry(file_path):
+    """
+    EXAM_DATA_CACHE entry of an exam file, cached while it is unchanged
+
+    Returns:
+        dict: {"data": json.load result, "questionIds": None until exam_question_ids fills it}
+    """
+    key = file_key(file_path)
+    entry = EXAM_DATA_CACHE.get(key)
+    if entry is None:
+        with open(file_path, 'rb') as f:
+            entry = {"data": serializer.loads(f.read()), "questionIds": None}
+        EXAM_DATA_CACHE.put(key, entry)
+    return entry
+
+
+def load_exam_data(file_path):
+    """json.load an exam file, cached in EXAM_DATA_CACHE while it is unchanged"""
+    return load_exam_entry(file_path)["data"]
+
+
+def exam_question_ids(file_path, entry):
+    """
+    Question ids of the whole exam as process_exam_file assigns them, computed
+    once per cache entry (content ids of repeated questions depend on every
+    question before them)
+    """
+    if entry["questionIds"] is None:
+        ids = IdGenerator(seed=file_path)
+        entry["questionIds"] = [
+            ids("q-eng-", question_data, position)
+            for position, question_data in enumerate(entry["data"].get("questions", []))
+        ]
+    return entry["questionIds"]
+
+
+def build_passage_map(data):
+    """Map original passage_id (e.g. "passage_1") to the GoPass passage id"""
+    passage_map = {}
+    for passage_data in data.get("passages", []):
+        original_passage_id = passage_data.get("passage_id", "")
+        if original_passage_id:
+            # map_passage_to_db_format keeps passage_id as the id
+            passage_map[original_passage_id] = original_passage_id
+    return passage_map
+
+
+def linked_passage_id(question_data, passage_map):
+    """GoPass passage id for a question, or None"""
+    passage_related = question_data.get("PassageRelated")  # Note: capital P
+    if passage_related and passage_related in passage_map:
+        return passage_map[passage_related]
+    return None
+
+
+def compute_exam_stats(data, passage_map):
+    """Same stats as process_exam_file, from the raw data without mapping questions"""
+    stats = ExamStats()
+    for question_data in data.get("questions", []):
+        passage_id = linked_passage_id(question_data, passage_map)
+        stats.add(passage_id, determine_tags(question_data, passage_id))
+    
+    return stats.to_dict(len(data.get("passages", [])), POINTS_PER_QUESTION)
+
+
+def preview_exam_file(file_path, offset=0, limit=None, include_passages=False, include_stats=False):
+    """
+    Map one page of questions of an exam file
+    
+    Only questions[offset:offset + limit] go through map_question_to_db_format;
+    readingPassages and stats are built only when asked for, and content ids
+    come from the list cached with the file (exam_question_ids), so the cost
+    does not grow with the size of the exam or the offset.
+    
+    Returns:
+        dict: Same shape as process_exam_file plus "page" {offset, limit, total};
+              "stats" only with include_stats
+    """
+    try:
+        file_path = resolve_exam_path(file_path)
+        entry = load_exam_entry(file_path)
+        data = entry["data"]
+        ids = IdGenerator(seed=file_path)
+        question_ids = ids
+        if ids.strategy == "content":
+            # Duplicate suffixes count from the start of the exam, as in process_exam_file
+            question_ids = PresetIds(exam_question_ids(file_path, entry))
+        passage_map = build_passage_map(data)
+        all_questions = data.get("questions", [])
+        
+        reading_passages = []
+        if include_passages:
+            reading_passages = [
+                map_passage_to_db_format(passage_data, idx + 1, ids)
+                for idx, passage_data in enumerate(data.get("passages", []))
+            ]
+        
+        exam = map_exam_to_db_format(
+            title="Đề Thi Thử Tiếng Anh THPT 2026",
+            description="Đề thi thử môn Tiếng Anh theo cấu trúc mới nhất",
+            duration_minutes=DURATION_MINUTES,
+            reading_passages=reading_passages
+        )
+        exam["totalQuestions"] = len(all_questions)
+        exam["totalPoints"] = len(all_questions) * POINTS_PER_QUESTION
+        
+        end = offset + limit if limit else len(all_questions)
+        questions = []
+        exam_questions = []
+        for order, question_data in enumerate(all_questions[offset:end], start=offset + 1):
+            passage_id = linked_passage_id(question_data, passage_map)
+            question = map_question_to_db_format(question_data, passage_id, question_ids, order - 1)
+            questions.append(question)
+            exam_questions.append(map_exam_question_to_db_format(
+                exam.get("_id"),
+                question["id"],
+                order,
+                determine_section(question_data, passage_id),
+                POINTS_PER_QUESTION
+            ))
+        
+        result = {
+            "success": True,
+            "data": {
+                "exam": exam,
+                "questions": questions,
+                "examQuestions": exam_questions
+            },
+            "page": {
+                "offset": offset,
+                "limit": limit,
+                "total": len(all_questions)
+            }
+        }
+        if include_stats:
+            result["stats"] = compute_exam_stats(data, passage_map)
+        return result
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 
+def resolve_mock_db_path(mock_db_path):
+    """Use the path as given if it exists, else relative to this script's directory"""
+    if not os.path.exists(mock_db_path):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        mock_db_path = os.path.join(script_dir, mock_db_path)
+    return mock_db_path
 
-def process_exam_file(file_path):
+
+def process_exam_file(file_path, use_cache=True):
     """
     Process exam_corrected.json and convert to GoPass format
     
+    Successful results are served from EXAM_CACHE while the file's mtime and
+    size are unchanged. Callers get a fresh top-level and "data" dict, so
+    replacing keys or lists there does not touch the cached entry; the records
+    themselves are shared and must not be mutated.
+    
     Returns:
         dict: {
             "exam": Exam object with embedded readingPassages,
@@ -176,21 +396,60 @@ def process_exam_file(file_path):
             "examQuestions": List of ExamQuestion relationships
         }
     """
+    file_path = resolve_exam_path(file_path)
+    
+    if not use_cache:
+        return _process_exam_file(file_path)
+    
     try:
-        # Get absolute path relative to this script's directory
-        if not os.path.isabs(file_path):
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            file_path = os.path.join(script_dir, file_path)
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        key = file_key(file_path)
+    except OSError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    
+    result = EXAM_CACHE.get(key)
+    if result is None:
+        result = _process_exam_file(file_path)
+        if not result["success"]:
+            return result
+        EXAM_CACHE.put(key, result)
+    
+    return dict(result, data=dict(result["data"]))
+
+
+def _process_exam_file(file_path):
+    """Load and map an exam file (uncached)"""
+    try:
+        return map_exam_data(load_exam_data(file_path), IdGenerator(seed=file_path))
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def map_exam_data(data, ids=None):
+    """
+    Map exam data ({"passages", "questions"} as in exam_corrected.json or
+    extract_exam output) to GoPass format
+    
+    ids is the IdGenerator for this exam (a fresh default one when omitted).
+    
+    Returns:
+        dict: Same result as process_exam_file
+    """
+    try:
+        if ids is None:
+            ids = IdGenerator()
         
         # Process passages (will be embedded in exam)
         reading_passages = []
         passage_map = {}  # Map passage_id (e.g., "passage_1") to passage id
         
         for idx, passage_data in enumerate(data.get("passages", [])):
-            passage = map_passage_to_db_format(passage_data, idx + 1)
+            passage = map_passage_to_db_format(passage_data, idx + 1, ids)
             reading_passages.append(passage)
             # Map the original passage_id to the passage id
             original_passage_id = passage_data.get("passage_id", "")
@@ -205,9 +464,10 @@ def process_exam_file(file_path):
             reading_passages=reading_passages
         )
         
-        # Process questions
+        # Process questions (stats are accumulated in the same pass)
         questions = []
         exam_questions = []
+        stats = ExamStats()
         question_order = 1
         
         for question_data in data.get("questions", []):
@@ -219,8 +479,9 @@ def process_exam_file(file_path):
                 passage_id = passage_map[passage_related]
             
             # Map question
-            question = map_question_to_db_format(question_data, passage_id)
+            question = map_question_to_db_format(question_data, passage_id, ids, question_order - 1)
             questions.append(question)
+            stats.add(passage_id, question.tags)
             
             # Determine section based on question tags and passage
             section = determine_section(question_data, passage_id)
@@ -228,7 +489,7 @@ def process_exam_file(file_path):
             # Create ExamQuestion relationship
             exam_question = map_exam_question_to_db_format(
                 exam.get("_id"),  # Will be set by MongoDB
-                question.get("_id"),  # Will be set by MongoDB
+                question.id,
                 question_order,
                 section,
                 POINTS_PER_QUESTION
@@ -248,15 +509,7 @@ def process_exam_file(file_path):
                 "questions": questions,
                 "examQuestions": exam_questions
             },
-            "stats": {
-                "totalQuestions": len(questions),
-                "totalPassages": len(reading_passages),
-                "totalPoints": exam["totalPoints"],
-                "questionsWithPassage": len([q for q in questions if q["linkedPassageId"]]),
-                "questionsWithoutPassage": len([q for q in questions if not q["linkedPassageId"]]),
-                "clozeQuestions": len([q for q in questions if "cloze" in q["tags"]]),
-                "readingQuestions": len([q for q in questions if "reading" in q["tags"]])
-            }
+            "stats": stats.to_dict(len(reading_passages), POINTS_PER_QUESTION)
         }
         
     except Exception as e:
@@ -266,6 +519,43 @@ def process_exam_file(file_path):
         }
 
 
+def process_pdf_job(pdf_bytes):
+    """
+    Job body (runs in a JOB_QUEUE worker process): extract_exam + mapping
+    
+    Extraction runs in low-memory mode; the result carries the run's peak
+    RSS under "memory", and the job fails once RSS passes PDF_MEMORY_LIMIT_MB.
+    """
+    memory = MemoryMonitor()
+    extracted, cached = extract_exam_cached(pdf_bytes, cache=ExtractionCache(), memory=memory)
+    result = map_exam_data(extracted, IdGenerator(seed=hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()))
+    memory.sample()
+    result["cached"] = cached
+    result["memory"] = memory.to_dict()
+    return result
+
+
+@app.after_request
+def compress_response(response):
+    """gzip/zstd-encode JSON responses the client accepts (skips streamed bodies)"""
+    if response.mimetype != "application/json" or response.is_streamed or \
+            response.direct_passthrough or "Content-Encoding" in response.headers:
+        return response
+    
+    response.vary.add("Accept-Encoding")
+    encoding = serializer.negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None:
+        return response
+    
+    body = response.get_data()
+    if len(body) < serializer.COMPRESS_MIN_BYTES:
+        return response
+    
+    response.set_data(serializer.compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -273,7 +563,12 @@ def health_check():
         "status": "healthy",
         "service": "GoPass Exam Processor API",
         "version": "1.0.0",
-        "timestamp": get_current_timestamp()
+        "timestamp": get_current_timestamp(),
+        "serializer": serializer.BACKEND,
+        "encodings": serializer.supported_encodings(),
+        "cache": EXAM_CACHE.stats(),
+        "dataCache": EXAM_DATA_CACHE.stats(),
+        "jobs": JOB_QUEUE.stats()
     })
 
 
@@ -327,8 +622,8 @@ def process_exam():
         # Save to output file if requested
         if data.get('saveToFile', False):
             output_path = data.get('outputPath', 'exam_processed_output.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(serializer.dumps_bytes(result, pretty=data.get('pretty', False)))
             result["outputPath"] = output_path
         
         return jsonify(result)
@@ -340,15 +635,141 @@ def process_exam():
         }), 500
 
 
+def timed_process_exam_file(file_path):
+    """process_exam_file plus its wall time in seconds"""
+    start = time.perf_counter()
+    result = process_exam_file(file_path)
+    return result, time.perf_counter() - start
+
+
+def iter_bulk_results(file_paths, include_data=True, workers=BULK_WORKERS):
+    """
+    Process file_paths concurrently, yielding NDJSON-ready records
+    
+    One {"type": "result", ...} per file in completion order, then a
+    {"type": "done", ...} record with aggregate stats. Files not started
+    yet are cancelled if the consumer stops early.
+    """
+    start = time.perf_counter()
+    totals = {}
+    succeeded = failed = 0
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(file_paths)))) as pool:
+        futures = {
+            pool.submit(timed_process_exam_file, file_path): (index, file_path)
+            for index, file_path in enumerate(file_paths)
+        }
+        try:
+            for future in as_completed(futures):
+                index, file_path = futures[future]
+                result, seconds = future.result()
+                record = {
+                    "type": "result",
+                    "index": index,
+                    "filePath": file_path,
+                    "success": result["success"],
+                    "seconds": round(seconds, 4)
+                }
+                if result["success"]:
+                    succeeded += 1
+                    record["stats"] = result["stats"]
+                    for name, value in result["stats"].items():
+                        totals[name] = totals.get(name, 0) + value
+                    if include_data:
+                        record["data"] = result["data"]
+                else:
+                    failed += 1
+                    record["error"] = result["error"]
+                yield record
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    yield {
+        "type": "done",
+        "files": len(file_paths),
+        "succeeded": succeeded,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 4),
+        "stats": totals
+    }
+
+
+@app.route('/api/process-exams', methods=['POST'])
+def process_exams():
+    """
+    Process many exam files concurrently, streaming results as NDJSON
+    
+    Request Body:
+        {
+            "filePaths": ["a.json", "b.json", ...],
+            "includeData": true  # Optional, false sends only stats per file
+        }
+    
+    Response (application/x-ndjson), one line per finished file, then totals:
+        {"type": "result", "index": 0, "filePath": "a.json", "success": true, "seconds": 0.01,
+         "stats": {...}, "data": {...}}
+        {"type": "done", "files": 2, "succeeded": 2, "failed": 0, "seconds": 0.02, "stats": {...}}
+    """
+    data = request.get_json(silent=True) or {}
+    file_paths = data.get('filePaths')
+    
+    if not isinstance(file_paths, list) or not file_paths or \
+            not all(isinstance(path, str) for path in file_paths):
+        return jsonify({
+            "success": False,
+            "error": "filePaths must be a non-empty list of paths"
+        }), 400
+    
+    if len(file_paths) > BULK_MAX_FILES:
+        return jsonify({
+            "success": False,
+            "error": f"Too many files: {len(file_paths)} (max {BULK_MAX_FILES})"
+        }), 400
+    
+    include_data = data.get('includeData', True)
+    
+    def generate():
+        for record in iter_bulk_results(file_paths, include_data):
+            yield serializer.dumps(record) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def save_message(write, message):
+    """Response message for a MockDbStore write, flagging saves json-server cannot see yet"""
+    if write["pendingEntries"]:
+        return f"{message} (journaled: not in db.json until compaction, {write['pendingEntries']} pending)"
+    return message
+
+
 @app.route('/api/save-to-mock-db', methods=['POST'])
 def save_to_mock_db():
     """
     Save processed exam to mock db.json file
     
+    Writes go through MockDbStore (file lock + atomic replace). With journal
+    mode the exam is appended to db.json.journal and folded into db.json
+    every MOCK_DB_COMPACT_EVERY saves. json-server only reads db.json, so a
+    journaled save is not served by it until then: the response's
+    write.pendingEntries counts the saves still waiting, and
+    POST /api/mock-db/compact folds them in right away.
+    
+    Records are upserted: the exam gets a stable id from its file path and
+    questions have content ids, so saving an unchanged exam again does not
+    add rows. Questions dropped from the file stay in db.json; use
+    incremental mode to remove them.
+    
+    With "incremental": true the exam is diffed against what was saved last
+    time for the same file and DB, and only added / changed / removed records
+    are written, updating the existing ones in place.
+    
     Request Body:
         {
             "filePath": "path/to/exam_corrected.json",
-            "mockDbPath": "path/to/mock/db.json"  # Optional
+            "mockDbPath": "path/to/mock/db.json",  # Optional
+            "journal": true,  # Optional, defaults to MOCK_DB_JOURNAL=1
+            "incremental": true  # Optional, apply a changeset instead of appending
         }
     """
     try:
@@ -361,13 +782,7 @@ def save_to_mock_db():
         if not result["success"]:
             return jsonify(result), 400
         
-        # Load mock db.json
-        mock_db_path = data.get('mockDbPath', '../../frontend/mock/db.json')
-        
-        # Try to find the mock db file
-        if not os.path.exists(mock_db_path):
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            mock_db_path = os.path.join(script_dir, mock_db_path)
+        mock_db_path = resolve_mock_db_path(data.get('mockDbPath', DEFAULT_MOCK_DB_PATH))
         
         if not os.path.exists(mock_db_path):
             return jsonify({
@@ -375,40 +790,115 @@ def save_to_mock_db():
                 "error": f"Mock database file not found: {mock_db_path}"
             }), 404
         
-        # Load existing db
-        with open(mock_db_path, 'r', encoding='utf-8') as f:
-            db = json.load(f)
+        store = MockDbStore(mock_db_path, journal=data.get('journal', MOCK_DB_JOURNAL))
+        
+        if data.get('incremental', False):
+            source_path = resolve_exam_path(file_path)
+            with PROCESSED_STATE.lock(source_path, mock_db_path):
+                saved, changeset = build_changeset(
+                    PROCESSED_STATE.load(source_path, mock_db_path), result["data"], exam_id_for(source_path)
+                )
+                write = None
+                if not is_empty(changeset):
+                    write = store.apply(changeset)
+                    PROCESSED_STATE.save(source_path, mock_db_path, saved)
+            
+            return jsonify({
+                "success": True,
+                "message": save_message(write, "Changes applied to mock database") if write else "No changes",
+                "mockDbPath": mock_db_path,
+                "write": write,
+                "changes": changeset["summary"],
+                "stats": result["stats"]
+            })
         
-        # Append new data (don't replace existing data)
+        # Upsert by id (examquestions by examId + order): saving the same
+        # exam again replaces its records instead of duplicating them
         processed_data = result["data"]
+        exam_id = exam_id_for(resolve_exam_path(file_path))
+        write = store.append({
+            "exams": [dict(processed_data["exam"], id=exam_id)],
+            "questions": processed_data["questions"],
+            "examquestions": [dict(eq, examId=exam_id) for eq in processed_data["examQuestions"]]
+        })
+        
+        return jsonify({
+            "success": True,
+            "message": save_message(write, "Data saved to mock database successfully"),
+            "mockDbPath": mock_db_path,
+            "write": write,
+            "stats": result["stats"]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/changeset', methods=['POST'])
+def preview_changeset():
+    """
+    Changeset that an incremental save of filePath into mockDbPath would apply
+    
+    Request Body:
+        {
+            "filePath": "path/to/exam_corrected.json",
+            "mockDbPath": "path/to/mock/db.json"  # Optional
+        }
+    """
+    try:
+        data = request.get_json() or {}
+        file_path = data.get('filePath', 'exam_corrected.json')
+        result = process_exam_file(file_path)
+        
+        if not result["success"]:
+            return jsonify(result), 400
         
-        # Add exam
-        if "exams" not in db:
-            db["exams"] = []
-        db["exams"].append(processed_data["exam"])
+        mock_db_path = resolve_mock_db_path(data.get('mockDbPath', DEFAULT_MOCK_DB_PATH))
+        source_path = resolve_exam_path(file_path)
+        _, changeset = build_changeset(
+            PROCESSED_STATE.load(source_path, mock_db_path), result["data"], exam_id_for(source_path)
+        )
         
-        # Add questions
-        if "questions" not in db:
-            db["questions"] = []
-        db["questions"].extend(processed_data["questions"])
+        return jsonify({
+            "success": True,
+            "changeset": changeset
+        })
         
-        # Add examQuestions
-        if "examquestions" not in db:
-            db["examquestions"] = []
-        db["examquestions"].extend(processed_data["examQuestions"])
-        if "examquestions" not in db:
-            db["examquestions"] = []
-        db["examquestions"].extend(processed_data["examQuestions"])
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/mock-db/compact', methods=['POST'])
+def compact_mock_db():
+    """
+    Fold journaled saves into mock db.json
+    
+    Request Body:
+        {
+            "mockDbPath": "path/to/mock/db.json"  # Optional
+        }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        mock_db_path = resolve_mock_db_path(data.get('mockDbPath', DEFAULT_MOCK_DB_PATH))
         
-        # Save back to file
-        with open(mock_db_path, 'w', encoding='utf-8') as f:
-            json.dump(db, f, ensure_ascii=False, indent=2)
+        if not os.path.exists(mock_db_path):
+            return jsonify({
+                "success": False,
+                "error": f"Mock database file not found: {mock_db_path}"
+            }), 404
         
+        applied = MockDbStore(mock_db_path).compact()
         return jsonify({
             "success": True,
-            "message": "Data saved to mock database successfully",
             "mockDbPath": mock_db_path,
-            "stats": result["stats"]
+            "appliedEntries": applied
         })
         
     except Exception as e:
@@ -418,32 +908,122 @@ def save_to_mock_db():
         }), 500
 
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_pdf_job():
+    """
+    Upload a PDF (or DOCX) and queue it for extraction + mapping
+    
+    Request:
+        multipart/form-data with a "file" field, or the raw PDF/DOCX as the body
+        (Content-Type: application/pdf)
+    
+    Response (202):
+        {
+            "success": true,
+            "jobId": "...",
+            "status": "queued",
+            "statusUrl": "/api/jobs/<jobId>"
+        }
+    
+    Returns 429 with Retry-After when the job queue is full.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            filename = upload.filename
+            pdf_bytes = upload.read()
+        else:
+            filename = None
+            pdf_bytes = request.get_data()
+        
+        if not pdf_bytes.startswith(b"%PDF") and not is_docx(pdf_bytes):
+            return jsonify({
+                "success": False,
+                "error": "Request must contain a PDF or DOCX file"
+            }), 400
+        
+        try:
+            job_id = JOB_QUEUE.submit(process_pdf_job, pdf_bytes,
+                                      meta={"filename": filename, "bytes": len(pdf_bytes)})
+        except QueueFull as e:
+            response = jsonify({
+                "success": False,
+                "error": f"Job queue is full ({e}), retry later"
+            })
+            response.headers["Retry-After"] = "5"
+            return response, 429
+        
+        return jsonify({
+            "success": True,
+            "jobId": job_id,
+            "status": "queued",
+            "statusUrl": f"/api/jobs/{job_id}"
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    """
+    Status of an upload job: queued | running | done | failed
+    
+    "result" (the process_exam_file-style output) is present once the job has finished.
+    """
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": f"Job not found: {job_id}"
+        }), 404
+    
+    return jsonify(dict(job, success=True))
+
+
 @app.route('/api/preview', methods=['POST'])
 def preview_exam():
     """
     Preview processed exam without saving
     
+    Only the requested page of questions is mapped.
+    
     Request Body:
         {
             "filePath": "path/to/exam_corrected.json",
-            "limit": 5  # Optional, limit number of questions to preview
+            "offset": 0,  # Optional, index of the first question
+            "limit": 5,  # Optional, limit number of questions to preview
+            "include": ["passages", "stats"]  # Optional, readingPassages / stats
         }
     """
     try:
         data = request.get_json() or {}
         file_path = data.get('filePath', 'exam_corrected.json')
+        offset = data.get('offset', 0)
         limit = data.get('limit', None)
+        include = data.get('include', [])
         
-        result = process_exam_file(file_path)
+        if not isinstance(offset, int) or offset < 0 or \
+                (limit is not None and (not isinstance(limit, int) or limit < 0)):
+            return jsonify({
+                "success": False,
+                "error": "offset and limit must be non-negative integers"
+            }), 400
+        
+        result = preview_exam_file(
+            file_path,
+            offset=offset,
+            limit=limit,
+            include_passages="passages" in include,
+            include_stats="stats" in include
+        )
         
         if not result["success"]:
             return jsonify(result), 400
         
-        # Limit questions if requested
-        if limit:
-            result["data"]["questions"] = result["data"]["questions"][:limit]
-            result["data"]["examQuestions"] = result["data"]["examQuestions"][:limit]
-        
         return jsonify(result)
         
     except Exception as e:
@@ -465,9 +1045,15 @@ if __name__ == '__main__':
     print("\nAvailable Endpoints:")
     print("  GET  /api/health              - Health check")
     print("  POST /api/process-exam        - Process exam file")
+    print("  POST /api/process-exams       - Process many exam files (NDJSON stream)")
     print("  POST /api/save-to-mock-db     - Save to mock db.json")
+    print("  POST /api/changeset           - Diff an exam against its last saved version")
+    print("  POST /api/mock-db/compact     - Fold journaled saves into db.json")
     print("  POST /api/preview             - Preview processed exam")
+    print("  POST /api/jobs                - Upload a PDF/DOCX for background processing")
+    print("  GET  /api/jobs/<id>           - Upload job status and result")
     print("=" * 60)
     print("\nPress Ctrl+C to stop the server\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5002)
+    # The debugger allows code execution from the browser: opt in with FLASK_DEBUG=1
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", host='0.0.0.0', port=5002)
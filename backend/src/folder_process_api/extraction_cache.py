@@ -0,0 +1,125 @@
+"""
+Content-hash result cache for PDF extraction
+============================================
+Stores the final {"passages", "questions"} JSON of extract_exam on local disk,
+keyed on SHA-256 of the PDF bytes plus the parser version, so re-uploading the
+same PDF skips the whole pipeline.
+
+Entries are plain JSON files; the file mtime is the LRU clock (touched on every
+hit) and the oldest entries are evicted once the directory exceeds max_bytes.
+"""
+import hashlib
+import os
+import tempfile
+
+import serializer
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "extraction")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def make_key(pdf_bytes, parser_version):
+    """Cache key: SHA-256 over parser version + PDF content"""
+    digest = hashlib.sha256()
+    digest.update(parser_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(pdf_bytes)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extraction results on local disk"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Return cached result or None; counts a hit or miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                result = serializer.loads(f.read())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Store result atomically, then evict least recently used entries"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(serializer.dumps_bytes(result))
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def _entries(self):
+        """List (mtime, size, path) for every cache entry"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        # Oldest first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Hit/miss counters for this process plus current disk usage"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "maxBytes": self.max_bytes,
+            "cacheDir": self.cache_dir
+        }
@@ -0,0 +1,66 @@
+"""
+ID strategies for mapped passages and questions
+===============================================
+- "content" (default): prefix + 12 hex chars of BLAKE2b over the batch seed
+  and the canonical JSON of the source record. Re-processing an unchanged
+  exam yields the same IDs, so downstream upserts are no-ops; the seed (the
+  exam's source) keeps the same question in two exams from sharing a
+  record. Identical records within one batch get -2, -3, ... suffixes.
+- "counter": prefix + 6 hex chars of the batch seed + a zero-padded position,
+  so IDs survive content edits as long as the question order is unchanged.
+- "uuid": the original random uuid4 IDs.
+
+Pick the default with ID_STRATEGY=content|counter|uuid.
+"""
+import hashlib
+import json
+import os
+import uuid
+
+ID_STRATEGIES = ("content", "counter", "uuid")
+DEFAULT_ID_STRATEGY = os.environ.get("ID_STRATEGY", "content")
+
+
+def content_digest(record, size=6, seed=""):
+    """Hex digest of a JSON-serializable record (and seed), independent of key order"""
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(f"{seed}\0{canonical}".encode("utf-8"), digest_size=size).hexdigest()
+
+
+class IdGenerator:
+    """ID source for one batch (one exam); call as ids(prefix, record, position)"""
+
+    def __init__(self, strategy=DEFAULT_ID_STRATEGY, seed=""):
+        if strategy not in ID_STRATEGIES:
+            raise ValueError(f"Unknown ID strategy: {strategy} (expected one of {', '.join(ID_STRATEGIES)})")
+        self.strategy = strategy
+        self.seed = seed
+        self._seed = hashlib.blake2b(seed.encode("utf-8"), digest_size=3).hexdigest()
+        self._seen = {}
+        self._counters = {}
+
+    def __call__(self, prefix, record=None, position=None):
+        if self.strategy == "uuid":
+            return f"{prefix}{uuid.uuid4().hex[:12]}"
+
+        if self.strategy == "counter":
+            if position is None:
+                position = self._counters.get(prefix, 0)
+            self._counters[prefix] = position + 1
+            return f"{prefix}{self._seed}{position:06d}"
+
+        new_id = f"{prefix}{content_digest(record, seed=self.seed)}"
+        # Same content twice in one batch must still get distinct IDs
+        n = self._seen.get(new_id, 0) + 1
+        self._seen[new_id] = n
+        return new_id if n == 1 else f"{new_id}-{n}"
+
+
+class PresetIds:
+    """Stand-in for an IdGenerator that answers from ids assigned up front, by position"""
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __call__(self, prefix, record=None, position=None):
+        return self.ids[position]
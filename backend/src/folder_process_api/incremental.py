@@ -0,0 +1,151 @@
+"""
+Incremental re-processing
+=========================
+Compares a freshly processed exam with the output saved last time for the
+same source file and mock DB, and produces a changeset of only the added,
+changed and removed records.
+
+Questions are matched by id first, so deleting a question in the middle is
+one "removed" record and the questions after it are untouched. A question
+whose id is new is then paired with the unmatched previous question at the
+same position (examQuestions.order): fixing a typo in question 12 is a
+"changed" record that keeps its previous id, and the DB record is updated
+in place instead of duplicated. examQuestions themselves are keyed by order,
+so they follow positions. Passages
+are embedded in the exam record; any passage change marks the exam changed
+(and is listed under "passages" for reference).
+
+The last saved output per (source, db) pair lives in PROCESSED_STATE_DIR
+(default .cache/processed next to this script).
+"""
+import hashlib
+import os
+
+import serializer
+from mock_db_store import file_lock, write_json_atomic
+
+DEFAULT_STATE_DIR = os.environ.get(
+    "PROCESSED_STATE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "processed")
+)
+
+
+def exam_id_for(source_path):
+    """Stable exam id derived from the source file path"""
+    digest = hashlib.blake2b(os.path.abspath(source_path).encode("utf-8"), digest_size=6).hexdigest()
+    return f"exam-eng-{digest}"
+
+
+def _diff_ids(previous, current):
+    """added / changed / removed ids between two {id: record} dicts"""
+    return {
+        "added": [key for key in current if key not in previous],
+        "changed": [key for key in current if key in previous and current[key] != previous[key]],
+        "removed": [key for key in previous if key not in current]
+    }
+
+
+def build_changeset(previous, current, exam_id):
+    """
+    Reconcile current processed data ({exam, questions, examQuestions}) with previous
+
+    Returns:
+        tuple: (data, changeset)
+            data      - current data with the exam id, previous ids kept for
+                        edited questions, and examQuestions pointing at them
+                        (new dicts - current is not modified)
+            changeset - {"examId", "exam" (record or None if unchanged),
+                         "questions" / "examQuestions": {"added", "changed",
+                         "removed"}, "passages": {...}, "summary": {...}}
+    """
+    previous = previous or {"exam": None, "questions": [], "examQuestions": []}
+    prev_eq_by_order = {eq["order"]: eq for eq in previous["examQuestions"]}
+    prev_q_by_order = {eq["order"]: q for eq, q in zip(previous["examQuestions"], previous["questions"])}
+    prev_by_id = {q["id"]: q for q in previous["questions"]}
+    # Previous questions no current question claims by id - candidates for edits
+    unmatched = set(prev_by_id) - {q["id"] for q in current["questions"]}
+
+    exam = dict(current["exam"], id=exam_id)
+    questions = []
+    exam_questions = []
+    changes = {
+        "questions": {"added": [], "changed": [], "removed": []},
+        "examQuestions": {"added": [], "changed": [], "removed": []}
+    }
+
+    for eq, q in zip(current["examQuestions"], current["questions"]):
+        prev_eq = prev_eq_by_order.get(eq["order"])
+        prev_q = prev_by_id.get(q["id"])
+        if prev_q is None:
+            # New id: an edit of the previous question at this position, if that one is unclaimed
+            candidate = prev_q_by_order.get(eq["order"])
+            if candidate is not None and candidate["id"] in unmatched:
+                unmatched.discard(candidate["id"])
+                prev_q = candidate
+        question = dict(q, id=prev_q["id"]) if prev_q is not None else q
+        exam_question = dict(eq, examId=exam_id, questionId=question["id"])
+        questions.append(question)
+        exam_questions.append(exam_question)
+
+        if prev_q is None:
+            changes["questions"]["added"].append(question)
+        elif question != prev_q:
+            changes["questions"]["changed"].append(question)
+
+        if prev_eq is None:
+            changes["examQuestions"]["added"].append(exam_question)
+        elif exam_question != prev_eq:
+            changes["examQuestions"]["changed"].append(exam_question)
+
+    changes["questions"]["removed"] = [q["id"] for q in previous["questions"] if q["id"] in unmatched]
+    current_orders = {eq["order"] for eq in exam_questions}
+    changes["examQuestions"]["removed"] = [order for order in prev_eq_by_order if order not in current_orders]
+
+    prev_passages = {p["id"]: p for p in (previous["exam"] or {}).get("readingPassages", [])}
+    passages = _diff_ids(prev_passages, {p["id"]: p for p in exam.get("readingPassages", [])})
+
+    changeset = dict(changes, examId=exam_id, exam=exam if exam != previous["exam"] else None, passages=passages)
+    changeset["summary"] = {
+        "examChanged": changeset["exam"] is not None,
+        "questionsAdded": len(changes["questions"]["added"]),
+        "questionsChanged": len(changes["questions"]["changed"]),
+        "questionsRemoved": len(changes["questions"]["removed"]),
+        "passagesAdded": len(passages["added"]),
+        "passagesChanged": len(passages["changed"]),
+        "passagesRemoved": len(passages["removed"])
+    }
+    data = {"exam": exam, "questions": questions, "examQuestions": exam_questions}
+    return data, changeset
+
+
+def is_empty(changeset):
+    return changeset["exam"] is None and not any(
+        changeset[kind][op] for kind in ("questions", "examQuestions") for op in ("added", "changed", "removed")
+    )
+
+
+class ProcessedState:
+    """Last saved processed output per (source file, mock db) pair"""
+
+    def __init__(self, state_dir=DEFAULT_STATE_DIR):
+        self.state_dir = state_dir
+        os.makedirs(state_dir, exist_ok=True)
+
+    def path_for(self, source_path, db_path):
+        key = f"{os.path.abspath(source_path)}\0{os.path.abspath(db_path)}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.state_dir, f"{digest}.json")
+
+    def lock(self, source_path, db_path):
+        """Serialize load -> diff -> apply -> save for one pair"""
+        return file_lock(self.path_for(source_path, db_path) + ".lock")
+
+    def load(self, source_path, db_path):
+        try:
+            with open(self.path_for(source_path, db_path), "rb") as f:
+                return serializer.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def save(self, source_path, db_path, data):
+        write_json_atomic(self.path_for(source_path, db_path), data)
@@ -0,0 +1,181 @@
+"""
+Bounded background job queue
+============================
+Runs jobs on a process pool (PDF extraction is CPU bound) and keeps their
+status for polling. At most max_workers jobs run and max_pending wait; beyond
+that submit() raises QueueFull so the API can answer 429 instead of piling up
+work. Finished jobs are kept (oldest dropped first) up to max_finished.
+
+A job reads "queued" until its body actually starts in a worker: the worker
+records the start in a Manager dict shared with the pool. (The executor's
+own future.running() is already true while a call only sits in the pool's
+internal call queue.)
+
+A worker that dies (os._exit, OOM kill, crash in native code) breaks the
+whole ProcessPoolExecutor: its in-flight jobs fail with BrokenProcessPool and
+the pool is dropped, so the next submit() starts a fresh one.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+DEFAULT_WORKERS = int(os.environ.get("JOB_WORKERS", min(4, os.cpu_count() or 1)))
+DEFAULT_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", 8))
+DEFAULT_MAX_FINISHED = int(os.environ.get("JOB_MAX_FINISHED", 100))
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when running + pending jobs hit the bound"""
+
+
+def _run_job(started, job_id, fn, *args):
+    """Job body as submitted to the pool: mark the job started, then run fn"""
+    started[job_id] = datetime.now().isoformat() + "Z"
+    return fn(*args)
+
+
+class JobQueue:
+    """Process-pool job runner with bounded backlog and status lookup"""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 max_finished=DEFAULT_MAX_FINISHED, executor_factory=ProcessPoolExecutor):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor_factory = executor_factory
+        self._executor = None
+        self._manager = None
+        self._started = None        # job_id -> startedAt, written by the workers
+        self._jobs = OrderedDict()  # job_id -> job dict, in submit order
+        self._active = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Started on first use so importing the API doesn't fork workers
+        if self._executor is None:
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+                self._started = self._manager.dict()
+            self._executor = self._executor_factory(max_workers=self.max_workers)
+        return self._executor
+
+    def submit(self, fn, *args, meta=None):
+        """Queue fn(*args); returns the job id or raises QueueFull"""
+        with self._lock:
+            if self._active >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise QueueFull(f"{self._active} jobs running or queued")
+
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "status": "queued",
+                "createdAt": datetime.now().isoformat() + "Z",
+                "meta": meta or {},
+                "_submitted": time.perf_counter(),
+                "_future": None,
+                "_executor": None
+            }
+            self._jobs[job_id] = job
+            self._active += 1
+            try:
+                try:
+                    executor = self._get_executor()
+                    future = executor.submit(_run_job, self._started, job_id, fn, *args)
+                except BrokenProcessPool:
+                    # Broken by a dead worker before its jobs' callbacks dropped it
+                    self._discard_executor(executor)
+                    executor = self._get_executor()
+                    future = executor.submit(_run_job, self._started, job_id, fn, *args)
+            except Exception:
+                del self._jobs[job_id]
+                self._active -= 1
+                raise
+            job["_future"] = future
+            job["_executor"] = executor
+
+        future.add_done_callback(lambda f, job=job: self._finish(job, f))
+        return job_id
+
+    def _finish(self, job, future):
+        with self._lock:
+            job["seconds"] = round(time.perf_counter() - job["_submitted"], 3)
+            job["finishedAt"] = datetime.now().isoformat() + "Z"
+            try:
+                result = future.result()
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = str(e)
+                job["errorType"] = type(e).__name__
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_executor(job["_executor"])
+            else:
+                if isinstance(result, dict) and result.get("success") is False:
+                    job["status"] = "failed"
+                    job["error"] = result.get("error")
+                else:
+                    job["status"] = "done"
+                job["result"] = result
+            started_at = self._started.pop(job["id"], None)
+            if started_at is not None:
+                job["startedAt"] = started_at
+            job["_future"] = None
+            job["_executor"] = None
+            self._active -= 1
+            self._drop_old_finished()
+
+    def _discard_executor(self, executor):
+        """Forget a broken pool (lock held); _get_executor builds a new one"""
+        if executor is not None and executor is self._executor:
+            self._executor = None
+            # Its futures have already failed; nothing left to cancel
+            executor.shutdown(wait=False)
+
+    def _drop_old_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Public view of a job, or None if unknown / already dropped"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            view = {k: v for k, v in job.items() if not k.startswith("_")}
+            if job["status"] == "queued":
+                started_at = self._started.get(job_id)
+                if started_at is not None:
+                    view["status"] = "running"
+                    view["startedAt"] = started_at
+            return view
+
+    def stats(self):
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+            running = sum(1 for job_id, job in self._jobs.items()
+                          if job["status"] == "queued" and job_id in self._started)
+            return {
+                "active": self._active,
+                "running": running,
+                "queued": self._active - running,
+                "maxWorkers": self.max_workers,
+                "maxPending": self.max_pending,
+                "done": statuses.count("done"),
+                "failed": statuses.count("failed"),
+                "rejected": self.rejected
+            }
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop the pool; running jobs finish when wait=True, queued ones are dropped with cancel_pending"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
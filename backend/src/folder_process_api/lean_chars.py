@@ -0,0 +1,107 @@
+"""
+Chars-only extraction backend
+=============================
+pdfplumber builds page.chars from pdfminer's full layout: every glyph, rect,
+curve, line and image becomes an LT object, and every object is then
+converted to a dict with colors, matrices and a dozen other attributes.
+extract_with_bold only needs text, top, x0 and fontname.
+
+LeanPage runs the same pdfminer content-stream interpreter on the same
+pdfplumber page but with a device that only handles glyphs: paths and images
+are parsed and dropped, no layout objects are built, and each char is
+recorded directly as a small dict. Positions use the LTChar bounding-box
+math, so text, fontname, size, x0, x1, top and bottom are identical to
+pdfplumber's page.chars.
+
+Select with backend="lean" in extract_exam & co., --char-backend lean on the
+CLI, or PDF_CHAR_BACKEND=lean.
+"""
+import os
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.utils import apply_matrix_pt
+from pdfplumber.page import fix_fontname_bytes
+
+CHAR_BACKENDS = ("pdfplumber", "lean")
+DEFAULT_CHAR_BACKEND = os.environ.get("PDF_CHAR_BACKEND", "pdfplumber")
+
+
+class CharDevice(PDFTextDevice):
+    """pdfminer device that records glyphs as char dicts and ignores everything else"""
+
+    def __init__(self, rsrcmgr, page_height):
+        super().__init__(rsrcmgr)
+        self.page_height = page_height
+        self.chars = []
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        # Same as PDFLayoutAnalyzer.render_char + LTChar.__init__, minus the object
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = "(cid:%d)" % cid
+
+        adv = font.char_width(cid) * fontsize * scaling
+        if font.is_vertical():
+            vx, vy = font.char_disp(cid)
+            vx = fontsize * 0.5 if vx is None else vx * fontsize * 0.001
+            vy = (1000 - vy) * fontsize * 0.001
+            lower_left = (-vx, vy + rise + adv)
+            upper_right = (-vx + fontsize, vy + rise)
+        else:
+            descent = font.get_descent() * fontsize
+            lower_left = (0, descent + rise)
+            upper_right = (adv, descent + rise + fontsize)
+
+        x0, y0 = apply_matrix_pt(matrix, lower_left)
+        x1, y1 = apply_matrix_pt(matrix, upper_right)
+        if x1 < x0:
+            x0, x1 = x1, x0
+        if y1 < y0:
+            y0, y1 = y1, y0
+
+        fontname = font.fontname
+        if isinstance(fontname, bytes):
+            fontname = fix_fontname_bytes(fontname)
+
+        self.chars.append({
+            "text": text,
+            "fontname": fontname,
+            "size": x1 - x0 if font.is_vertical() else y1 - y0,
+            "x0": x0,
+            "x1": x1,
+            "top": self.page_height - y1,
+            "bottom": self.page_height - y0
+        })
+        return adv
+
+
+class LeanPage:
+    """page.chars-only stand-in for a pdfplumber Page (see module docstring)"""
+
+    def __init__(self, page):
+        self.page = page
+
+    @property
+    def chars(self):
+        if not hasattr(self, "_chars"):
+            rsrcmgr = self.page.pdf.rsrcmgr
+            device = CharDevice(rsrcmgr, self.page.height)
+            PDFPageInterpreter(rsrcmgr, device).process_page(self.page.page_obj)
+            self._chars = device.chars
+        return self._chars
+
+    def flush_cache(self):
+        self.__dict__.pop("_chars", None)
+        self.page.flush_cache()
+
+
+def page_for_backend(page, backend):
+    """The object extract_with_bold should read chars from"""
+    if backend == "pdfplumber":
+        return page
+    if backend == "lean":
+        return LeanPage(page)
+    raise ValueError(f"Unknown char backend: {backend} (expected one of {', '.join(CHAR_BACKENDS)})")
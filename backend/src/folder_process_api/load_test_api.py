@@ -0,0 +1,109 @@
+"""
+Load test for /api/process-exam
+===============================
+Fires N POST /api/process-exam requests (bundled exam_corrected.json by
+default) from C concurrent client threads against a running server and
+reports requests/sec plus p50/p90/p99 latency.
+
+Usage:
+    python serve.py -w 4 -t 8 &
+    python load_test_api.py -n 2000 -c 16
+    python load_test_api.py --url http://localhost:5002 --file-path exam_corrected.json
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def run_client(url, body, count, latencies, errors, lock):
+    """One keep-alive connection sending `count` requests"""
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    local_latencies = []
+    local_errors = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            conn.request("POST", parsed.path or "/", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=60)
+        local_latencies.append(time.perf_counter() - start)
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run_load_test(url, body, requests_total, concurrency):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    per_client = [requests_total // concurrency + (1 if i < requests_total % concurrency else 0)
+                  for i in range(concurrency)]
+
+    threads = [threading.Thread(target=run_client, args=(url, body, n, latencies, errors, lock))
+               for n in per_client if n]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "requestsPerSec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latencyMs": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p90": round(percentile(latencies, 90) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test POST /api/process-exam")
+    parser.add_argument("--url", default="http://localhost:5002", help="Server base URL")
+    parser.add_argument("--file-path", default="exam_corrected.json",
+                        help="filePath sent in the request body")
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests sent first")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/") + "/api/process-exam"
+    body = json.dumps({"filePath": args.file_path}).encode("utf-8")
+
+    if args.warmup:
+        run_load_test(url, body, args.warmup, 1)
+    report = run_load_test(url, body, args.requests, args.concurrency)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
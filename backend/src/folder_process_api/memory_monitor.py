@@ -0,0 +1,100 @@
+"""
+Per-run memory accounting for the PDF pipeline
+==============================================
+MemoryMonitor samples the process RSS after every page and keeps the peak,
+so a run can report how much memory it needed (to size workers and
+containers). With a limit it raises MemoryLimitExceeded as soon as a sample
+crosses it, instead of the process being OOM-killed mid-document.
+
+The default limit comes from PDF_MEMORY_LIMIT_MB (unset = no limit).
+NULL_MEMORY is the do-nothing default, as NULL_TIMER is for StageTimer.
+
+RSS is read from /proc/self/statm; where that does not exist the process
+peak from getrusage() is used, and on Windows nothing is measured.
+"""
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_MEMORY_LIMIT_MB = float(os.environ["PDF_MEMORY_LIMIT_MB"]) if os.environ.get("PDF_MEMORY_LIMIT_MB") else None
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_MB = 1024 * 1024
+
+
+def peak_rss_bytes():
+    """Peak RSS of the process so far, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_bytes():
+    """Current RSS (falls back to the process peak), or None if unavailable"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def _mb(n):
+    return None if n is None else round(n / _MB, 1)
+
+
+class MemoryLimitExceeded(MemoryError):
+    """RSS went over the MemoryMonitor limit"""
+
+
+class MemoryMonitor:
+    """Peak RSS over one run, optionally capped"""
+
+    def __init__(self, limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+        self.limit_mb = limit_mb
+        self.start = rss_bytes()
+        self.peak = self.start
+        self.samples = 0
+
+    def __bool__(self):
+        return True
+
+    def sample(self):
+        """Record the current RSS; raises MemoryLimitExceeded over the limit"""
+        rss = rss_bytes()
+        if rss is None:
+            return None
+        self.samples += 1
+        if self.peak is None or rss > self.peak:
+            self.peak = rss
+        if self.limit_mb is not None and rss > self.limit_mb * _MB:
+            raise MemoryLimitExceeded(
+                f"Memory use {rss / _MB:.0f} MB exceeds the {self.limit_mb:g} MB limit"
+            )
+        return rss
+
+    def to_dict(self):
+        return {
+            "startRssMb": _mb(self.start),
+            "peakRssMb": _mb(self.peak),
+            "peakDeltaMb": _mb(self.peak - self.start) if self.start is not None else None,
+            "limitMb": self.limit_mb,
+            "samples": self.samples
+        }
+
+
+class NullMemoryMonitor:
+    """Stand-in used when memory accounting is off"""
+
+    def __bool__(self):
+        return False
+
+    def sample(self):
+        return None
+
+
+NULL_MEMORY = NullMemoryMonitor()
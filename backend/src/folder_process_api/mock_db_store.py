@@ -0,0 +1,331 @@
+"""
+Crash-safe writer for the frontend mock db.json
+===============================================
+All writes happen under an exclusive lock on <db>.lock, so concurrent saves
+from threads or processes serialize instead of losing each other's records.
+
+Two modes:
+- snapshot (default): load db.json, append, write a temp file and os.replace
+  it over db.json - readers see either the old or the new file, never a
+  partial one.
+- journal: each save appends one NDJSON line to <db>.journal (fsync'd), so
+  the cost tracks the size of the new exam, not the DB or the journal: an
+  append only reads the journal's first and last lines. Every
+  compact_every saves the journal is folded into db.json and reset.
+  Until then db.json - and so json-server, which only reads db.json - does
+  not show the journaled records; read() does.
+
+append() upserts: a record whose key (id; examId + order for
+examquestions) is already in db.json replaces it, so saving the same exam
+twice leaves one copy. Records without a key are appended. apply() updates
+records in place from an incremental changeset with the same keys, and also
+removes records; a removed question record is only deleted once no
+examquestion, of any exam, still points at it.
+
+db.json is written compact unless MOCK_DB_PRETTY=1 (2-space indent).
+
+Journal entries carry increasing sequence numbers, and compaction records
+the last one applied in db.json under JOURNAL_KEY, in the same atomic
+replace. A crash after db.json is replaced but before the journal is reset
+therefore does not apply those entries twice: replay skips every entry at or
+below the recorded number. After a reset the journal starts with a
+checkpoint line holding that number, so appends can number and count
+entries without opening db.json. A torn last journal line (crash
+mid-append) is dropped on the next append or replay.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import serializer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_COMPACT_EVERY = int(os.environ.get("MOCK_DB_COMPACT_EVERY", 20))
+DEFAULT_PRETTY = os.environ.get("MOCK_DB_PRETTY") == "1"
+
+# db.json key holding {"seq": <last journal entry compacted into it>};
+# an object, so json-server serves it as a plain singular route
+JOURNAL_KEY = "_journal"
+# Read size when scanning the journal backwards for its last line
+TAIL_BLOCK = 64 * 1024
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Exclusive inter-process lock held for the duration of the block"""
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json_atomic(path, data, pretty=False):
+    """Write JSON via temp file + fsync + rename in the same directory"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(serializer.dumps_bytes(data, pretty))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _record_id(record):
+    return record.get("id")
+
+
+def _exam_question_key(record):
+    if record.get("examId") is None:
+        return None
+    return record.get("examId"), record.get("order")
+
+
+# Upsert key per collection (default: id)
+RECORD_KEYS = {"examquestions": _exam_question_key}
+
+
+def apply_records(db, records):
+    """Upsert {collection: [records]} into db in place, by RECORD_KEYS"""
+    for collection, items in records.items():
+        _upsert(db.setdefault(collection, []), items, RECORD_KEYS.get(collection, _record_id))
+
+
+def _upsert(items, records, key):
+    """Replace items matching key(record) in place, append the rest (and records without a key)"""
+    index = {key(item): i for i, item in enumerate(items)}
+    index.pop(None, None)
+    for record in records:
+        record_key = key(record)
+        i = index.get(record_key) if record_key is not None else None
+        if i is None:
+            if record_key is not None:
+                index[record_key] = len(items)
+            items.append(record)
+        else:
+            items[i] = record
+
+
+def apply_changeset(db, changeset):
+    """Apply a changeset to a loaded db.json dict in place"""
+    exam_id = changeset["examId"]
+
+    if changeset["exam"] is not None:
+        _upsert(db.setdefault("exams", []), [changeset["exam"]], _record_id)
+
+    exam_questions = changeset["examQuestions"]
+    removed = set(exam_questions["removed"])
+    db["examquestions"] = [
+        eq for eq in db.get("examquestions", [])
+        if not (eq.get("examId") == exam_id and eq.get("order") in removed)
+    ]
+    _upsert(db["examquestions"], exam_questions["added"] + exam_questions["changed"], _exam_question_key)
+
+    questions = changeset["questions"]
+    # Records still referenced (by another exam, or moved within this one) stay
+    referenced = {eq.get("questionId") for eq in db["examquestions"]}
+    removed = set(questions["removed"]) - referenced
+    db["questions"] = [q for q in db.get("questions", []) if q.get("id") not in removed]
+    _upsert(db["questions"], questions["added"] + questions["changed"], _record_id)
+
+
+def apply_entry(db, entry):
+    """Apply one journal entry: {"changeset": {...}} or plain records to append"""
+    if "changeset" in entry:
+        apply_changeset(db, entry["changeset"])
+    else:
+        apply_records(db, entry)
+
+
+class MockDbStore:
+    """Locked, atomic append access to a json-server style db.json"""
+
+    def __init__(self, db_path, journal=False, compact_every=DEFAULT_COMPACT_EVERY, pretty=DEFAULT_PRETTY):
+        self.db_path = db_path
+        self.journal = journal
+        self.compact_every = compact_every
+        self.pretty = pretty
+        self.journal_path = db_path + ".journal"
+        self.lock_path = db_path + ".lock"
+
+    def append(self, records):
+        """
+        Persist records ({"exams": [...], "questions": [...], ...}) or a
+        {"changeset": ...} entry
+
+        Returns:
+            dict: {"mode": "journal"|"snapshot", "compacted": bool, "pendingEntries": int}
+        """
+        with file_lock(self.lock_path):
+            if not self.journal:
+                self._compact_locked(extra=records)
+                return {"mode": "snapshot", "compacted": True, "pendingEntries": 0}
+
+            pending = self._append_journal(records)
+            if pending >= self.compact_every:
+                self._compact_locked()
+                return {"mode": "journal", "compacted": True, "pendingEntries": 0}
+            return {"mode": "journal", "compacted": False, "pendingEntries": pending}
+
+    def apply(self, changeset):
+        """
+        Update records in place from an incremental.build_changeset changeset
+
+        Returns:
+            dict: Same as append()
+        """
+        return self.append({"changeset": changeset})
+
+    def compact(self):
+        """Fold the journal into db.json; returns the number of entries applied"""
+        with file_lock(self.lock_path):
+            return self._compact_locked()
+
+    def read(self):
+        """db.json with any journaled records applied"""
+        with file_lock(self.lock_path):
+            db = self._load_snapshot()
+            for _, entry in self._unapplied(db, self._journal_entries()):
+                apply_entry(db, entry)
+            return db
+
+    def pending(self):
+        """Number of journal entries not yet compacted"""
+        with file_lock(self.lock_path):
+            return len(self._unapplied(self._load_snapshot(), self._journal_entries()))
+
+    def _load_snapshot(self):
+        with open(self.db_path, "rb") as f:
+            return serializer.loads(f.read())
+
+    @staticmethod
+    def _unapplied(db, entries):
+        """(seq, entry) pairs db.json does not contain yet; unnumbered entries always apply"""
+        applied = db.get(JOURNAL_KEY, {}).get("seq", 0)
+        return [(seq, entry) for seq, entry in entries if seq is None or seq > applied]
+
+    def _journal_entries(self):
+        """(seq, entry) per journal line; seq is None for lines written before numbering"""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            if not line:
+                continue
+            try:
+                record = serializer.loads(line)
+            except ValueError:
+                # Torn write from a crash - always the last line
+                break
+            if "checkpoint" in record:
+                continue
+            if "seq" in record and "entry" in record:
+                entries.append((record["seq"], record["entry"]))
+            else:
+                entries.append((None, record))
+        return entries
+
+    def _journal_state(self, f):
+        """
+        (last seq, pending entries) of the open journal, dropping a torn last line
+
+        Reads only the checkpoint line and the last complete line; falls back
+        to a full scan plus db.json for journals without them (new, or
+        written before numbering).
+        """
+        f.seek(0)
+        first = f.readline(64)
+        end, last = _last_line(f)
+        if f.seek(0, os.SEEK_END) > end:
+            # Drop a torn last line so the new entry starts on its own line
+            f.truncate(end)
+        try:
+            checkpoint = serializer.loads(first)["checkpoint"] if first.endswith(b"\n") else None
+            last_seq = serializer.loads(last)
+            last_seq = last_seq.get("seq", last_seq.get("checkpoint"))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            checkpoint = last_seq = None
+        if checkpoint is not None and last_seq is not None:
+            return last_seq, last_seq - checkpoint
+
+        db = self._load_snapshot()
+        applied = db.get(JOURNAL_KEY, {}).get("seq", 0)
+        if f.seek(0, os.SEEK_END) == 0:
+            # New journal: start it with a checkpoint so later appends take the cheap path
+            f.write(serializer.dumps_bytes({"checkpoint": applied}) + b"\n")
+            return applied, 0
+        entries = self._journal_entries()
+        seqs = [seq for seq, _ in entries if seq is not None]
+        return max(seqs + [applied]), len(self._unapplied(db, entries))
+
+    def _append_journal(self, records):
+        """Append one fsync'd, numbered line; returns the pending entry count including it"""
+        with open(self.journal_path, "a+b") as f:
+            last_seq, pending = self._journal_state(f)
+            f.write(serializer.dumps_bytes({"seq": last_seq + 1, "entry": records}) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return pending + 1
+
+    def _compact_locked(self, extra=None):
+        journaled = self._journal_entries()
+        if not journaled and extra is None:
+            return 0
+
+        db = self._load_snapshot()
+        entries = self._unapplied(db, journaled)
+        for _, entry in entries:
+            apply_entry(db, entry)
+        if extra is not None:
+            apply_entry(db, extra)
+        seqs = [seq for seq, _ in entries if seq is not None]
+        if seqs:
+            db[JOURNAL_KEY] = {"seq": max(seqs)}
+        write_json_atomic(self.db_path, db, self.pretty)
+
+        if journaled:
+            checkpoint = db.get(JOURNAL_KEY, {}).get("seq", 0)
+            with open(self.journal_path, "wb") as f:
+                f.write(serializer.dumps_bytes({"checkpoint": checkpoint}) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return len(entries)
+
+
+def _last_line(f):
+    """(offset just past the last newline, the complete line before it or None)"""
+    pos = f.seek(0, os.SEEK_END)
+    buf = b""
+    while pos > 0:
+        step = min(TAIL_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+        last_nl = buf.rfind(b"\n")
+        if last_nl == -1:
+            continue
+        prev_nl = buf.rfind(b"\n", 0, last_nl)
+        if prev_nl != -1 or pos == 0:
+            return pos + last_nl + 1, buf[prev_nl + 1:last_nl]
+    return 0, None
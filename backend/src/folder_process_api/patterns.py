@@ -0,0 +1,158 @@
+"""
+Compiled regex registry for the exam parser
+===========================================
+Every pattern used by convert_pdf_final.py is compiled once here and looked up
+as an attribute of RX (e.g. RX.watermark.sub('', text)).
+
+Set PDF_PROFILE_REGEX=1 (or call RX.enable_profiling()) to wrap each pattern
+with call/time counters; RX.stats() then shows which regexes dominate.
+"""
+import os
+import re
+import time
+
+
+class TimedPattern:
+    """Compiled pattern proxy that records call count and time per pattern"""
+
+    def __init__(self, name, compiled, counters):
+        self.name = name
+        self.compiled = compiled
+        self.pattern = compiled.pattern
+        self.flags = compiled.flags
+        self._counter = counters.setdefault(name, {"calls": 0, "seconds": 0.0})
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._counter["calls"] += 1
+            self._counter["seconds"] += time.perf_counter() - start
+
+    def search(self, *args, **kwargs):
+        return self._timed(self.compiled.search, *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._timed(self.compiled.match, *args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self._timed(self.compiled.sub, *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._timed(self.compiled.split, *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._timed(self.compiled.findall, *args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        # finditer is lazy - consume it so the scan is billed to this pattern
+        return iter(self._timed(lambda: list(self.compiled.finditer(*args, **kwargs))))
+
+
+class PatternRegistry:
+    """Named, precompiled patterns with optional per-pattern timing"""
+
+    def __init__(self):
+        self._compiled = {}
+        self._counters = {}
+        self.profiling = False
+
+    def register(self, name, pattern, flags=0):
+        """Compile pattern and expose it as attribute `name`"""
+        if name in self._compiled:
+            raise ValueError(f"Pattern already registered: {name}")
+        compiled = re.compile(pattern, flags)
+        self._compiled[name] = compiled
+        setattr(self, name, TimedPattern(name, compiled, self._counters) if self.profiling else compiled)
+        return compiled
+
+    def enable_profiling(self):
+        """Swap every pattern for a timing proxy"""
+        self.profiling = True
+        for name, compiled in self._compiled.items():
+            setattr(self, name, TimedPattern(name, compiled, self._counters))
+
+    def disable_profiling(self):
+        """Restore the bare compiled patterns"""
+        self.profiling = False
+        for name, compiled in self._compiled.items():
+            setattr(self, name, compiled)
+
+    def reset_stats(self):
+        for counter in self._counters.values():
+            counter["calls"] = 0
+            counter["seconds"] = 0.0
+
+    def stats(self):
+        """Per-pattern counters, most expensive first"""
+        rows = [
+            {
+                "name": name,
+                "calls": counter["calls"],
+                "totalMs": round(counter["seconds"] * 1000, 3),
+                "avgUs": round(counter["seconds"] * 1e6 / counter["calls"], 3) if counter["calls"] else 0.0
+            }
+            for name, counter in self._counters.items()
+        ]
+        rows.sort(key=lambda row: row["totalMs"], reverse=True)
+        return rows
+
+
+RX = PatternRegistry()
+
+# clean_text
+RX.register("watermark", r'TAILIEUDIEUKY\s*©\s*2025')
+RX.register("spaces", r'[ \t]+')
+RX.register("spaces_around_newline", r' *\n *')
+RX.register("blank_lines", r'\n{3,}')
+
+# balance_bold / to_html_paragraphs / to_br_lines
+RX.register("empty_bold", r'<b>\s*</b>')
+RX.register("repeated_bold_open", r'<b>(<b>)+')
+RX.register("repeated_bold_close", r'(</b>)+</b>')
+RX.register("whitespace", r'\s+')
+RX.register("bold_gap_spaced", r'</b>\s+<b>')
+RX.register("bold_gap", r'</b>\s*<b>')
+RX.register("citation", r'^\(?(Adapted|Source|By\s)', re.I)
+RX.register("html_tag", r'<.*?>')
+RX.register("new_item", r'^([a-e]\s*-|[A-D]\.|Question\s+\d+|\d+\.)')
+
+# extract_exam
+RX.register("answers_header", r'Answers?\s*:', re.I)
+RX.register("answer_entry", r'(\d+)\.\s*([A-D])')
+RX.register("question_split", r'Question\s+(\d+)[\.:]', re.I)
+RX.register(
+    "passage_intro",
+    r'Read\s+the\s+following\s+(?:leaflet|passage|advertisement|passage\s+about)[^\.]*\s+and\s+mark[^\.]+\.',
+    re.I | re.DOTALL
+)
+RX.register("first_option_line", r'\n\s*A\.\s+')
+RX.register("question_stem", r'^(Which|What|The\s+(word|phrase)|According|Where|In\s+which)', re.I)
+RX.register("numbered_blank_line", r'\([0-9]+\)\s*_{2,}[^\n]*')
+
+# parse_question - option markers
+RX.register("option_marker", r'[A-D]\.')
+RX.register("ordering_item", r'\b[a-e]\s*-')
+
+# parse_question - tags
+RX.register("bold_tag", r'</?b>')
+RX.register("cloze_blank", r'\(\s*\d+\s*\)\s*_{2,}')
+RX.register(
+    "reading_keywords",
+    r'(according to|which of the following|the word|the phrase|best summarises?|TRUE according|NOT mentioned|'
+    r'refers to|could be best replaced|best paraphrases?|in which paragraph|where in paragraph)',
+    re.I
+)
+
+# parse_question - option text cleanup
+RX.register("trailing_bold_tag", r'</?b>\s*$')
+RX.register("leading_bold_tag", r'^\s*</?b>\s*')
+RX.register("trailing_item_dash_bold", r'\s*[–-]\s*[a-e]\s*<b>\s*$')
+RX.register("after_blank_line", r'\n{2,}.*$')
+RX.register("trailing_bold_or_space", r'(</?b>|\s)+$')
+RX.register("leading_bold_or_space", r'^(</?b>|\s)+')
+RX.register("trailing_item_dash", r'\s*[–-]\s*[a-e]$')
+
+if os.environ.get("PDF_PROFILE_REGEX") == "1":
+    RX.enable_profiling()
@@ -0,0 +1,73 @@
+"""
+In-process cache for processed exam files
+=========================================
+Keeps the mapped GoPass result of process_exam_file in memory, keyed on the
+absolute file path plus its mtime and size, so repeated preview/process calls
+on an unchanged exam_corrected.json skip json.load and the whole mapping.
+
+Editing the file changes mtime/size and therefore the key; the stale entry is
+replaced on the next lookup. Bounded by entry count with LRU eviction.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("EXAM_CACHE_MAX_ENTRIES", 32))
+
+
+def file_key(file_path):
+    """Cache key: (absolute path, mtime_ns, size) - raises OSError if the file is missing"""
+    st = os.stat(file_path)
+    return os.path.abspath(file_path), st.st_mtime_ns, st.st_size
+
+
+class ProcessedExamCache:
+    """Thread-safe, entry-bounded LRU cache of processed exams"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # path -> (key, result)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return cached result or None; counts a hit or miss"""
+        path = key[0]
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, result):
+        """Store result, replacing any older version of the same file"""
+        if self.max_entries <= 0:
+            return
+        path = key[0]
+        with self._lock:
+            self._entries[path] = (key, result)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries
+            }
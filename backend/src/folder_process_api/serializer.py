@@ -0,0 +1,114 @@
+"""
+JSON serialization backend
+==========================
+One place that decides how exam payloads become JSON, shared by
+convert_pdf_final.py and exam_processor_api.py:
+
+- orjson when it is installed (several times faster on large HTML passages),
+  otherwise stdlib json. JSON_SERIALIZER=stdlib forces the fallback.
+- compact output by default; pretty=True for 2-space indentation.
+- non-ASCII text is written as UTF-8, never as \\u escapes.
+- objects with a to_dict() method (exam_models records) are serialized
+  through it.
+
+Response compression (gzip, plus zstd when the zstandard package is
+installed) is negotiated from an Accept-Encoding header.
+"""
+import gzip
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if os.environ.get("JSON_SERIALIZER") == "stdlib":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+GZIP_LEVEL = int(os.environ.get("RESPONSE_GZIP_LEVEL", 6))
+ZSTD_LEVEL = int(os.environ.get("RESPONSE_ZSTD_LEVEL", 3))
+COMPRESS_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESS_MIN_BYTES", 1024))
+
+
+def _default(obj):
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def dumps_bytes(obj, pretty=False):
+    """Serialize to UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return dumps(obj, pretty).encode("utf-8")
+
+
+def dumps(obj, pretty=False):
+    """Serialize to a JSON str"""
+    if orjson is not None:
+        return dumps_bytes(obj, pretty).decode("utf-8")
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def supported_encodings():
+    """Content-Encodings we can produce, most preferred first"""
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick a Content-Encoding from an Accept-Encoding header, or None
+
+    Encodings with q=0 are refused; among the rest the highest q wins, ties
+    going to our preference order (zstd, then gzip).
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    best = None
+    for encoding in supported_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, encoding)
+    return best[1] if best else None
+
+
+def compress(body, encoding):
+    """Compress bytes with a name returned by negotiate_encoding"""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
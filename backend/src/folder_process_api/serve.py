@@ -0,0 +1,172 @@
+"""
+Production server for the GoPass Exam Processor API
+===================================================
+Serves exam_processor_api.app with a real WSGI server instead of the
+single-threaded Werkzeug dev server:
+
+- gunicorn (Linux/macOS): WEB_WORKERS processes x WEB_THREADS threads
+  (gthread). The app, its mapping code and the compiled parser patterns are
+  imported once in the master and shared by the forked workers (preload).
+  SIGTERM stops accepting connections and lets in-flight requests finish
+  within GRACEFUL_TIMEOUT.
+- waitress (Windows, or when gunicorn is missing): one process with
+  WEB_THREADS threads; SIGINT/SIGTERM drain in-flight requests.
+- Werkzeug threaded server as a last resort.
+
+Upload jobs (/api/jobs) live in the memory of the worker process that
+accepted them, so a job status poll that lands on another worker gets a
+404. WEB_WORKERS therefore defaults to 1 (scale with WEB_THREADS; upload
+jobs already run in their own process pool). Only raise it if no client
+polls /api/jobs.
+
+Usage:
+    python serve.py                        # auto-pick server, env defaults
+    python serve.py -w 4 -t 8 --port 5002
+    python serve.py --server waitress
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+
+# Preload: Flask app, mapping functions and the regex registry are imported
+# (and compiled) once here, before any worker is forked.
+from exam_processor_api import app, JOB_QUEUE
+
+DEFAULT_HOST = os.environ.get("HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.environ.get("PORT", 5002))
+# Job state is per process - see the module docstring before raising this
+DEFAULT_WORKERS = int(os.environ.get("WEB_WORKERS", 1))
+DEFAULT_THREADS = int(os.environ.get("WEB_THREADS", 8))
+GRACEFUL_TIMEOUT = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+
+
+def available_servers():
+    servers = []
+    if os.name != "nt":
+        try:
+            import gunicorn  # noqa: F401
+            servers.append("gunicorn")
+        except ImportError:
+            pass
+    try:
+        import waitress  # noqa: F401
+        servers.append("waitress")
+    except ImportError:
+        pass
+    servers.append("werkzeug")
+    return servers
+
+
+def stop_jobs(wait=True):
+    """Let running upload jobs finish, drop queued ones"""
+    JOB_QUEUE.shutdown(wait=wait, cancel_pending=True)
+
+
+def run_gunicorn(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+        "preload_app": True,
+        "graceful_timeout": GRACEFUL_TIMEOUT,
+        "timeout": max(60, GRACEFUL_TIMEOUT),
+        "worker_exit": lambda server, worker: stop_jobs(),
+        "accesslog": "-"
+    }
+    StandaloneApplication(app, options).run()
+
+
+def run_waitress(host, port, threads):
+    from waitress.server import create_server
+
+    server = create_server(app, host=host, port=port, threads=threads)
+
+    def handle_signal(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Stop accepting, then wait for in-flight requests
+        server.close()
+        server.task_dispatcher.shutdown(cancel_pending=False, timeout=GRACEFUL_TIMEOUT)
+        stop_jobs()
+
+
+def run_werkzeug(host, port):
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, app, threaded=True)
+
+    def handle_signal(signum, frame):
+        # shutdown() blocks until serve_forever returns - call it off the main thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        stop_jobs()
+
+
+def main():
+    servers = available_servers()
+    parser = argparse.ArgumentParser(description="Run the Exam Processor API with a production WSGI server")
+    parser.add_argument("--server", choices=["gunicorn", "waitress", "werkzeug"], default=servers[0],
+                        help=f"WSGI server (default: {servers[0]})")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Worker processes (gunicorn only; default 1 - /api/jobs state is per process)")
+    parser.add_argument("-t", "--threads", type=int, default=DEFAULT_THREADS,
+                        help="Threads per worker")
+    args = parser.parse_args()
+
+    if args.server not in servers:
+        print(f"{args.server} is not installed (available: {', '.join(servers)})", file=sys.stderr)
+        sys.exit(1)
+    if args.server != "gunicorn" and args.workers > 1:
+        print(f"{args.server} runs a single process; --workers ignored", file=sys.stderr)
+    elif args.workers > 1:
+        print(f"Warning: /api/jobs state is per worker - status polls on another of the {args.workers} "
+              f"workers return 404", file=sys.stderr)
+
+    print(f"Serving on http://{args.host}:{args.port} with {args.server} "
+          f"({args.workers if args.server == 'gunicorn' else 1} workers x {args.threads} threads)",
+          file=sys.stderr)
+
+    if args.server == "gunicorn":
+        # gunicorn parses sys.argv itself
+        sys.argv = sys.argv[:1]
+        run_gunicorn(args.host, args.port, args.workers, args.threads)
+    elif args.server == "waitress":
+        run_waitress(args.host, args.port, args.threads)
+    else:
+        run_werkzeug(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-stage timing for the PDF pipeline
+=====================================
+StageTimer accumulates wall time per named stage plus free-form counters
+(pages, chars, questions, ...). The pipeline functions take an optional
+timer; NULL_TIMER is the do-nothing default so uninstrumented runs pay
+almost nothing.
+"""
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class StageTimer:
+    """Wall time and call counts per stage, plus counters"""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._start = time.perf_counter()
+
+    def __bool__(self):
+        return True
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds, calls=1):
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += calls
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, data):
+        """Fold in a to_dict() result (e.g. from a pool worker)"""
+        for name, entry in data.get("stages", {}).items():
+            self.add(name, entry["ms"] / 1000, entry["calls"])
+        for name, n in data.get("counters", {}).items():
+            self.count(name, n)
+
+    def to_dict(self):
+        return {
+            "totalMs": round((time.perf_counter() - self._start) * 1000, 3),
+            "stages": {
+                name: {"ms": round(entry["seconds"] * 1000, 3), "calls": entry["calls"]}
+                for name, entry in self.stages.items()
+            },
+            "counters": dict(self.counters)
+        }
+
+
+class NullTimer:
+    """Stand-in used when instrumentation is off"""
+
+    def __bool__(self):
+        return False
+
+    def stage(self, name):
+        return nullcontext()
+
+    def add(self, name, seconds, calls=1):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def merge(self, data):
+        pass
+
+
+NULL_TIMER = NullTimer()
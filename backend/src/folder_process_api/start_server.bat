@@ -5,10 +5,11 @@ echo ========================================
 echo.
 echo Starting server on http://localhost:5002
 echo Press Ctrl+C to stop the server
+echo (dev server with reloader: python exam_processor_api.py)
 echo.
 echo ========================================
 echo.
 
-python exam_processor_api.py
+python serve.py
 
 pause
@@ -0,0 +1,202 @@
+"""
+Synthetic exam corpus generator
+===============================
+Builds exams of any size offline, in the two forms the pipeline consumes:
+
+- "pages": per-page lists of pdfplumber-style char dicts (text, top, x0,
+  fontname, size) laid out like the sample PDFs - bold "Question N:" labels
+  and option letters, passage intros, paragraph gaps and an "Answers:" key -
+  so extract_with_bold, iter_exam_records and parse_question see realistic
+  input without a PDF.
+- "processed": the {"passages", "questions"} JSON of exam_corrected.json, for
+  process_exam_file / map_exam_data.
+
+Output is deterministic for a given seed.
+
+Usage:
+    python synthetic_exam.py -o fixtures/synthetic --questions 400 --passages 40 --pages 60
+"""
+import argparse
+import json
+import os
+import random
+
+WORDS = (
+    "city people growth energy water school student teacher market robot system science language culture "
+    "history travel health family future country research design project change natural public private "
+    "digital modern local global policy service community environment technology education industry "
+    "transport museum festival ocean forest climate report survey village career skill friend volunteer "
+    "often usually rapidly carefully rarely widely especially recently significantly gradually "
+    "improve reduce provide develop explain protect create support increase attract require consider "
+    "important different common popular useful serious strong recent various available similar"
+).split()
+
+INSTRUCTION = ("Read the following passage and mark the letter A, B, C, or D on your answer sheet to indicate "
+               "the best answer to each of the following questions.")
+STEMS = (
+    "Which of the following is NOT mentioned as",
+    "The word {w} in paragraph {p} is OPPOSITE in meaning to",
+    "The word {w} in paragraph {p} could be best replaced by",
+    "According to paragraph {p}, which of the following is TRUE about",
+    "Which of the following best summarises",
+)
+LETTERS = "ABCD"
+
+LINE_CHARS = 105
+LINE_HEIGHT = 14.0
+PARAGRAPH_GAP = 12.0
+PAGE_TOP = 40.0
+CHAR_WIDTH = 5.5
+REGULAR_FONT = "TimesNewRomanPSMT"
+BOLD_FONT = "TimesNewRomanPS-BoldMT"
+
+
+class _Builder:
+    """Accumulates lines of (text, bold) segments"""
+
+    def __init__(self, rng, bold_density):
+        self.rng = rng
+        self.bold_density = bold_density
+        self.lines = []  # (segments, starts_paragraph)
+
+    def words(self, n):
+        return [self.rng.choice(WORDS) for _ in range(n)]
+
+    def line(self, segments, paragraph=False):
+        self.lines.append((segments, paragraph))
+
+    def prose(self, n_words, paragraph=True):
+        """Wrap random words into lines, bolding words at bold_density"""
+        segments, length = [], 0
+        first = paragraph
+        for word in self.words(n_words):
+            if length + len(word) + 1 > LINE_CHARS and segments:
+                self.line(segments, first)
+                segments, length, first = [], 0, False
+            segments.append((word + " ", self.rng.random() < self.bold_density))
+            length += len(word) + 1
+        if segments:
+            self.line(segments, first)
+
+
+def generate_exam(questions=40, passages=5, bold_density=0.1, pages=None, seed=0):
+    """
+    Build one synthetic exam
+
+    Questions are split as evenly as possible across passages; with
+    passages=0 they are standalone. pages=None lays out ~55 lines per page.
+
+    Returns:
+        dict: {"pages": [[char, ...], ...], "processed": {"passages", "questions"},
+               "params": {...}}
+    """
+    rng = random.Random(seed)
+    builder = _Builder(rng, bold_density)
+    processed = {"passages": [], "questions": []}
+    answers = []
+
+    groups = max(passages, 1)
+    sizes = [questions // groups + (1 if i < questions % groups else 0) for i in range(groups)]
+    number = 1
+
+    for group, size in enumerate(sizes):
+        pass_id = None
+        if passages:
+            pass_id = f"passage_{group + 1}"
+            builder.line([(INSTRUCTION, True)], paragraph=True)
+            title = " ".join(builder.words(4)).upper()
+            builder.line([(title, True)], paragraph=True)
+            paragraphs = [" ".join(builder.words(60)) for _ in range(3)]
+            for _ in paragraphs:
+                builder.prose(60)
+            processed["passages"].append({
+                "passage_id": pass_id,
+                "instruction": INSTRUCTION,
+                "content": "".join(f'<p class="mb-4 text-justify">{p}</p>\n' for p in paragraphs)
+            })
+
+        for _ in range(size):
+            stem = rng.choice(STEMS).format(w=rng.choice(WORDS), p=rng.randint(1, 3))
+            stem = f"{stem} {' '.join(builder.words(rng.randint(2, 8)))} _______."
+            options = {letter: " ".join(builder.words(rng.randint(1, 6))) for letter in LETTERS}
+            answer = rng.choice(LETTERS)
+
+            builder.line([(f"Question {number}: ", True), (stem, False)], paragraph=True)
+            for letter in LETTERS:
+                builder.line([(f" {letter}.", True), (options[letter], False)])
+            builder.line([(" ", True)])
+
+            processed["questions"].append({
+                "question_number": number,
+                "question_text": stem,
+                "options": options,
+                "answer": answer,
+                "PassageRelated": pass_id,
+                "tags": ["reading"] if pass_id else []
+            })
+            answers.append(answer)
+            number += 1
+
+    builder.line([("Answers:", False)], paragraph=True)
+    for n, answer in enumerate(answers, start=1):
+        builder.line([(f"{n}. {answer}", False)], paragraph=n == 1)
+
+    return {
+        "pages": layout_pages(builder.lines, pages),
+        "processed": processed,
+        "params": {"questions": questions, "passages": passages, "bold_density": bold_density,
+                   "pages": pages, "seed": seed}
+    }
+
+
+def layout_pages(lines, pages=None):
+    """Turn (segments, starts_paragraph) lines into per-page char dicts"""
+    per_page = -(-len(lines) // pages) if pages else 55
+    result = []
+    for start in range(0, len(lines), per_page):
+        chars = []
+        top = PAGE_TOP
+        for index, (segments, paragraph) in enumerate(lines[start:start + per_page]):
+            if index:
+                top += LINE_HEIGHT + (PARAGRAPH_GAP if paragraph else 0.0)
+            x0 = 28.0
+            for text, bold in segments:
+                fontname = BOLD_FONT if bold else REGULAR_FONT
+                for ch in text:
+                    chars.append({"text": ch, "top": top, "x0": x0, "fontname": fontname, "size": 12.0})
+                    x0 += CHAR_WIDTH
+        result.append(chars)
+    return result
+
+
+def write_fixture(exam, output_dir, name):
+    """Write <name>.chars.json (pages of chars) and <name>.json (processed exam)"""
+    os.makedirs(output_dir, exist_ok=True)
+    chars_path = os.path.join(output_dir, f"{name}.chars.json")
+    processed_path = os.path.join(output_dir, f"{name}.json")
+    with open(chars_path, "w", encoding="utf-8") as f:
+        json.dump({"params": exam["params"], "pages": exam["pages"]}, f, ensure_ascii=False)
+    with open(processed_path, "w", encoding="utf-8") as f:
+        json.dump(exam["processed"], f, ensure_ascii=False)
+    return chars_path, processed_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic exam fixture")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("--name", default=None, help="File stem (default: synthetic-q<N>-p<M>)")
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--passages", type=int, default=5)
+    parser.add_argument("--bold-density", type=float, default=0.1)
+    parser.add_argument("--pages", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    exam = generate_exam(args.questions, args.passages, args.bold_density, args.pages, args.seed)
+    name = args.name or f"synthetic-q{args.questions}-p{args.passages}"
+    for path in write_fixture(exam, args.output_dir, name):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
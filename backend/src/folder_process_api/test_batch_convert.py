@@ -0,0 +1,76 @@
+"""
+Test batch conversion: input collection, resumed runs and the summary of an aborted run
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import batch_convert
+from batch_convert import SUMMARY_FILE, collect_pdfs, run_batch
+
+PDF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi")
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def crash_worker(pdf_path, output_path, cache_dir=None):
+    os._exit(1)
+
+
+def test_collect_skips_word_lock_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("a.pdf", "b.docx", "~$b.docx", "notes.txt"):
+            open(os.path.join(tmp, name), "wb").close()
+        assert [os.path.basename(p) for p in collect_pdfs([tmp])] == ["a.pdf", "b.docx"]
+        assert [os.path.basename(p) for p in collect_pdfs([os.path.join(tmp, "*.docx")])] == ["b.docx"]
+
+
+def test_resumed_run_counts_skipped_files_from_their_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(PDF_DIR, "de_2.pdf"), tmp)
+        out = os.path.join(tmp, "out")
+
+        first = run_batch([tmp], out, workers=1)
+        assert first["totals"]["converted"] == 1 and first["totals"]["questions"] == 40
+
+        # Summary lost (e.g. an earlier aborted run): counts still come from de_2.json
+        os.remove(os.path.join(out, SUMMARY_FILE))
+        second = run_batch([tmp], out, workers=1)
+        assert second["totals"]["skipped"] == 1
+        assert second["totals"]["questions"] == 40
+        assert second["totals"]["passages"] == first["totals"]["passages"]
+
+
+def test_summary_is_written_when_the_pool_breaks():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(PDF_DIR, "de_2.pdf"), tmp)
+        out = os.path.join(tmp, "out")
+        convert_one = batch_convert.convert_one
+        batch_convert.convert_one = crash_worker
+        try:
+            run_batch([tmp], out, workers=1)
+            assert False, "expected BrokenProcessPool"
+        except BrokenProcessPool:
+            pass
+        finally:
+            batch_convert.convert_one = convert_one
+
+        summary = load(os.path.join(out, SUMMARY_FILE))
+        assert summary["totals"]["failed"] == 1
+        assert summary["failures"][0]["errorType"] == "BrokenProcessPool"
+
+
+if __name__ == "__main__":
+    test_collect_skips_word_lock_files()
+    test_resumed_run_counts_skipped_files_from_their_output()
+    test_summary_is_written_when_the_pool_breaks()
+    print(json.dumps({"success": True}))
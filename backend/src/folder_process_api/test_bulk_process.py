@@ -0,0 +1,43 @@
+"""
+Test bulk /api/process-exams NDJSON streaming
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import exam_processor_api
+
+
+def test_bulk_stream_results_and_totals():
+    """One result line per path (any order), failures included, totals at the end"""
+    client = exam_processor_api.app.test_client()
+    paths = ["exam_corrected.json", "missing.json", "exam_corrected.json"]
+    response = client.post("/api/process-exams", json={"filePaths": paths, "includeData": False})
+
+    assert response.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    results, done = records[:-1], records[-1]
+
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert [r["success"] for r in sorted(results, key=lambda r: r["index"])] == [True, False, True]
+    assert all("data" not in r for r in results)
+
+    single = exam_processor_api.process_exam_file("exam_corrected.json")["stats"]
+    assert done["type"] == "done"
+    assert (done["files"], done["succeeded"], done["failed"]) == (3, 2, 1)
+    assert done["stats"]["totalQuestions"] == 2 * single["totalQuestions"]
+
+
+def test_bulk_rejects_bad_input():
+    client = exam_processor_api.app.test_client()
+    assert client.post("/api/process-exams", json={"filePaths": []}).status_code == 400
+    assert client.post("/api/process-exams", json={"filePaths": "a.json"}).status_code == 400
+
+
+if __name__ == "__main__":
+    test_bulk_stream_results_and_totals()
+    test_bulk_rejects_bad_input()
+    print(json.dumps({"success": True}))
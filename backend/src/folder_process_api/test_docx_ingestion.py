@@ -0,0 +1,130 @@
+"""
+Test native DOCX ingestion: run bold, Word numbering and the exam JSON it produces
+"""
+import sys
+import os
+import io
+import json
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import extract_exam, stream_exam
+from docx_text import is_docx, iter_docx_paragraphs, normalise
+
+PDF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi")
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+STYLES = f"""<w:styles {NS}>
+<w:docDefaults><w:pPrDefault><w:pPr><w:spacing w:after="160"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"/>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:basedOn w:val="Normal"/><w:rPr><w:b/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Line"><w:basedOn w:val="Normal"/><w:pPr><w:spacing w:after="0"/></w:pPr></w:style>
+</w:styles>"""
+
+NUMBERING = f"""<w:numbering {NS}>
+<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="upperLetter"/>
+<w:lvlText w:val="%1."/><w:rPr><w:b/></w:rPr></w:lvl></w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+<w:num w:numId="2"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+
+def paragraph(*runs, style=None, num_id=None):
+    ppr = ""
+    if style or num_id:
+        ppr = "<w:pPr>"
+        ppr += f'<w:pStyle w:val="{style}"/>' if style else ""
+        ppr += f'<w:numPr><w:ilvl w:val="0"/><w:numId w:val="{num_id}"/></w:numPr>' if num_id else ""
+        ppr += "</w:pPr>"
+    body = ""
+    for run in runs:
+        bold = run.startswith("*")
+        text = run[1:] if bold else run
+        body += f'<w:r>{"<w:rPr><w:b/></w:rPr>" if bold else ""}<w:t xml:space="preserve">{text}</w:t></w:r>'
+    return f"<w:p>{ppr}{body}</w:p>"
+
+
+def make_docx(paragraphs):
+    document = f'<w:document {NS}><w:body>{"".join(paragraphs)}</w:body></w:document>'
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as docx:
+        docx.writestr("word/document.xml", document)
+        docx.writestr("word/styles.xml", STYLES)
+        docx.writestr("word/numbering.xml", NUMBERING)
+    return buf.getvalue()
+
+
+def question(number, stem, options, num_id):
+    return [paragraph(f"*Question {number}:", f" {stem}", style="Line")] + \
+        [paragraph(option, style="Line", num_id=num_id) for option in options]
+
+
+EXAM = make_docx(
+    [paragraph("Read the following passage and mark the letter A, B, C, or D to indicate the best answer.",
+               style="Heading2"),
+     paragraph("Cities keep growing as ", "*people", " move in from the countryside."),
+     paragraph()]
+    + question(1, "What is the passage mainly about?", ["Farming", "Cities", "Schools", "Work"], 1)
+    + [paragraph()]
+    + question(2, "Which of the following is TRUE?", ["Cities shrink", "People move", "Farms grow", "None"], 2)
+    + [paragraph()]
+    + [paragraph("Answers:", style="Line"), paragraph("1. B", style="Line"), paragraph("2. B", style="Line")]
+)
+
+
+def test_paragraphs_carry_run_bold_and_numbering():
+    paragraphs = list(iter_docx_paragraphs(EXAM))
+    texts = [text for text, _ in paragraphs]
+    assert texts[0].startswith("<b>Read the following passage") and texts[0].endswith("</b>")
+    assert texts[1] == "Cities keep growing as <b>people</b> move in from the countryside."
+    assert texts[4:8] == ["<b>A. </b>Farming", "<b>B. </b>Cities", "<b>C. </b>Schools", "<b>D. </b>Work"]
+    # A new list restarts at A.
+    assert texts[10] == "<b>A. </b>Cities shrink"
+    # The default spacing after (heading, Normal, empty paragraph) is a gap; "Line" paragraphs have none
+    assert [brk for _, brk in paragraphs][1:6] == [True, True, True, False, False]
+
+
+def test_docx_exam_json():
+    result = extract_exam(EXAM, with_ranges=True)
+    assert [p["passage_id"] for p in result["passages"]] == ["passage_1"]
+    assert "<b>people</b>" in result["passages"][0]["content"]
+    first, second = result["questions"]
+    assert first["question_text"] == "What is the passage mainly about?"
+    assert first["options"] == {"A": "Farming", "B": "Cities", "C": "Schools", "D": "Work"}
+    assert [first["answer"], second["answer"]] == ["B", "B"]
+    assert second["tags"] == ["reading"] and second["PassageRelated"] == "passage_1"
+    assert result["passage_ranges"] == {"passage_1": {"start": 1, "end": 2}}
+
+    out = io.StringIO()
+    streamed, _ = stream_exam(io.BytesIO(EXAM), out)
+    assert streamed == {**result, "passage_ranges": streamed["passage_ranges"]}
+    assert json.loads(out.getvalue().splitlines()[-1])["questions"] == 2
+
+
+def test_is_docx_checks_content_not_name():
+    assert is_docx(EXAM)
+    assert is_docx(io.BytesIO(EXAM))
+    assert not is_docx(b"%PDF-1.7\n")
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as other:
+        other.writestr("content.xml", "<x/>")
+    assert not is_docx(buf.getvalue())
+
+
+def test_sample_docx_matches_its_pdf():
+    """de_2.docx gives the same exam as de_2.pdf, up to PDF line-wrap whitespace"""
+    docx_result = extract_exam(os.path.join(PDF_DIR, "de_2.docx"))
+    pdf_result = extract_exam(os.path.join(PDF_DIR, "de_2.pdf"))
+    assert len(docx_result["questions"]) == 40
+    assert [q["answer"] for q in docx_result["questions"]] == [q["answer"] for q in pdf_result["questions"]]
+    assert normalise(docx_result) == normalise(pdf_result)
+
+
+if __name__ == "__main__":
+    test_paragraphs_carry_run_bold_and_numbering()
+    test_docx_exam_json()
+    test_is_docx_checks_content_not_name()
+    test_sample_docx_matches_its_pdf()
+    print(json.dumps({"success": True}))
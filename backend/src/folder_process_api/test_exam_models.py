@@ -0,0 +1,47 @@
+"""
+Test the compact Question / Option / ExamQuestion records
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import exam_processor_api
+import serializer
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exam_corrected.json")
+
+
+def test_records_serialize_to_the_dict_shape():
+    """Records behave like the dicts they replace and dump to the same JSON"""
+    with open(SAMPLE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    result = exam_processor_api.map_exam_data(data)
+    question = result["data"]["questions"][0]
+    as_dict = question.to_dict()
+
+    assert list(question) == list(as_dict)
+    assert question == as_dict
+    assert dict(question, id="x")["id"] == "x"
+    assert question["options"][0]["isCorrect"] == as_dict["options"][0]["isCorrect"]
+    assert not hasattr(question, "__dict__")
+    assert serializer.loads(serializer.dumps(result))["data"]["questions"][0] == as_dict
+
+
+def test_single_pass_stats_match_recount():
+    result = exam_processor_api.process_exam_file("exam_corrected.json", use_cache=False)
+    questions = result["data"]["questions"]
+    stats = result["stats"]
+    assert stats["questionsWithPassage"] == len([q for q in questions if q["linkedPassageId"]])
+    assert stats["questionsWithoutPassage"] == len([q for q in questions if not q["linkedPassageId"]])
+    assert stats["clozeQuestions"] == len([q for q in questions if "cloze" in q["tags"]])
+    assert stats["readingQuestions"] == len([q for q in questions if "reading" in q["tags"]])
+    assert stats["totalPoints"] == len(questions) * exam_processor_api.POINTS_PER_QUESTION
+
+
+if __name__ == "__main__":
+    test_records_serialize_to_the_dict_shape()
+    test_single_pass_stats_match_recount()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,57 @@
+"""
+Test the content-hash extraction cache (no PDF required)
+"""
+import sys
+import os
+import json
+import time
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from extraction_cache import ExtractionCache, make_key
+
+
+def test_hit_miss_and_version_key():
+    """Same bytes + version hit; a new parser version misses"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ExtractionCache(cache_dir)
+        result = {"passages": [], "questions": [{"question_number": 1, "question_text": "Câu hỏi"}]}
+
+        key = make_key(b"%PDF-1.4 sample", "1.0.0")
+        assert cache.get(key) is None
+        cache.put(key, result)
+        assert cache.get(key) == result
+        assert cache.get(make_key(b"%PDF-1.4 sample", "1.0.1")) is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["entries"] == 1
+
+
+def test_lru_eviction():
+    """Least recently used entry is evicted once the size bound is exceeded"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        payload = {"questions": ["x" * 400]}
+        cache = ExtractionCache(cache_dir, max_bytes=1000)
+
+        cache.put("a", payload)
+        time.sleep(0.01)
+        cache.put("b", payload)
+        time.sleep(0.01)
+        cache.get("a")  # "a" is now more recent than "b"
+        time.sleep(0.01)
+        cache.put("c", payload)
+
+        assert cache.get("a") == payload
+        assert cache.get("b") is None
+        assert cache.get("c") == payload
+        assert cache.stats()["evictions"] == 1
+
+
+if __name__ == "__main__":
+    test_hit_miss_and_version_key()
+    test_lru_eviction()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,69 @@
+"""
+Test deterministic ID strategies for mapped passages and questions
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from id_strategy import IdGenerator
+import exam_processor_api
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exam_corrected.json")
+
+
+def load_sample():
+    with open(SAMPLE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def question_ids(result):
+    return [q["id"] for q in result["data"]["questions"]]
+
+
+def test_content_ids_are_reproducible_and_unique():
+    """Unchanged input -> same IDs; duplicated questions still get distinct IDs"""
+    data = load_sample()
+    first = exam_processor_api.map_exam_data(data, IdGenerator("content"))
+    second = exam_processor_api.map_exam_data(load_sample(), IdGenerator("content"))
+    assert question_ids(first) == question_ids(second)
+    assert [eq["questionId"] for eq in first["data"]["examQuestions"]] == question_ids(first)
+
+    data["questions"].append(dict(data["questions"][0]))
+    ids = question_ids(exam_processor_api.map_exam_data(data, IdGenerator("content")))
+    assert len(set(ids)) == len(ids)
+    assert ids[-1] == ids[0] + "-2"
+
+
+def test_content_ids_are_unique_per_exam():
+    """The same question in two exams must not share a record (seed = exam source)"""
+    data = load_sample()
+    a = question_ids(exam_processor_api.map_exam_data(data, IdGenerator("content", seed="exam-a.json")))
+    b = question_ids(exam_processor_api.map_exam_data(data, IdGenerator("content", seed="exam-b.json")))
+    assert not set(a) & set(b)
+    assert a == question_ids(exam_processor_api.map_exam_data(data, IdGenerator("content", seed="exam-a.json")))
+
+
+def test_counter_ids_survive_content_edits():
+    data = load_sample()
+    before = question_ids(exam_processor_api.map_exam_data(data, IdGenerator("counter", seed="exam")))
+    data["questions"][3]["question_text"] += " (fixed typo)"
+    after = question_ids(exam_processor_api.map_exam_data(data, IdGenerator("counter", seed="exam")))
+    assert before == after
+    assert before != question_ids(exam_processor_api.map_exam_data(data, IdGenerator("counter", seed="other")))
+
+
+def test_uuid_strategy_stays_random():
+    data = load_sample()
+    assert question_ids(exam_processor_api.map_exam_data(data, IdGenerator("uuid"))) != \
+        question_ids(exam_processor_api.map_exam_data(data, IdGenerator("uuid")))
+
+
+if __name__ == "__main__":
+    test_content_ids_are_reproducible_and_unique()
+    test_content_ids_are_unique_per_exam()
+    test_counter_ids_survive_content_edits()
+    test_uuid_strategy_stays_random()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,129 @@
+"""
+Test incremental re-processing: changesets and in-place mock DB updates
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from id_strategy import IdGenerator
+from incremental import ProcessedState, build_changeset
+from mock_db_store import apply_changeset
+import exam_processor_api
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exam_corrected.json")
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def test_changeset_typo_fix_and_removal():
+    """A typo fix is one changed question with its old id; a dropped question is removed"""
+    original = exam_processor_api.map_exam_data(load_json(SAMPLE))["data"]
+    saved, first = build_changeset(None, original, "exam-1")
+    assert first["summary"]["questionsAdded"] == len(original["questions"])
+
+    edited = load_json(SAMPLE)
+    edited["questions"][2]["question_text"] += " (fixed)"
+    edited["questions"].pop()
+    current = exam_processor_api.map_exam_data(edited)["data"]
+
+    _, changeset = build_changeset(saved, current, "exam-1")
+    assert [q["id"] for q in changeset["questions"]["changed"]] == [saved["questions"][2]["id"]]
+    assert changeset["questions"]["removed"] == [saved["questions"][-1]["id"]]
+    assert changeset["questions"]["added"] == []
+    assert changeset["exam"] is not None  # totalQuestions changed
+
+    db = {"exams": [], "questions": [], "examquestions": []}
+    apply_changeset(db, first)
+    apply_changeset(db, changeset)
+    assert len(db["exams"]) == 1
+    assert len(db["questions"]) == len(db["examquestions"]) == len(current["questions"])
+    assert db["questions"][2]["content"].endswith("(fixed)")
+
+
+def test_changeset_middle_removal_leaves_later_questions_alone():
+    saved, _ = build_changeset(None, exam_processor_api.map_exam_data(load_json(SAMPLE))["data"], "exam-1")
+
+    edited = load_json(SAMPLE)
+    edited["questions"].pop(5)
+    _, changeset = build_changeset(saved, exam_processor_api.map_exam_data(edited)["data"], "exam-1")
+    assert changeset["questions"]["removed"] == [saved["questions"][5]["id"]]
+    assert changeset["questions"]["changed"] == changeset["questions"]["added"] == []
+
+
+def test_removal_keeps_question_records_other_exams_use():
+    """A question record shared with another exam survives its removal from one exam"""
+    db = {"exams": [], "questions": [], "examquestions": []}
+    exams = {}
+    for exam_id in ("exam-a", "exam-b"):
+        data = exam_processor_api.map_exam_data(load_json(SAMPLE), IdGenerator(seed="shared"))["data"]
+        exams[exam_id], changeset = build_changeset(None, data, exam_id)
+        apply_changeset(db, changeset)
+    assert len(db["questions"]) == 40 and len(db["examquestions"]) == 80
+
+    edited = load_json(SAMPLE)
+    edited["questions"].pop(0)
+    data = exam_processor_api.map_exam_data(edited, IdGenerator(seed="shared"))["data"]
+    _, changeset = build_changeset(exams["exam-a"], data, "exam-a")
+    assert changeset["questions"]["removed"] == [exams["exam-a"]["questions"][0]["id"]]
+    apply_changeset(db, changeset)
+
+    ids = {q["id"] for q in db["questions"]}
+    assert all(eq["questionId"] in ids for eq in db["examquestions"])
+    assert len(db["examquestions"]) == 79
+
+
+def test_incremental_save_endpoint():
+    """Re-saving an unchanged exam writes nothing; an edit updates in place"""
+    with tempfile.TemporaryDirectory() as tmp:
+        exam_path = os.path.join(tmp, "exam.json")
+        db_path = os.path.join(tmp, "db.json")
+        shutil.copyfile(SAMPLE, exam_path)
+        write_json(db_path, {"exams": [], "questions": [], "examquestions": []})
+
+        client = exam_processor_api.app.test_client()
+        body = {"filePath": exam_path, "mockDbPath": db_path, "incremental": True}
+        original_state = exam_processor_api.PROCESSED_STATE
+        exam_processor_api.PROCESSED_STATE = ProcessedState(os.path.join(tmp, "state"))
+        try:
+            first = client.post("/api/save-to-mock-db", json=body).get_json()
+            assert first["changes"]["questionsAdded"] == 40
+
+            again = client.post("/api/save-to-mock-db", json=body).get_json()
+            assert again["write"] is None
+
+            data = load_json(exam_path)
+            data["questions"][0]["question_text"] += " (fixed)"
+            write_json(exam_path, data)
+            os.utime(exam_path, ns=(0, os.stat(exam_path).st_mtime_ns + 1_000_000_000))
+
+            edited = client.post("/api/save-to-mock-db", json=body).get_json()
+            assert edited["changes"]["questionsChanged"] == 1
+            assert client.post("/api/changeset", json=body).get_json()["changeset"]["summary"]["questionsChanged"] == 0
+        finally:
+            exam_processor_api.PROCESSED_STATE = original_state
+
+        db = load_json(db_path)
+        assert len(db["exams"]) == 1
+        assert len(db["questions"]) == 40
+        assert len(db["examquestions"]) == 40
+
+
+if __name__ == "__main__":
+    test_changeset_typo_fix_and_removal()
+    test_changeset_middle_removal_leaves_later_questions_alone()
+    test_removal_keeps_question_records_other_exams_use()
+    test_incremental_save_endpoint()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,44 @@
+"""
+Test that the lean char backend yields pdfplumber's chars and the same exam
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdfplumber
+
+from convert_pdf_final import extract_exam
+from lean_chars import LeanPage, page_for_backend
+
+PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi", "de_2.pdf")
+CHAR_KEYS = ("text", "fontname", "size", "x0", "x1", "top", "bottom")
+
+
+def test_lean_chars_match_pdfplumber():
+    with pdfplumber.open(PDF_PATH) as pdf:
+        for page in pdf.pages:
+            expected = [{key: char[key] for key in CHAR_KEYS} for char in page.chars]
+            assert LeanPage(page).chars == expected
+
+
+def test_lean_backend_extracts_the_same_exam():
+    assert extract_exam(PDF_PATH, backend="lean") == extract_exam(PDF_PATH, backend="pdfplumber")
+
+
+def test_unknown_backend_is_rejected():
+    try:
+        page_for_backend(None, "pdfium")
+    except ValueError as e:
+        assert "pdfium" in str(e)
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+if __name__ == "__main__":
+    test_lean_chars_match_pdfplumber()
+    test_lean_backend_extracts_the_same_exam()
+    test_unknown_backend_is_rejected()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,55 @@
+"""
+Test low-memory extraction: same output, peak memory reported, limit enforced
+"""
+import sys
+import os
+import io
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import extract_exam, run_worker
+from memory_monitor import MemoryLimitExceeded, MemoryMonitor
+
+PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi", "de_2.pdf")
+
+
+def test_low_memory_matches_default_and_reports_peak():
+    memory = MemoryMonitor(limit_mb=None)
+    assert extract_exam(PDF_PATH, workers=3, memory=memory) == extract_exam(PDF_PATH)
+
+    report = memory.to_dict()
+    # One sample per page (serial even with workers) plus one after parsing
+    assert report["samples"] == 10
+    assert report["peakRssMb"] >= report["startRssMb"] > 0
+
+
+def test_memory_limit_aborts_extraction():
+    try:
+        extract_exam(PDF_PATH, memory=MemoryMonitor(limit_mb=1))
+    except MemoryLimitExceeded as e:
+        assert "1 MB limit" in str(e)
+    else:
+        raise AssertionError("Expected MemoryLimitExceeded")
+
+
+def test_worker_low_memory_job():
+    jobs = [
+        {"id": "a", "pdf_path": PDF_PATH, "low_memory": True},
+        {"id": "b", "pdf_path": PDF_PATH, "memory_limit_mb": 1}
+    ]
+    stdout = io.StringIO()
+    run_worker(stdin=io.StringIO("".join(json.dumps(job) + "\n" for job in jobs)), stdout=stdout)
+    ok, limited = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    assert ok["success"] and len(ok["result"]["questions"]) == 40
+    assert ok["memory"]["peakRssMb"] > 0
+    assert not limited["success"] and limited["type"] == "MemoryLimitExceeded"
+
+
+if __name__ == "__main__":
+    test_low_memory_matches_default_and_reports_peak()
+    test_memory_limit_aborts_extraction()
+    test_worker_low_memory_job()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,142 @@
+"""
+Test the locked, atomic mock db.json writer
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_db_store import JOURNAL_KEY, MockDbStore
+import exam_processor_api
+
+
+def make_db(tmp):
+    path = os.path.join(tmp, "db.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"users": [{"id": "u1"}], "exams": []}, f)
+    return path
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_concurrent_snapshot_appends_keep_every_record():
+    """Parallel saves serialize on the lock instead of overwriting each other"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        store = MockDbStore(path)
+        threads = [threading.Thread(target=store.append, args=({"exams": [{"n": i}]},)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        db = load(path)
+        assert sorted(e["n"] for e in db["exams"]) == list(range(16))
+        assert db["users"] == [{"id": "u1"}]
+
+
+def test_journal_compaction_and_torn_line():
+    """Journaled saves show up in read() and land in db.json on compaction"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        store = MockDbStore(path, journal=True, compact_every=3)
+
+        assert store.append({"exams": [{"n": 1}]}) == {"mode": "journal", "compacted": False, "pendingEntries": 1}
+        # Simulate a crash mid-append
+        with open(store.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"exams": [{"n": ')
+        store.append({"exams": [{"n": 2}], "questions": [{"q": 1}]})
+
+        assert load(path)["exams"] == []
+        assert store.read()["exams"] == [{"n": 1}, {"n": 2}]
+        assert store.pending() == 2
+
+        assert store.append({"exams": [{"n": 3}]})["compacted"]
+        db = load(path)
+        assert db["exams"] == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert db["questions"] == [{"q": 1}]
+        assert store.pending() == 0
+
+
+def test_crash_before_journal_reset_does_not_apply_entries_twice():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        store = MockDbStore(path, journal=True, compact_every=3)
+        store.append({"exams": [{"n": 1}]})
+        store.append({"exams": [{"n": 2}]})
+        with open(store.journal_path, "rb") as f:
+            journal = f.read()
+
+        store.compact()
+        assert load(path)[JOURNAL_KEY] == {"seq": 2}
+        # db.json replaced, journal reset lost
+        with open(store.journal_path, "wb") as f:
+            f.write(journal)
+
+        assert store.pending() == 0
+        assert store.read()["exams"] == [{"n": 1}, {"n": 2}]
+        assert store.append({"exams": [{"n": 3}]})["compacted"]
+        assert [e["n"] for e in load(path)["exams"]] == [1, 2, 3]
+
+
+def test_append_does_not_load_db_or_whole_journal():
+    """Appends number and count entries from the journal's checkpoint and last line"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        store = MockDbStore(path, journal=True, compact_every=100)
+        store.append({"exams": [{"n": 0}]})
+        os.rename(path, path + ".away")
+        for n in range(1, 5):
+            assert store.append({"exams": [{"n": n}]})["pendingEntries"] == n + 1
+        os.rename(path + ".away", path)
+
+        assert [e["n"] for e in store.read()["exams"]] == [0, 1, 2, 3, 4]
+        assert store.compact() == 5
+        assert store.append({"exams": [{"n": 5}]})["pendingEntries"] == 1
+
+
+def test_save_endpoint_appends_exam_questions_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        client = exam_processor_api.app.test_client()
+        response = client.post("/api/save-to-mock-db", json={"mockDbPath": path}).get_json()
+
+        assert response["success"]
+        db = load(path)
+        assert len(db["exams"]) == 1
+        assert len(db["questions"]) == response["stats"]["totalQuestions"]
+        assert len(db["examquestions"]) == response["stats"]["totalQuestions"]
+
+
+
+def test_saving_the_same_exam_twice_keeps_ids_unique():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_db(tmp)
+        client = exam_processor_api.app.test_client()
+        for journal in (False, True, False):
+            assert client.post("/api/save-to-mock-db", json={"mockDbPath": path, "journal": journal}).get_json()["success"]
+
+        db = MockDbStore(path).read()
+        assert len(db["exams"]) == 1 and db["exams"][0]["id"]
+        ids = [q["id"] for q in db["questions"]]
+        assert len(ids) == len(set(ids)) == db["exams"][0]["totalQuestions"]
+        keys = [(eq["examId"], eq["order"]) for eq in db["examquestions"]]
+        assert len(keys) == len(set(keys)) == len(ids)
+        assert {eq["questionId"] for eq in db["examquestions"]} == set(ids)
+
+
+if __name__ == "__main__":
+    test_concurrent_snapshot_appends_keep_every_record()
+    test_journal_compaction_and_torn_line()
+    test_crash_before_journal_reset_does_not_apply_entries_twice()
+    test_append_does_not_load_db_or_whole_journal()
+    test_save_endpoint_appends_exam_questions_once()
+    test_saving_the_same_exam_twice_keeps_ids_unique()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,36 @@
+"""
+Test that parallel page extraction produces exactly the serial output
+"""
+import sys
+import os
+import glob
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import extract_exam
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi")
+
+
+def test_parallel_matches_serial():
+    """Serial and multi-process extraction must serialize to identical JSON"""
+
+    pdf_paths = sorted(glob.glob(os.path.join(SAMPLE_DIR, "*.pdf")))
+
+    if not pdf_paths:
+        print(json.dumps({
+            "error": f"No sample PDFs found in {SAMPLE_DIR}"
+        }, ensure_ascii=False))
+        return
+
+    for pdf_path in pdf_paths:
+        serial = json.dumps(extract_exam(pdf_path), ensure_ascii=False)
+        parallel = json.dumps(extract_exam(pdf_path, workers=3), ensure_ascii=False)
+        assert serial == parallel, f"Parallel output differs for {pdf_path}"
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,41 @@
+"""
+Regression test for option detection in parse_question
+
+fixtures/parse_question_options.json holds question blocks and the output of
+the original multi-scan parse_question for them:
+- "pdf:*" cases are the real blocks cut from the sample PDFs
+- "exam_corrected:<style>#Q*" cases rebuild every question of
+  exam_corrected.json with newline / bold / spaced-bold / inline / mixed
+  option markers
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import parse_question
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "parse_question_options.json")
+
+
+def test_parse_question_matches_fixtures():
+    """Selected options, question text and tags stay identical for every fixture"""
+
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+
+    failures = []
+    for case in cases:
+        answers = {int(k): v for k, v in case["answers"].items()}
+        result = parse_question(case["q_num"], case["text"], answers, case["pass_id"])
+        if result != case["expected"]:
+            failures.append(case["name"])
+
+    assert not failures, f"parse_question changed for: {failures}"
+
+
+if __name__ == "__main__":
+    test_parse_question_matches_fixtures()
+    print(json.dumps({"success": True}))
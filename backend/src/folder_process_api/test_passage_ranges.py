@@ -0,0 +1,60 @@
+"""
+Test passage -> question range assignment
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import assign_passage_ranges, compute_passage_ranges, extract_exam
+
+PDF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi")
+
+
+def make_question(number, options=True, tags=("reading",)):
+    return {
+        "question_number": number,
+        "options": ["A", "B"] if options else [],
+        "tags": list(tags),
+        "PassageRelated": "stale"
+    }
+
+
+def test_compute_passage_ranges():
+    """Each passage ends before the next one starts; the last ends at the last question with options"""
+    passages = [{"passage_id": "p1", "q_start": 1}, {"passage_id": "p2", "q_start": 6}, {"passage_id": "p3"}]
+    assert compute_passage_ranges(passages, 9) == [("p1", 1, 5), ("p2", 6, 9)]
+    assert compute_passage_ranges(passages, None) == [("p1", 1, 5), ("p2", 6, 5)]
+
+
+def test_assign_passage_ranges_out_of_order():
+    """Assignment does not depend on question order; ordering questions get None"""
+    questions = [make_question(7), make_question(2), make_question(3, tags=()), make_question(4, options=False),
+                 make_question(12)]
+    assign_passage_ranges([("p1", 1, 5), ("p2", 6, 9)], questions)
+    assert [q["PassageRelated"] for q in questions] == ["p2", "p1", None, "stale", "stale"]
+
+
+def test_extract_exam_ranges_match_questions():
+    """The exposed range map agrees with PassageRelated on the sample PDFs"""
+    pdf_path = os.path.join(PDF_DIR, "de_2.pdf")
+    result = extract_exam(pdf_path, with_ranges=True)
+    plain = extract_exam(pdf_path)
+    assert "passage_ranges" not in plain
+    assert plain["questions"] == result["questions"]
+
+    ranges = result["passage_ranges"]
+    assert set(ranges) == {p["passage_id"] for p in result["passages"]}
+    for q in result["questions"]:
+        if q["PassageRelated"]:
+            span = ranges[q["PassageRelated"]]
+            assert span["start"] <= q["question_number"] <= span["end"]
+
+
+if __name__ == "__main__":
+    test_compute_passage_ranges()
+    test_assign_passage_ranges_out_of_order()
+    test_extract_exam_ranges_match_questions()
+    print(json.dumps({"success": True}))
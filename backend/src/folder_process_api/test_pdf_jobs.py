@@ -0,0 +1,116 @@
+"""
+Test the bounded upload job queue and /api/jobs
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Upload jobs go through the extraction cache: keep it (and the processed
+# state) out of the source tree - conftest.py already does this under pytest
+CACHE_ROOT = tempfile.mkdtemp(prefix="test_pdf_jobs-")
+os.environ.setdefault("PDF_CACHE_DIR", os.path.join(CACHE_ROOT, "extraction"))
+os.environ.setdefault("PROCESSED_STATE_DIR", os.path.join(CACHE_ROOT, "processed"))
+
+from job_queue import JobQueue, QueueFull
+import exam_processor_api
+
+PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "Đề thi", "de_2.pdf")
+
+
+def wait_for(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_queue_full_rejects_and_drains():
+    """Running + pending jobs are capped; the cap frees up as jobs finish"""
+    release = threading.Event()
+    queue = JobQueue(max_workers=1, max_pending=1, executor_factory=ThreadPoolExecutor)
+    try:
+        first = queue.submit(release.wait)
+        second = queue.submit(release.wait)
+        try:
+            queue.submit(release.wait)
+            assert False, "third job should be rejected"
+        except QueueFull:
+            pass
+
+        release.set()
+        assert wait_for(queue, first)["status"] == "done"
+        assert wait_for(queue, second)["status"] == "done"
+        failed = wait_for(queue, queue.submit(int, "x"))
+        assert failed["status"] == "failed" and failed["errorType"] == "ValueError"
+        assert queue.stats()["rejected"] == 1
+    finally:
+        queue.shutdown()
+
+
+def test_job_is_queued_until_a_worker_starts_it():
+    """A job waiting in the process pool's call queue is not reported as running"""
+    queue = JobQueue(max_workers=1, max_pending=2)
+    try:
+        first = queue.submit(time.sleep, 1)
+        second = queue.submit(time.sleep, 0)
+        deadline = time.time() + 30
+        while queue.get(first)["status"] == "queued" and time.time() < deadline:
+            time.sleep(0.02)
+        assert queue.get(first)["status"] == "running"
+        assert queue.get(second)["status"] == "queued"
+        assert queue.stats()["running"] == 1 and queue.stats()["queued"] == 1
+
+        assert "startedAt" in wait_for(queue, second)
+    finally:
+        queue.shutdown()
+
+
+def test_dead_worker_does_not_break_later_jobs():
+    """A job that kills its worker fails; the pool is rebuilt for the next one"""
+    queue = JobQueue(max_workers=1, max_pending=1)
+    try:
+        crashed = wait_for(queue, queue.submit(os._exit, 1))
+        assert crashed["status"] == "failed" and crashed["errorType"] == "BrokenProcessPool"
+
+        job = wait_for(queue, queue.submit(int, "7"))
+        assert job["status"] == "done" and job["result"] == 7
+        assert queue.stats()["active"] == 0
+    finally:
+        queue.shutdown()
+
+
+def test_upload_job_end_to_end():
+    """Uploaded PDF is extracted and mapped in a worker process"""
+    client = exam_processor_api.app.test_client()
+    with open(PDF_PATH, "rb") as f:
+        response = client.post("/api/jobs", data={"file": (f, "de_2.pdf")}, content_type="multipart/form-data")
+    assert response.status_code == 202
+    job_id = response.get_json()["jobId"]
+
+    job = wait_for(exam_processor_api.JOB_QUEUE, job_id)
+    assert job["status"] == "done", job.get("error")
+    assert job["meta"]["filename"] == "de_2.pdf"
+    assert job["result"]["stats"]["totalQuestions"] == 40
+    assert job["result"]["memory"]["peakRssMb"] >= job["result"]["memory"]["startRssMb"]
+
+    assert client.get(f"/api/jobs/{job_id}").get_json()["status"] == "done"
+    assert client.get("/api/jobs/unknown").status_code == 404
+    assert client.post("/api/jobs", data=b"not a pdf").status_code == 400
+
+
+if __name__ == "__main__":
+    test_queue_full_rejects_and_drains()
+    test_job_is_queued_until_a_worker_starts_it()
+    test_dead_worker_does_not_break_later_jobs()
+    test_upload_job_end_to_end()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,91 @@
+"""
+Test paginated /api/preview against the full process_exam_file output
+"""
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import exam_processor_api
+import id_strategy
+
+
+def test_preview_page_matches_full_processing():
+    """A preview page equals the same slice of the fully processed exam"""
+    full = exam_processor_api.process_exam_file("exam_corrected.json", use_cache=False)
+    preview = exam_processor_api.preview_exam_file("exam_corrected.json", offset=5, limit=10,
+                                                   include_passages=True, include_stats=True)
+
+    assert preview["data"]["questions"] == full["data"]["questions"][5:15]
+    assert preview["data"]["examQuestions"] == full["data"]["examQuestions"][5:15]
+    assert preview["data"]["exam"] == full["data"]["exam"]
+    assert preview["stats"] == full["stats"]
+    assert preview["page"] == {"offset": 5, "limit": 10, "total": full["stats"]["totalQuestions"]}
+
+
+def test_preview_duplicate_suffixes_do_not_depend_on_the_page():
+    """[Same, Other, Same]: the third question is "-2" whichever slice is asked for"""
+    same = {"question_number": 1, "question_text": "Same", "options": {"A": "x", "B": "y", "C": "z"}}
+    other = dict(same, question_text="Other")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "dupes.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"passages": [], "questions": [same, other, same]}, f)
+
+        full = exam_processor_api.process_exam_file(path, use_cache=False)
+        preview = exam_processor_api.preview_exam_file(path, offset=2, limit=1)
+
+    third = full["data"]["questions"][2]["id"]
+    assert third == full["data"]["questions"][0]["id"] + "-2"
+    assert [q["id"] for q in preview["data"]["questions"]] == [third]
+
+
+def test_later_pages_do_not_rehash_earlier_questions():
+    """Question ids are computed once per file; each page after that only slices them"""
+    questions = [{"question_number": i + 1, "question_text": f"Q{i % 7}", "options": {"A": "x", "B": "y"}}
+                 for i in range(300)]
+    calls = []
+    content_digest = id_strategy.content_digest
+
+    def counting_digest(*args, **kwargs):
+        calls.append(1)
+        return content_digest(*args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "long.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"passages": [], "questions": questions}, f)
+        full = exam_processor_api.process_exam_file(path, use_cache=False)
+
+        exam_processor_api.preview_exam_file(path, offset=0, limit=5)
+        id_strategy.content_digest = counting_digest
+        try:
+            preview = exam_processor_api.preview_exam_file(path, offset=290, limit=10)
+        finally:
+            id_strategy.content_digest = content_digest
+
+    assert calls == []
+    assert preview["data"]["questions"] == full["data"]["questions"][290:300]
+
+
+def test_preview_skips_passages_and_stats_by_default():
+    client = exam_processor_api.app.test_client()
+    response = client.post("/api/preview", json={"limit": 2}).get_json()
+
+    assert response["success"]
+    assert len(response["data"]["questions"]) == 2
+    assert response["data"]["exam"]["readingPassages"] == []
+    assert "stats" not in response
+
+    assert client.post("/api/preview", json={"offset": "x"}).status_code == 400
+
+
+if __name__ == "__main__":
+    test_preview_page_matches_full_processing()
+    test_preview_duplicate_suffixes_do_not_depend_on_the_page()
+    test_later_pages_do_not_rehash_earlier_questions()
+    test_preview_skips_passages_and_stats_by_default()
+    print(json.dumps({"success": True}))
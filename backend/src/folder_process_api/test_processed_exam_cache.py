@@ -0,0 +1,72 @@
+"""
+Test the in-process processed exam cache used by exam_processor_api
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from processed_exam_cache import ProcessedExamCache, file_key
+import exam_processor_api
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exam_corrected.json")
+
+
+def test_lru_eviction_and_stale_key():
+    """Oldest file is evicted past max_entries; a changed key misses and replaces the entry"""
+    cache = ProcessedExamCache(max_entries=2)
+    cache.put(("a", 1, 10), "A")
+    cache.put(("b", 1, 10), "B")
+    assert cache.get(("a", 1, 10)) == "A"  # a is now most recent
+    cache.put(("c", 1, 10), "C")
+    assert cache.get(("b", 1, 10)) is None
+    assert cache.get(("a", 2, 10)) is None  # file changed
+    cache.put(("a", 2, 10), "A2")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_process_exam_file_cached_until_file_changes():
+    """Unchanged file is served from cache; rewriting it re-processes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "exam.json")
+        shutil.copyfile(SAMPLE, path)
+
+        first = exam_processor_api.process_exam_file(path)
+        assert first["success"]
+        first["data"]["questions"] = first["data"]["questions"][:1]  # must not leak into the cache
+
+        second = exam_processor_api.process_exam_file(path)
+        assert second["data"]["exam"] is first["data"]["exam"]
+        assert len(second["data"]["questions"]) == second["stats"]["totalQuestions"]
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["questions"] = data["questions"][:3]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+        third = exam_processor_api.process_exam_file(path)
+        assert third["stats"]["totalQuestions"] == 3
+        assert file_key(path)[0] == os.path.abspath(path)
+
+
+def test_missing_file_not_cached():
+    result = exam_processor_api.process_exam_file("/nonexistent/exam.json")
+    assert not result["success"]
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_stale_key()
+    test_process_exam_file_cached_until_file_changes()
+    test_missing_file_not_cached()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,114 @@
+"""
+Test incremental question segmentation: chunked input parses like the whole text
+"""
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_extract_with_bold import CharsPage
+from convert_pdf_final import (QuestionSegmenter, clean_text, collect_records, extract_with_bold,
+                               iter_chunk_records, iter_exam_records, iter_page_records)
+from synthetic_exam import generate_exam
+
+SAMPLE = (
+    "Read the following passage and mark the letter A, B, C, or D to indicate the best answer.\n"
+    "Cities keep growing as people move in from the countryside looking for work and schools.\n"
+    "Question 1. What is the passage mainly about?\n"
+    "A. Farming\nB. Cities\nC. Schools\nD. Work\n"
+    "Question 2: The word \"growing\" is closest in meaning to\n"
+    "A. rising\nB. falling\nC. staying\nD. leaving\n"
+    "Question 12. Which is NOT mentioned?\n"
+    "A. work\nB. schools\nC. farms\nD. hospitals\n"
+    "Answers: 1. B 2. A 12. D"
+)
+
+
+def segments(chunks):
+    segmenter = QuestionSegmenter()
+    result = []
+    for chunk in chunks:
+        result.extend(segmenter.feed(chunk))
+    result.extend(segmenter.close())
+    return result, segmenter.answers
+
+
+def test_split_at_every_position_matches_whole_text():
+    """Markers and the Answers header straddling a chunk boundary are still found"""
+    expected = segments([SAMPLE])
+    assert [number for kind, (number, _) in [s for s in expected[0] if s[0] == "question"]] == [1, 2, 12]
+    assert expected[1] == {1: "B", 2: "A", 12: "D"}
+
+    for i in range(len(SAMPLE) + 1):
+        assert segments([SAMPLE[:i], SAMPLE[i:]]) == expected, i
+    assert segments(list(SAMPLE)) == expected
+
+
+def test_records_from_chunks_match_whole_text():
+    whole = collect_records(iter_exam_records(SAMPLE), with_ranges=True)
+    assert [q["answer"] for q in whole["questions"]] == ["B", "A", "D"]
+    for i in range(0, len(SAMPLE) + 1, 7):
+        chunks = [SAMPLE[:i], SAMPLE[i:]]
+        assert collect_records(iter_chunk_records(chunks), with_ranges=True) == whole, i
+
+
+def test_page_records_match_joined_text():
+    """Questions spanning page breaks come out as if the pages were one string"""
+    exam = generate_exam(questions=40, passages=5, bold_density=0.2, pages=9, seed=11)
+    texts = [clean_text(extract_with_bold(CharsPage(chars))) for chars in exam["pages"]]
+    full_text = "".join(text + "\n\n" for text in texts)
+
+    expected = collect_records(iter_exam_records(full_text), with_ranges=True)
+    assert len(expected["questions"]) == 40
+    assert collect_records(iter_page_records(iter(texts)), with_ranges=True) == expected
+
+
+def test_records_are_yielded_before_the_document_ends():
+    exam = generate_exam(questions=20, passages=4, seed=2)
+    texts = [clean_text(extract_with_bold(CharsPage(chars))) for chars in exam["pages"]]
+    consumed = []
+
+    def pages():
+        for text in texts:
+            consumed.append(text)
+            yield text
+
+    seen = set()
+    for kind, _ in iter_page_records(pages()):
+        seen.add(kind)
+        if {"passage", "question"} <= seen:
+            break
+    assert len(consumed) < len(texts)
+
+
+def replay_stream(records):
+    """What an NDJSON consumer ends up with: records serialized when yielded, then patched"""
+    return collect_records([(kind, json.loads(json.dumps(record))) for kind, record in records], with_ranges=True)
+
+
+def test_streamed_records_patch_up_to_the_collected_result():
+    """answers / passage_links records bring early questions up to date, in and out of order"""
+    exam = generate_exam(questions=30, passages=4, seed=7)
+    texts = [clean_text(extract_with_bold(CharsPage(chars))) for chars in exam["pages"]]
+    full_text = "".join(text + "\n\n" for text in texts)
+    header = full_text.index("Answers")
+    # The same questions twice before the key: numbering restarts mid-document
+    repeated = [full_text[:header], full_text[:header], full_text[header:]]
+
+    for variant in (texts, repeated):
+        records = list(iter_page_records(variant))
+        expected = collect_records(iter(records), with_ranges=True)
+        assert replay_stream(iter_page_records(variant)) == json.loads(json.dumps(expected))
+        assert all(q["answer"] for q in expected["questions"])
+    assert "passage_links" in [kind for kind, _ in records]
+
+
+if __name__ == "__main__":
+    test_split_at_every_position_matches_whole_text()
+    test_records_from_chunks_match_whole_text()
+    test_page_records_match_joined_text()
+    test_records_are_yielded_before_the_document_ends()
+    test_streamed_records_patch_up_to_the_collected_result()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,49 @@
+"""
+Test the JSON serializer backend and response compression
+"""
+import sys
+import os
+import json
+import gzip
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import serializer
+import exam_processor_api
+
+
+def test_compact_utf8_matches_stdlib():
+    """Whatever the backend, output equals compact stdlib json with raw UTF-8"""
+    data = {"content": "<b>Đề thi</b> \"quoted\"\n", "n": [1, 2.5, None, True], "nested": {"k": []}}
+    expected = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    assert serializer.dumps(data) == expected
+    assert serializer.dumps_bytes(data) == expected.encode("utf-8")
+    assert serializer.loads(serializer.dumps_bytes(data, pretty=True)) == data
+
+
+def test_negotiate_encoding():
+    assert serializer.negotiate_encoding("") is None
+    assert serializer.negotiate_encoding("gzip, deflate, br") in ("gzip", "zstd")
+    assert serializer.negotiate_encoding("gzip;q=0, identity") is None
+    assert serializer.negotiate_encoding("br") is None
+    assert serializer.negotiate_encoding("*") == serializer.supported_encodings()[0]
+
+
+def test_process_exam_response_is_gzipped_when_accepted():
+    client = exam_processor_api.app.test_client()
+    plain = client.post("/api/process-exam", json={})
+    assert "Content-Encoding" not in plain.headers
+
+    encoded = client.post("/api/process-exam", json={}, headers={"Accept-Encoding": "gzip"})
+    assert encoded.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in encoded.headers["Vary"]
+    assert json.loads(gzip.decompress(encoded.get_data())) == plain.get_json()
+    assert len(encoded.get_data()) < len(plain.get_data())
+
+
+if __name__ == "__main__":
+    test_compact_utf8_matches_stdlib()
+    test_negotiate_encoding()
+    test_process_exam_response_is_gzipped_when_accepted()
+    print(json.dumps({"success": True}))
@@ -0,0 +1,71 @@
+"""
+Test the extraction instrumentation: StageTimer stages, --timings and --profile-out
+"""
+import sys
+import os
+import json
+import pstats
+import subprocess
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_pdf_final import extract_exam_cached
+from extraction_cache import ExtractionCache
+from stage_timer import StageTimer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PDF_PATH = os.path.join(SCRIPT_DIR, "..", "..", "..", "Đề thi", "de_2.pdf")
+
+EXTRACTION_STAGES = {"open", "chars", "bold", "clean", "split", "parse_question", "passages"}
+
+
+def check_report(report):
+    assert report["totalMs"] >= 0
+    for entry in report["stages"].values():
+        assert entry["ms"] >= 0 and entry["calls"] >= 1
+
+
+def test_stage_timer_covers_extraction_and_cache_hits():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ExtractionCache(tmp)
+
+        cold = StageTimer()
+        result, cached = extract_exam_cached(PDF_PATH, cache=cache, timer=cold)
+        report = cold.to_dict()
+        assert not cached
+        assert {"cache_lookup"} | EXTRACTION_STAGES <= set(report["stages"])
+        assert report["stages"]["parse_question"]["calls"] == len(result["questions"])
+        assert report["counters"]["questions"] == len(result["questions"])
+        check_report(report)
+
+        warm = StageTimer()
+        assert extract_exam_cached(PDF_PATH, cache=cache, timer=warm)[1]
+        assert set(warm.to_dict()["stages"]) == {"cache_lookup"}
+
+
+def test_cli_timings_and_profile_out():
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = os.path.join(tmp, "run.prof")
+        run = subprocess.run(
+            [sys.executable, os.path.join(SCRIPT_DIR, "convert_pdf_final.py"), "--no-cache", "--timings",
+             "--profile-out", profile_path, PDF_PATH],
+            capture_output=True, text=True, encoding="utf-8", env=dict(os.environ, PYTHONIOENCODING="utf-8"),
+            check=True
+        )
+        assert len(json.loads(run.stdout)["questions"]) == 40
+
+        report = json.loads(run.stderr.strip().splitlines()[-1])
+        assert EXTRACTION_STAGES <= set(report["stages"])
+        check_report(report)
+
+        stats = pstats.Stats(profile_path)
+        assert stats.total_calls > 0
+        assert any(name == "extract_exam_cached" for _, _, name in stats.stats)
+
+
+if __name__ == "__main__":
+    test_stage_timer_covers_extraction_and_cache_hits()
+    test_cli_timings_and_profile_out()
+    print(json.dumps({"success": True}))
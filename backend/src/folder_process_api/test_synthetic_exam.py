@@ -0,0 +1,73 @@
+"""
+Test the synthetic exam generator and the benchmark suite's regression check
+"""
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_extract_with_bold import CharsPage
+from benchmark_suite import compare
+from convert_pdf_final import clean_text, exam_from_texts, extract_with_bold
+from synthetic_exam import generate_exam, write_fixture
+import exam_processor_api
+
+
+def parse(exam):
+    return exam_from_texts([clean_text(extract_with_bold(CharsPage(chars))) for chars in exam["pages"]])
+
+
+def test_char_fixture_parses_back_to_the_generated_exam():
+    """Questions, answers and passage links survive extract_with_bold + iter_exam_records"""
+    exam = generate_exam(questions=30, passages=4, bold_density=0.2, pages=5, seed=3)
+    assert len(exam["pages"]) == 5
+
+    result = parse(exam)
+    expected = exam["processed"]["questions"]
+    assert len(result["passages"]) == 4
+    assert [q["question_number"] for q in result["questions"]] == list(range(1, 31))
+    assert [q["answer"] for q in result["questions"]] == [q["answer"] for q in expected]
+    assert [q["PassageRelated"] for q in result["questions"]] == [q["PassageRelated"] for q in expected]
+    assert all(len(q["options"]) == 4 for q in result["questions"])
+
+
+def test_generator_is_deterministic_and_handles_standalone_questions():
+    assert generate_exam(10, 2, seed=1) == generate_exam(10, 2, seed=1)
+    assert generate_exam(10, 2, seed=1) != generate_exam(10, 2, seed=2)
+
+    result = parse(generate_exam(questions=12, passages=0, seed=1))
+    assert result["passages"] == []
+    assert len(result["questions"]) == 12
+
+
+def test_processed_fixture_maps_through_process_exam_file():
+    exam = generate_exam(questions=25, passages=3, seed=5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chars_path, processed_path = write_fixture(exam, tmp_dir, "synthetic")
+        with open(chars_path, "r", encoding="utf-8") as f:
+            assert len(json.load(f)["pages"]) == len(exam["pages"])
+
+        result = exam_processor_api.process_exam_file(processed_path, use_cache=False)
+    assert result["success"]
+    assert result["stats"]["totalQuestions"] == 25
+    assert result["stats"]["totalPassages"] == 3
+    assert result["stats"]["questionsWithPassage"] == 25
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"scores": {"small/a": 1.0, "small/b": 1.0, "small/c": 1.0}}
+    results = {"scores": {"small/a": 1.2, "small/b": 1.5, "small/c": 0.5, "small/new": 9.0}}
+    regressions = compare(results, baseline, 0.25)
+    assert [key for key, *_ in regressions] == ["small/b"]
+    assert compare(results, {}, 0.25) == []
+
+
+if __name__ == "__main__":
+    test_char_fixture_parses_back_to_the_generated_exam()
+    test_generator_is_deterministic_and_handles_standalone_questions()
+    test_processed_fixture_maps_through_process_exam_file()
+    test_compare_flags_only_slowdowns_beyond_tolerance()
+    print(json.dumps({"success": True}))
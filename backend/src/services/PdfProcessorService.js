@@ -1,7 +1,33 @@
 const { spawn } = require("child_process");
 const path = require("path");
+const readline = require("readline");
 const fs = require("fs").promises;
 
+const PYTHON_SCRIPT = path.join(
+  __dirname,
+  "..",
+  "folder_process_api",
+  "convert_pdf_final.py"
+);
+
+// Set PDF_PROCESSOR_WORKER=false to spawn one Python process per PDF instead
+const USE_PERSISTENT_WORKER = process.env.PDF_PROCESSOR_WORKER !== "false";
+
+// Long-lived Python workers (spawned lazily, up to PDF_PROCESSOR_WORKERS).
+// Each worker handles its jobs one at a time, so the pool keeps one slow PDF
+// from queueing every other upload behind it.
+const WORKER_POOL_SIZE = Math.max(
+  1,
+  parseInt(process.env.PDF_PROCESSOR_WORKERS, 10) || 2
+);
+// A job running longer than this kills its worker; the jobs queued behind
+// it on that worker fail too, and the next job spawns a fresh worker
+const JOB_TIMEOUT_MS =
+  parseInt(process.env.PDF_PROCESSOR_TIMEOUT_MS, 10) || 120000;
+
+const workerPool = [];
+let nextJobId = 1;
+
 class PdfProcessorService {
   /**
    * Process PDF file and extract exam data using Python script
@@ -10,91 +36,261 @@ class PdfProcessorService {
    * @returns {Promise<Object>} Processed exam data with passages and questions
    */
   static async processPdfToExam(pdfFilePath, userId) {
-    return new Promise((resolve, reject) => {
-      const pythonScript = path.join(
-        __dirname,
-        "..",
-        "folder_process_api",
-        "convert_pdf_final.py"
+    // Check if Python script exists
+    try {
+      await fs.access(PYTHON_SCRIPT);
+    } catch (error) {
+      console.error("❌ Python script not found:", PYTHON_SCRIPT);
+      throw new Error(`Python script not found: ${PYTHON_SCRIPT}`);
+    }
+
+    console.log("🐍 Starting Python PDF processor...");
+    console.log("📄 PDF Path:", pdfFilePath);
+    console.log("📜 Script Path:", PYTHON_SCRIPT);
+
+    const examData = USE_PERSISTENT_WORKER
+      ? await this.runWorkerJob(pdfFilePath)
+      : await this.runPythonOnce(pdfFilePath);
+
+    console.log(
+      `✅ Parsed ${examData.passages?.length || 0} passages, ${
+        examData.questions?.length || 0
+      } questions`
+    );
+
+    // Transform data to include userId and proper structure
+    return this.transformExamData(examData, userId);
+  }
+
+  /**
+   * Pick the pool worker with the fewest pending jobs, spawning one while
+   * the pool is below WORKER_POOL_SIZE and every worker is busy
+   * @returns {Object} Pool entry { process, jobs }
+   */
+  static getWorker() {
+    for (const worker of [...workerPool]) {
+      if (worker.process.exitCode !== null || worker.process.signalCode !== null) {
+        this.retireWorker(
+          worker,
+          new Error(`PDF processing failed: worker exited with code ${worker.process.exitCode}`)
+        );
+      }
+    }
+    const idle = workerPool.find((worker) => worker.jobs.size === 0);
+    if (idle) {
+      return idle;
+    }
+    if (workerPool.length < WORKER_POOL_SIZE) {
+      return this.spawnWorker();
+    }
+    return workerPool.reduce((least, worker) =>
+      worker.jobs.size < least.jobs.size ? worker : least
+    );
+  }
+
+  /**
+   * Spawn a Python worker and add it to the pool
+   * @returns {Object} Pool entry { process, jobs }
+   */
+  static spawnWorker() {
+    console.log(
+      `🐍 Spawning persistent Python PDF worker (${workerPool.length + 1}/${WORKER_POOL_SIZE})...`
+    );
+    const child = spawn("python", [PYTHON_SCRIPT, "--worker"], {
+      env: {
+        ...process.env,
+        PYTHONIOENCODING: "utf-8", // Force UTF-8 encoding
+      },
+    });
+    const worker = { process: child, jobs: new Map() };
+
+    // Worker answers with one JSON line per job
+    const lines = readline.createInterface({ input: child.stdout });
+    lines.on("line", (line) => {
+      let response;
+      try {
+        response = JSON.parse(line);
+      } catch (error) {
+        console.error("❌ JSON parse error:", error.message);
+        console.error("Raw stdout:", line.substring(0, 200));
+        return;
+      }
+
+      const job = worker.jobs.get(response.id);
+      if (!job) {
+        return;
+      }
+      worker.jobs.delete(response.id);
+      clearTimeout(job.timer);
+      this.startNextJobTimer(worker);
+
+      if (response.success) {
+        job.resolve(response.result);
+      } else {
+        job.reject(
+          new Error(`PDF processing failed: ${response.error || "Unknown error"}`)
+        );
+      }
+    });
+
+    child.stderr.on("data", (data) => {
+      // Log stderr for debugging but don't fail immediately
+      console.warn("Python stderr:", data.toString("utf8"));
+    });
+
+    child.on("close", (code, signal) => {
+      console.log(`Python worker exited with code ${code}${signal ? ` (${signal})` : ""}`);
+      this.retireWorker(
+        worker,
+        new Error(`PDF processing failed: worker exited with code ${code}`)
       );
+    });
 
-      // Check if Python script exists
-      fs.access(pythonScript)
-        .then(() => {
-          console.log("🐍 Starting Python PDF processor...");
-          console.log("📄 PDF Path:", pdfFilePath);
-          console.log("📜 Script Path:", pythonScript);
-
-          // Spawn Python process with UTF-8 encoding
-          const pythonProcess = spawn("python", [pythonScript, pdfFilePath], {
-            env: {
-              ...process.env,
-              PYTHONIOENCODING: "utf-8", // Force UTF-8 encoding
-            },
-          });
+    child.on("error", (error) => {
+      console.error("❌ Failed to start Python:", error);
+      this.retireWorker(
+        worker,
+        new Error(`Failed to start Python process: ${error.message}`)
+      );
+    });
 
-          let stdoutData = "";
-          let stderrData = "";
+    // Write errors fail the job in runWorkerJob; without a listener an
+    // EPIPE here would crash the server
+    child.stdin.on("error", (error) => {
+      console.error("❌ Python worker stdin error:", error.message);
+    });
 
-          pythonProcess.stdout.on("data", (data) => {
-            const chunk = data.toString("utf8");
-            stdoutData += chunk;
-          });
+    workerPool.push(worker);
+    return worker;
+  }
 
-          pythonProcess.stderr.on("data", (data) => {
-            const chunk = data.toString("utf8");
-            stderrData += chunk;
-            // Log stderr for debugging but don't fail immediately
-            console.warn("Python stderr:", chunk);
-          });
+  /**
+   * Drop a worker from the pool, kill it and reject its pending jobs
+   * @param {Object} worker - Pool entry { process, jobs }
+   * @param {Error} error - Rejection for jobs that have no reason of their own
+   */
+  static retireWorker(worker, error) {
+    const index = workerPool.indexOf(worker);
+    if (index !== -1) {
+      workerPool.splice(index, 1);
+    }
+    if (worker.process.exitCode === null && worker.process.signalCode === null) {
+      worker.process.kill("SIGKILL");
+    }
+    for (const job of worker.jobs.values()) {
+      clearTimeout(job.timer);
+      job.reject(error);
+    }
+    worker.jobs.clear();
+  }
 
-          pythonProcess.on("close", (code) => {
-            console.log(`Python process exited with code ${code}`);
-
-            if (code !== 0) {
-              console.error("❌ Python process error:", stderrData);
-              reject(
-                new Error(
-                  `PDF processing failed with code ${code}: ${
-                    stderrData || "Unknown error"
-                  }`
-                )
-              );
-              return;
-            }
-
-            try {
-              // Python script outputs JSON to stdout
-              console.log("📦 Parsing JSON output...");
-              const examData = JSON.parse(stdoutData);
-              console.log(
-                `✅ Parsed ${examData.passages?.length || 0} passages, ${
-                  examData.questions?.length || 0
-                } questions`
-              );
-
-              // Transform data to include userId and proper structure
-              const transformedData = this.transformExamData(examData, userId);
-
-              resolve(transformedData);
-            } catch (error) {
-              console.error("❌ JSON parse error:", error.message);
-              console.error("Raw stdout:", stdoutData.substring(0, 200));
-              reject(new Error(`Failed to parse exam data: ${error.message}`));
-            }
-          });
+  /**
+   * Start the timeout of the job the worker is running now (the oldest
+   * pending one), so time spent queued behind another job does not count
+   * @param {Object} worker - Pool entry { process, jobs }
+   */
+  static startNextJobTimer(worker) {
+    const next = worker.jobs.entries().next();
+    if (next.done || next.value[1].timer) {
+      return;
+    }
+    const [id, job] = next.value;
+    job.timer = setTimeout(() => {
+      console.error(`❌ PDF job ${id} timed out after ${JOB_TIMEOUT_MS} ms, restarting worker`);
+      worker.jobs.delete(id);
+      job.reject(new Error(`PDF processing timed out after ${JOB_TIMEOUT_MS} ms`));
+      this.retireWorker(
+        worker,
+        new Error("PDF processing failed: worker restarted after another job timed out")
+      );
+    }, JOB_TIMEOUT_MS);
+  }
 
-          pythonProcess.on("error", (error) => {
-            console.error("❌ Failed to start Python:", error);
-            reject(
-              new Error(`Failed to start Python process: ${error.message}`)
-            );
-          });
-        })
-        .catch((error) => {
-          console.error("❌ Python script not found:", pythonScript);
-          reject(new Error(`Python script not found: ${pythonScript}`));
-        });
+  /**
+   * Send one PDF to a pooled Python worker
+   * @param {string} pdfFilePath - Absolute path to PDF file
+   * @returns {Promise<Object>} Raw exam data ({ passages, questions })
+   */
+  static runWorkerJob(pdfFilePath) {
+    return new Promise((resolve, reject) => {
+      const worker = this.getWorker();
+      const id = String(nextJobId++);
+
+      worker.jobs.set(id, { resolve, reject, timer: null });
+      this.startNextJobTimer(worker);
+      const line = JSON.stringify({ id, pdf_path: pdfFilePath }) + "\n";
+      worker.process.stdin.write(line, (error) => {
+        // Worker died between jobs (EPIPE, or its stdin is already closed)
+        if (error) {
+          this.retireWorker(
+            worker,
+            new Error(`PDF processing failed: worker unavailable (${error.message})`)
+          );
+        }
+      });
+    });
+  }
+
+  /**
+   * Spawn a one-off Python process for a single PDF
+   * @param {string} pdfFilePath - Absolute path to PDF file
+   * @returns {Promise<Object>} Raw exam data ({ passages, questions })
+   */
+  static runPythonOnce(pdfFilePath) {
+    return new Promise((resolve, reject) => {
+      // Spawn Python process with UTF-8 encoding
+      const pythonProcess = spawn("python", [PYTHON_SCRIPT, pdfFilePath], {
+        env: {
+          ...process.env,
+          PYTHONIOENCODING: "utf-8", // Force UTF-8 encoding
+        },
+      });
+
+      let stdoutData = "";
+      let stderrData = "";
+
+      pythonProcess.stdout.on("data", (data) => {
+        const chunk = data.toString("utf8");
+        stdoutData += chunk;
+      });
+
+      pythonProcess.stderr.on("data", (data) => {
+        const chunk = data.toString("utf8");
+        stderrData += chunk;
+        // Log stderr for debugging but don't fail immediately
+        console.warn("Python stderr:", chunk);
+      });
+
+      pythonProcess.on("close", (code) => {
+        console.log(`Python process exited with code ${code}`);
+
+        if (code !== 0) {
+          console.error("❌ Python process error:", stderrData);
+          reject(
+            new Error(
+              `PDF processing failed with code ${code}: ${
+                stderrData || "Unknown error"
+              }`
+            )
+          );
+          return;
+        }
+
+        try {
+          // Python script outputs JSON to stdout
+          console.log("📦 Parsing JSON output...");
+          resolve(JSON.parse(stdoutData));
+        } catch (error) {
+          console.error("❌ JSON parse error:", error.message);
+          console.error("Raw stdout:", stdoutData.substring(0, 200));
+          reject(new Error(`Failed to parse exam data: ${error.message}`));
+        }
+      });
+
+      pythonProcess.on("error", (error) => {
+        console.error("❌ Failed to start Python:", error);
+        reject(new Error(`Failed to start Python process: ${error.message}`));
+      });
     });
   }
 